@@ -17,18 +17,49 @@ class DDBStack(Stack):
         app_utils = AppUtils(config)
         
         for t in config['dynamodb']['tables']:
-            t_name = app_utils.get_name_with_prefix(t)
-            self.create_table(t_name, table_name=t_name)
+            # A table is either a name with the default id key, or a definition with its own keys and indexes
+            if isinstance(t, str):
+                t = {'name': t}
+            
+            t_name = app_utils.get_name_with_prefix(t['name'])
+            table = self.create_table(t_name, table_name=t_name,
+                                      partition_key=t.get('partitionKey', 'id'),
+                                      sort_key=t.get('sortKey'),
+                                      time_to_live_attribute=t.get('timeToLiveAttribute'))
+            
+            for index in t.get('globalSecondaryIndexes', []):
+                self.add_global_secondary_index(table, index)
         
 
-    def create_table(self, table_id: str, table_name: str, removal_policy=RemovalPolicy.DESTROY) -> dynamodb.Table:
+    def create_table(self, table_id: str, table_name: str, partition_key: str = 'id', sort_key: str = None,
+                     time_to_live_attribute: str = None, removal_policy=RemovalPolicy.DESTROY) -> dynamodb.Table:
         """
         Helper function to create a DynamoDB table with consistent configuration
         """
         table = dynamodb.Table(self, table_id, table_name=table_name,
-            partition_key=dynamodb.Attribute(name='id', type=dynamodb.AttributeType.STRING),
+            partition_key=dynamodb.Attribute(name=partition_key, type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name=sort_key, type=dynamodb.AttributeType.STRING) if sort_key else None,
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute=time_to_live_attribute,
             removal_policy=removal_policy
         )
         
-        return table
\ No newline at end of file
+        return table
+    
+    
+    def add_global_secondary_index(self, table: dynamodb.Table, index: dict) -> None:
+        """
+        Helper function to add a global secondary index to a table
+        
+        Args:
+            table (dynamodb.Table): The table
+            index (dict): The index definition with an indexName, a partitionKey and an optional sortKey
+        """
+        sort_key = index.get('sortKey')
+        
+        table.add_global_secondary_index(
+            index_name=index['indexName'],
+            partition_key=dynamodb.Attribute(name=index['partitionKey'], type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name=sort_key, type=dynamodb.AttributeType.STRING) if sort_key else None,
+            projection_type=dynamodb.ProjectionType.ALL
+        )
@@ -7,6 +7,29 @@ table_name = os.environ.get('settings_table_name')
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(table_name)
 
+# The key of the settings item, see lib/settings_store.py. The authorizer is packaged without the lib folder
+SETTINGS_ID = 'settings'
+
+
+def get_settings_item() -> dict:
+    """
+    Get the settings item, which holds the session token
+    
+    Returns (dict): The settings item. None if there are no settings
+    """
+    # A consistent read, so a token is valid right after the login
+    response = table.get_item(Key={'id': SETTINGS_ID}, ConsistentRead=True)
+    if 'Item' in response:
+        return response['Item']
+    
+    # The settings of an older install that didn't log in since the upgrade, which moves them to the settings key
+    response = table.scan(Limit=1)
+    if 'Items' in response and response['Items']:
+        return response['Items'][0]
+    
+    return None
+
+
 def handler(event, context):
     try:
         # Extract the token from the Authorization header
@@ -15,16 +38,15 @@ def handler(event, context):
         if not token:
             return generate_policy('Deny', event['methodArn'])
 
-        # Get the first entry from the DynamoDB table
-        response = table.scan(Limit=1)
+        # Get the settings item from the DynamoDB table
+        settings_item = get_settings_item()
         # Check if there's an item and if it has a session_token that matches
-        if 'Items' in response and response['Items']:
-            first_item = response['Items'][0]
-            stored_token = first_item.get('session_token')
+        if settings_item is not None:
+            stored_token = settings_item.get('session_token')
             if stored_token and stored_token == token:
                 # Get current time and stored expiration time
                 current_time = datetime.utcnow()
-                stored_expiration_str = first_item.get('token_expiration')
+                stored_expiration_str = settings_item.get('token_expiration')
                 
                 if stored_expiration_str:
                     # Convert stored string to datetime object
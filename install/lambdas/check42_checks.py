@@ -22,7 +22,7 @@ def handler(event, context):
 
     try:
         if event.get('httpMethod') == 'GET':
-            checks = utils.get_checks()
+            checks = utils.get_checks('ui')
 
             if checks is None:
                 status_code = 500
@@ -45,6 +45,7 @@ def handler(event, context):
                     status_code = 500
                     print(json.dumps(update_errors))
                     errors.append('Failed updating one or more checks. Check the logs')
+                    errors.extend(f"{item['id']}: {item['error']}" for item in update_errors)
                 else:
                     status_code = 200
                     response_body['message'] = "Update completed successfully"
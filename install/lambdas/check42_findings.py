@@ -0,0 +1,48 @@
+from lib.utils import Utils
+from lib.log_query import LogQuery, DEFAULT_PAGE_SIZE
+
+utils = Utils()
+
+FILTER_PARAMETERS = ['run_id', 'check_id', 'status', 'region', 'since', 'until']
+
+
+def handler(event, context):
+    errors=[]
+    status_code = 200
+    response_body = {
+        'status': 'success',
+        'message': ''
+    }
+
+    try:
+        if event.get('httpMethod') == 'GET':
+            parameters = event.get('queryStringParameters') or {}
+            filters = {key: parameters[key] for key in FILTER_PARAMETERS if parameters.get(key)}
+            fields = [f.strip() for f in parameters['fields'].split(',')] if parameters.get('fields') else None
+
+            log_query = LogQuery(utils.log_table_name)
+            page = log_query.query_page(
+                filters,
+                fields=fields,
+                limit=int(parameters.get('limit', DEFAULT_PAGE_SIZE)),
+                cursor=parameters.get('cursor')
+            )
+
+            response_body['message'] = page
+        else:
+            status_code = 400
+            errors.append('Unsupported HTTP method')
+    except ValueError as e:
+        status_code = 400
+        errors.append(str(e))
+    except Exception as e:
+        print(e)
+        status_code = 500
+        errors.append('Internal server error. Check the logs')
+
+    if len(errors) > 0:
+        response_body['status'] = 'error'
+        response_body['message'] = errors
+
+    response = utils.lambda_response(response_body, status_code)
+    return response
@@ -7,13 +7,13 @@ from botocore.exceptions import ClientError
 import logging
 import hashlib
 from lib.utils import Utils
+from lib.settings_store import SettingsStore
 
 utils = Utils()
 
 # Initialize services
 table_name = os.environ.get('settings_table_name')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(table_name)
+settings_store = SettingsStore(table_name)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -23,18 +23,13 @@ def verify_credentials_and_update_token(username: str, password: str) -> tuple[b
     Verify credentials and update token in DynamoDB
     """
     try:
-        # Scan DynamoDB for first item
-        response = table.scan(
-            Limit=1
-        )
+        # Get the settings item, which holds the user
+        stored_user = settings_store.get(consistent_read=True)
         
-        # Check if any items exist
-        if 'Items' not in response or not response['Items']:
+        # Check if the user exists
+        if stored_user is None:
             logger.info("No users found in database")
             return False, None
-            
-        # Get the first user
-        stored_user = response['Items'][0]
 
         # Simple raw password comparison, returning early upon failure
         hash_object = hashlib.sha256()
@@ -55,14 +50,11 @@ def verify_credentials_and_update_token(username: str, password: str) -> tuple[b
         # Format expiration time as ISO format string
         expiration_str = expiration_time.strftime('%Y-%m-%d %H:%M:%S')
         
-        # Update DynamoDB with new token
-        table.put_item(
-            Item={
-                **stored_user,  # Keep all existing fields
-                'session_token': session_token,  # Update/add token field
-                'token_expiration': expiration_str  # Add expiration timestamp
-            }
-        )
+        # Update DynamoDB with new token, keeping all the other fields
+        settings_store.update({
+            'session_token': session_token,
+            'token_expiration': expiration_str
+        })
         
         return True, session_token
         
@@ -1,51 +1,382 @@
 import os
-import boto3
+import time
+import uuid
 import json
-from botocore.exceptions import ClientError
 from modules.basic import Basic
 from lib.mailer import Mailer
 from lib.logger import Logger
 from lib.settings import Settings
 from lib.utils import Utils
+from lib.dispatcher import create_dispatcher
+from lib.checkpoint import Checkpoint, CheckpointStore
+from lib.client_pool import get_client
+from lib.findings import FindingsStore
+from lib.exporter import ResultsExporter, create_sink
+from lib.post_processor import PostProcessor
+from lib.run_ledger import RunLedger
+from lib.run_metrics import RunMetrics
+from lib.check_plan import compile_check_plans
 
 utils = Utils()
 
-def run_checks() -> None:
+run_function_name = os.environ.get('run_function_name')
+
+
+def run_basic_checks(basic_checker: Basic, settings: Settings, deadline: float = None,
+                     check_names: list = None) -> tuple[list, list]:
+    """
+    Run the basic checks, either in this invocation or split into shards sent to workers
+    
+    Args:
+        basic_checker (Basic): The basic checks module
+        settings (Settings): The settings object
+        deadline (float): Optional. A time.monotonic() value after which no check is waited for
+        check_names (list): Optional. The names of the checks to run. All the enabled checks if not set
+    
+    Returns (tuple): A list of check results and a list of the check names that did not complete
+    """
+    defaults = settings.defaults if settings is not None else {}
+    
+    if defaults.get('runMode', 'local') != 'sharded':
+        return basic_checker.run_checks_until(deadline, check_names)
+    
+    dispatcher = create_dispatcher(
+        defaults.get('dispatcher', 'thread'),
+        basic_checker.run_shard,
+        function_name=run_function_name,
+        max_workers=defaults.get('shardWorkers', 16)
+    )
+    
+    shards = basic_checker.get_shards()
+    if check_names is not None:
+        shards = [shard for shard in shards if shard['check'] in check_names]
+    shard_results, pending_shards = dispatcher.dispatch(shards, deadline)
+    
+    # A check with a shard that did not complete by the deadline runs again, in all its regions, in a continuation
+    pending_checks = list(dict.fromkeys(shard['check'] for shard in pending_shards))
+    completed_shard_results = [result for result in shard_results if result['check'] not in pending_checks]
+    
+    return basic_checker.aggregate_shard_results(completed_shard_results), pending_checks
+
+
+def get_deadline(context, settings: Settings) -> float:
+    """
+    Get the time by which the checks must stop, leaving time to checkpoint or to log and mail the results
+    
+    Args:
+        context (LambdaContext): The Lambda context. None when not running in Lambda
+        settings (Settings): The settings object
+    
+    Returns (float): A time.monotonic() deadline. None if there's no deadline
+    """
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    
+    defaults = settings.defaults if settings is not None else {}
+    margin = defaults.get('deadlineMargin', 15)
+    
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - margin
+
+
+def order_results(results: list, checks: list) -> list:
+    """
+    Order check results by the order of the checks table
+    
+    Args:
+        results (list): A list of check results
+        checks (list): A list of CheckPlan objects
+    
+    Returns (list): The results in the checks order
+    """
+    check_order = {c.name: index for index, c in enumerate(checks)}
+    
+    return sorted(results, key=lambda result: check_order.get(result['check'], len(check_order)))
+
+
+def invoke_continuation(run_id: str) -> None:
+    """
+    Invoke a new run Lambda Function that resumes a checkpointed run
+    
+    Args:
+        run_id (str): The run id
+    """
+    lambda_client = get_client('lambda')
+    lambda_client.invoke(
+        FunctionName=run_function_name,
+        InvocationType='Event',
+        Payload=json.dumps({'continuation': run_id})
+    )
+
+
+def export_results(results: list, run_id: str, settings: Settings) -> None:
+    """
+    Export the results of a run to the configured sink
+    
+    Args:
+        results (list): A list of check results
+        run_id (str): The run id
+        settings (Settings): The settings object
+    """
+    defaults = settings.defaults if settings is not None else {}
+    sink_type = defaults.get('exportSink', 'none')
+    
+    if sink_type == 'none':
+        return
+    
+    sink = create_sink(sink_type, bucket=defaults.get('exportBucket'), prefix=defaults.get('exportPrefix', ''),
+                       directory=defaults.get('exportDirectory', '/tmp/check42_export'))
+    exporter = ResultsExporter(sink, defaults.get('exportFormats', ['jsonl']))
+    exporter.export(results, run_id)
+
+
+def log_results(logger: Logger, results: list, run_id: str, delta, settings: Settings) -> None:
+    """
+    Log the results of a run and add them to the daily summaries
+    
+    Args:
+        logger (Logger): The logger
+        results (list): A list of check results
+        run_id (str): The run id
+        delta (FindingsDelta): The findings delta of the run
+        settings (Settings): The settings object
+    """
+    defaults = settings.defaults if settings is not None else {}
+    
+    log_delta = delta if defaults.get('logMode', 'transitions') == 'transitions' else None
+    report = logger.log_checks(results, run_id, log_delta)
+    logger.roll_up(results, delta, run_id)
+    
+    if report['failed'] > 0:
+        raise Exception(f"{report['failed']} log items could not be written")
+
+
+def record_run_metrics(run_ledger: RunLedger, run_id: str, run_metrics: RunMetrics, results: list,
+                       basic_checker: Basic = None) -> None:
+    """
+    Add the metrics of this invocation to the run summary. A failure to record them doesn't fail the run
+    
+    Args:
+        run_ledger (RunLedger): The run ledger
+        run_id (str): The run id
+        run_metrics (RunMetrics): The metrics of this invocation
+        results (list): A list of the check results of this invocation
+        basic_checker (Basic): Optional. The basic checks module
+    """
+    run_metrics.stop()
+    
+    try:
+        run_ledger.record_metrics(run_id, run_metrics.get_summary(results, basic_checker))
+    except Exception as e:
+        print(f"Error recording the metrics of run {run_id}: {str(e)}")
+
+
+def save_checkpoint(checkpoint_store: CheckpointStore, checkpoint: Checkpoint) -> bool:
+    """
+    Save the checkpoint of a run that continues in another invocation. A failure to save it doesn't fail the
+    run, which completes with the results so far instead
+    
+    Args:
+        checkpoint_store (CheckpointStore): The checkpoint store
+        checkpoint (Checkpoint): The checkpoint to save
+    
+    Returns (bool): True if the checkpoint was saved
+    """
+    try:
+        checkpoint_store.save(checkpoint)
+        return True
+    except Exception as e:
+        print(f"Error saving the checkpoint of run {checkpoint.run_id}: {str(e)}")
+        return False
+
+
+def get_run_id(event: dict) -> str:
+    """
+    Get the id of the run an invocation belongs to, so retries of the same invocation share it
+    
+    Args:
+        event (dict): The Lambda event
+    
+    Returns (str): The run id
+    """
+    if event.get('continuation'):
+        return event['continuation']
+    
+    if event.get('run_id'):
+        return event['run_id']
+    
+    # EventBridge keeps the event id when it retries a scheduled invocation
+    if event.get('source') == 'aws.events' and event.get('id'):
+        return event['id']
+    
+    request_id = (event.get('requestContext') or {}).get('requestId')
+    if request_id:
+        return request_id
+    
+    return str(uuid.uuid4())
+
+
+def run_shard(shard: dict) -> dict:
+    """
+    Run a single (check, region) shard as a worker
+    
+    Args:
+        shard (dict): A shard with the check name and the region
+    
+    Returns (dict): The shard result
+    """
+    settings = utils.get_settings()
+    checks = compile_check_plans(utils.get_checks('runner') or [], settings)
+    basic_checks = [item for item in checks if item.module == 'basic']
+    basic_checker = Basic(basic_checks, settings)
+    
+    return basic_checker.run_shard(shard)
+
+
+def run_checks(context=None, run_id: str = None, is_continuation: bool = False) -> dict:
     """
     Run the scheduled checks
+    
+    When the Lambda Function is about to time out, the completed results and the pending checks are saved in a
+    checkpoint and a continuation invocation resumes the run. The results are logged and mailed once, by the
+    invocation that completes the run.
+    
+    The progress of the run is kept in the run ledger. A retry of a completed run does nothing and a retry of 
+    a run that failed in its post processing only runs the sinks that did not complete.
+    
+    Args:
+        context (LambdaContext): Optional. The Lambda context, used to watch the remaining time
+        run_id (str): Optional. The run id. A new id is used if not set
+        is_continuation (bool): Optional. Whether the invocation resumes a checkpointed run. Default: False
+    
+    Returns (dict): The run id, whether the run completed or continues in another invocation, and the status 
+        of each post processing sink
     """
-    results = []
-    checks =  utils.get_checks()
     settings = utils.get_settings()
+    defaults = settings.defaults if settings is not None else {}
+    # The check items are compiled once per run, with their config parsed and validated. The same plans are 
+    # used by the checker, the logger and the mailer
+    checks = compile_check_plans(utils.get_checks('runner') or [], settings)
+    checkpoint_store = CheckpointStore(utils.runs_table_name)
+    run_ledger = RunLedger(utils.runs_table_name)
+    run_id = run_id or str(uuid.uuid4())
+    
+    ledger_item = run_ledger.start(run_id)
+    if run_ledger.is_completed(ledger_item):
+        print(f"Run {run_id} already completed")
+        return {'run_id': run_id, 'completed': True, 'sinks': {}}
+    
+    checkpoint = checkpoint_store.load(run_id)
+    if is_continuation:
+        if checkpoint is None:
+            print(f"No checkpoint found for run {run_id}")
+            return {'run_id': run_id, 'completed': True, 'sinks': {}}
+        pending_check_names = checkpoint.pending_checks
+    else:
+        if checkpoint is not None:
+            # A retry of an invocation that already handed the run over to a continuation
+            print(f"Run {run_id} already continues in another invocation")
+            return {'run_id': run_id, 'completed': False, 'sinks': {}}
+        checkpoint = Checkpoint(run_id)
+        pending_check_names = None
+    
+    results = list(checkpoint.results)
+    invocation_results = []
+    pending_checks = []
+    basic_checker = None
+    deadline = get_deadline(context, settings)
+    run_metrics = RunMetrics()
+    run_metrics.start()
     
-    if checks is not None:
-        basic_checks = [item for item in checks if item['module'] == 'basic']
+    basic_checks = [item for item in checks if item.module == 'basic']
+    
+    if len(basic_checks) > 0:
+        basic_checker = Basic(basic_checks, settings)
+        basic_checks_results, pending_checks = run_basic_checks(basic_checker, settings, deadline,
+                                                                pending_check_names)
+        invocation_results.extend(basic_checks_results)
+    
+    results.extend(invocation_results)
+    
+    results = order_results(results, checks)
+    
+    if len(pending_checks) > 0:
+        if checkpoint.continuations < defaults.get('maxContinuations', 5) and \
+                save_checkpoint(checkpoint_store, Checkpoint(run_id, results, pending_checks,
+                                                             checkpoint.continuations + 1)):
+            invoke_continuation(run_id)
+            record_run_metrics(run_ledger, run_id, run_metrics, invocation_results, basic_checker)
+            
+            print(f"Run {run_id} continues with {len(pending_checks)} pending checks")
+            return {'run_id': run_id, 'completed': False, 'sinks': {}}
         
-        if len(basic_checks) > 0:
-            basic_checker = Basic(basic_checks, settings)
-            basic_checks_results = basic_checker.run_checks()
-            results.extend(basic_checks_results)
+        # Give up on checks that could not complete in any invocation, or that could not be checkpointed
+        for check_name in pending_checks:
+            timed_out_result = {'check': check_name, 'pass': None, 'info': [],
+                                'error': 'The check did not complete before the run deadline'}
+            results.append(timed_out_result)
+            invocation_results.append(timed_out_result)
+        results = order_results(results, checks)
+    
+    # Compare the findings with the ones that were open after the previous run
+    findings_store = FindingsStore(utils.findings_table_name, defaults.get('logWorkers', 4))
+    delta = findings_store.compute_delta(results)
     
-    # Log the results
     logs_table_name = utils.log_table_name
-    logger = Logger(logs_table_name, checks)
-    logger.log_checks(results)
+    logger = Logger(logs_table_name, checks, defaults.get('logWorkers', 4), defaults.get('logChunkSize', 100),
+                    defaults.get('logCompressThreshold', 32768), defaults.get('logRetentionDays', 30))
     
-    # Send the results in an email
     sender = settings.sender
     recipient = settings.subscriber
     mailer = Mailer(checks, sender, recipient)
-    mailer.send_message_from_checks(results)
+    mail_delta = delta if defaults.get('mailMode', 'full') == 'deltas' else None
+    
+    def run_sink_once(sink_name: str, sink_function) -> None:
+        sink_function()
+        run_ledger.complete_sink(run_id, sink_name)
+    
+    # The sinks don't depend on each other, so they run concurrently and a failing sink doesn't stop the others
+    post_processor = PostProcessor()
+    post_processor.add_sink('log', lambda: run_sink_once(
+        'log', lambda: log_results(logger, results, run_id, delta, settings)))
+    post_processor.add_sink('mail', lambda: run_sink_once(
+        'mail', lambda: mailer.send_message_from_checks(results, mail_delta)))
+    post_processor.add_sink('export', lambda: run_sink_once(
+        'export', lambda: export_results(results, run_id, settings)))
+    
+    # A retried run skips the sinks that already completed
+    sinks_report = post_processor.run(run_ledger.get_completed_sinks(ledger_item))
+    record_run_metrics(run_ledger, run_id, run_metrics, invocation_results, basic_checker)
+    
+    # Only update the open findings once all the sinks succeeded, so a failed run reports them again
+    if post_processor.succeeded(sinks_report):
+        findings_store.apply(delta)
+        run_ledger.complete(run_id, ledger_item.get('started_at'))
+        
+        # A retry of a continuation that failed before this point resumes from the checkpoint
+        if is_continuation:
+            checkpoint_store.delete(checkpoint.run_id)
+    
+    return {'run_id': run_id, 'completed': True, 'sinks': sinks_report}
         
         
         
 def handler(event, context):
+    # A worker invocation of a sharded run
+    if 'shard' in event:
+        return run_shard(event['shard'])
+    
     response_body = {
         'status': 'success',
         'message': ''
     }
 
-    run_checks()
+    run_report = run_checks(context, get_run_id(event), 'continuation' in event)
+    if not run_report['completed']:
+        response_body['message'] = 'The run continues in another invocation'
+    else:
+        if any(status['status'] != 'success' for status in run_report['sinks'].values()):
+            response_body['status'] = 'error'
+        response_body['message'] = run_report
     
     response = utils.lambda_response(response_body)
     return response
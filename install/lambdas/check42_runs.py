@@ -0,0 +1,52 @@
+from lib.utils import Utils
+from lib.run_ledger import RunLedger, DEFAULT_RUNS_PAGE_SIZE
+from lib.log_query import encode_cursor
+
+utils = Utils()
+
+
+def handler(event, context):
+    errors=[]
+    status_code = 200
+    response_body = {
+        'status': 'success',
+        'message': ''
+    }
+
+    try:
+        if event.get('httpMethod') == 'GET':
+            parameters = event.get('queryStringParameters') or {}
+            run_ledger = RunLedger(utils.runs_table_name)
+
+            if parameters.get('run_id'):
+                run = run_ledger.get_run(parameters['run_id'])
+                if run is None:
+                    status_code = 404
+                    errors.append('Run not found')
+                else:
+                    response_body['message'] = run
+            else:
+                start_key = run_ledger.get_start_key(parameters['cursor']) if parameters.get('cursor') else None
+                runs, last_evaluated_key = run_ledger.get_recent_runs(
+                    int(parameters.get('limit', DEFAULT_RUNS_PAGE_SIZE)),
+                    start_key
+                )
+
+                response_body['message'] = {'items': runs, 'cursor': encode_cursor(last_evaluated_key)}
+        else:
+            status_code = 400
+            errors.append('Unsupported HTTP method')
+    except ValueError as e:
+        status_code = 400
+        errors.append(str(e))
+    except Exception as e:
+        print(e)
+        status_code = 500
+        errors.append('Internal server error. Check the logs')
+
+    if len(errors) > 0:
+        response_body['status'] = 'error'
+        response_body['message'] = errors
+
+    response = utils.lambda_response(response_body, status_code)
+    return response
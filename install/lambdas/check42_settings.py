@@ -4,14 +4,13 @@ import boto3
 from botocore.exceptions import ClientError
 from lib.settings import Settings
 from lib.utils import Utils
+from lib.settings_store import SettingsStore
 
 
 utils = Utils()
 
-# Initialize DynamoDB client
 table_name = os.environ.get('settings_table_name')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(table_name)
+settings_store = SettingsStore(table_name)
 
 
 def get_settings() -> dict:
@@ -25,14 +24,10 @@ def get_settings() -> dict:
         }
         
     try:
-        # Scan the table and limit to 1 item
-        response = table.scan(
-            Limit=1
-        )
+        cached_settings = utils.get_settings()
         
-        # Check if any items exist
-        if response['Items']:    
-            settings['subscriber'] = response['Items'][0]['subscriber']
+        if cached_settings is not None:
+            settings['subscriber'] = cached_settings.subscriber
             
     except ClientError as e:
         print(e)
@@ -43,7 +38,7 @@ def get_settings() -> dict:
 
 def set_settings(settings: dict) -> bool:
     """
-    Update only the provided settings for the first record in the DynamoDB settings table
+    Update only the provided settings in the DynamoDB settings table
     
     Args:
         settings (dict): A dictionary containing the settings to update
@@ -51,47 +46,19 @@ def set_settings(settings: dict) -> bool:
     Returns (bool): True if updated successfully and False otherwise
     """
     try:
-        # First get the first item from the table
-        response = table.scan(
-            Limit=1
-        )
+        values = {}
         
-        # Get the id of the first item
-        if 'Items' not in response or not response['Items']:
-            print("No items found in table")
-            return False
-            
-        item_id = response['Items'][0]['id']  # Remove ['S']
-        
-        # Dynamically build the update expression and attribute values
-        update_parts = []
-        expression_values = {}
-        
-        # For each setting provided, add it to the update expression
         for key, value in settings.items():
             if key == 'password':
                 value = utils.hash_password(value)
-            update_parts.append(f"#{key} = :{key}")
-            expression_values[f":{key}"] = value
+            values[key] = value
         
-        if not update_parts:
+        if not settings_store.update(values):
+            print("No settings found")
             return False
-            
-        update_expression = "SET " + ", ".join(update_parts)
-        (update_expression)
-        
-        # Create expression attribute names
-        expression_names = {f"#{key}": key for key in settings.keys()}
         
-        # Update only the provided fields
-        response = table.update_item(
-            Key={
-                'id': item_id
-            },
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values,
-            ExpressionAttributeNames=expression_names
-        )
+        # Let the cached settings of all the Lambda Functions expire
+        utils.bump_config_version()
         
         return True
         
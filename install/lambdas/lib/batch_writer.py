@@ -0,0 +1,175 @@
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeSerializer
+from .client_pool import get_client
+
+# The maximum number of items DynamoDB accepts in a single BatchWriteItem request
+BATCH_SIZE = 25
+
+THROTTLING_ERROR_CODES = ['ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded']
+
+
+class BatchWriteReport:
+    def __init__(self) -> None:
+        """
+        Initialize a report of a batched write
+        """
+        self.written = 0
+        self.failed_items = []
+
+
+    def add_failed_items(self, items: list, error: str) -> None:
+        """
+        Add items that could not be written
+
+        Args:
+            items (list): The items that were not written
+            error (str): The reason they were not written
+        """
+        for item in items:
+            self.failed_items.append({'item': item, 'error': error})
+
+
+    def has_failures(self) -> bool:
+        return len(self.failed_items) > 0
+
+
+    def to_dict(self) -> dict:
+        """
+        Get the report as a dictionary
+
+        Returns (dict): The number of written items, the number of failed items and the failed items
+        """
+        return {
+            'written': self.written,
+            'failed': len(self.failed_items),
+            'failed_items': self.failed_items
+        }
+
+
+class BatchWriter:
+    def __init__(self, table_name: str, max_workers: int = 1, max_retries: int = 5,
+                 base_delay: float = 0.05, max_delay: float = 2.0) -> None:
+        """
+        Initialize the BatchWriter class
+
+        Args:
+            table_name (str): The DynamoDB table name
+            max_workers (int): The maximum number of batches written at the same time. Default: 1
+            max_retries (int): The number of times unprocessed items are retried. Default: 5
+            base_delay (float): The delay in seconds before the first retry. Doubled on each retry. Default: 0.05
+            max_delay (float): The maximum delay in seconds between retries. Default: 2
+        """
+        self.table_name = table_name
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.serializer = TypeSerializer()
+
+
+    def serialize_item(self, item: dict) -> dict:
+        return {key: self.serializer.serialize(value) for key, value in item.items()}
+
+
+    def get_delay(self, attempt: int) -> float:
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+    def get_request(self, item: dict, request_type: str) -> dict:
+        if request_type == 'DeleteRequest':
+            return {'DeleteRequest': {'Key': self.serialize_item(item)}}
+
+        return {'PutRequest': {'Item': self.serialize_item(item)}}
+
+
+    def write_batch(self, items: list, request_type: str = 'PutRequest') -> BatchWriteReport:
+        """
+        Write a single batch of up to 25 items, retrying the unprocessed items with exponential backoff
+
+        Args:
+            items (list): A list of items to put, or of keys to delete
+            request_type (str): PutRequest or DeleteRequest. Default: PutRequest
+
+        Returns (BatchWriteReport): The batch report
+        """
+        report = BatchWriteReport()
+        dynamodb_client = get_client('dynamodb')
+
+        # Pair each request with its original item, so failures are reported in a readable form
+        pending = [(self.get_request(item, request_type), item) for item in items]
+
+        attempt = 0
+        while True:
+            try:
+                response = dynamodb_client.batch_write_item(
+                    RequestItems={self.table_name: [request for request, item in pending]})
+            except ClientError as e:
+                error_code = e.response['Error']['Code']
+                if error_code in THROTTLING_ERROR_CODES and attempt < self.max_retries:
+                    time.sleep(self.get_delay(attempt))
+                    attempt += 1
+                    continue
+
+                report.add_failed_items([item for request, item in pending], e.response['Error']['Message'])
+                return report
+
+            unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            report.written += len(pending) - len(unprocessed)
+
+            if len(unprocessed) == 0:
+                return report
+
+            pending = [(request, item) for request, item in pending if request in unprocessed]
+
+            if attempt >= self.max_retries:
+                report.add_failed_items([item for request, item in pending],
+                                        f'Unprocessed after {self.max_retries} retries')
+                return report
+
+            time.sleep(self.get_delay(attempt))
+            attempt += 1
+
+
+    def write(self, items: list, request_type: str = 'PutRequest') -> BatchWriteReport:
+        """
+        Write items in batches of 25, optionally writing several batches at the same time
+
+        Args:
+            items (list): A list of items to put, or of keys to delete
+            request_type (str): PutRequest or DeleteRequest. Default: PutRequest
+
+        Returns (BatchWriteReport): A report of the written items and the items that still failed
+        """
+        report = BatchWriteReport()
+        batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+
+        if len(batches) == 0:
+            return report
+
+        if self.max_workers == 1 or len(batches) == 1:
+            batch_reports = [self.write_batch(batch, request_type) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                batch_reports = list(executor.map(lambda batch: self.write_batch(batch, request_type), batches))
+
+        for batch_report in batch_reports:
+            report.written += batch_report.written
+            report.failed_items.extend(batch_report.failed_items)
+
+        return report
+
+
+    def delete(self, keys: list) -> BatchWriteReport:
+        """
+        Delete items by their keys in batches of 25
+
+        Args:
+            keys (list): A list of item keys
+
+        Returns (BatchWriteReport): A report of the deleted items and the keys that still failed
+        """
+        return self.write(keys, 'DeleteRequest')
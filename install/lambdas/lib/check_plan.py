@@ -0,0 +1,137 @@
+import json
+from .check_type import CheckType
+from .settings import Settings
+from .region_catalog import region_catalog
+
+
+class CheckPlan:
+    """
+    A check item compiled once per run, with its JSON config parsed and validated
+    """
+    __slots__ = ('id', 'name', 'title', 'description', 'version', 'module', 'enabled', 'muted', 'config',
+                 'configured_regions', 'timeout', 'required_resources', 'required_tags', 'email_templates',
+                 'error', 'resolved_regions')
+
+    def __init__(self) -> None:
+        self.id = None
+        self.name = None
+        self.title = None
+        self.description = None
+        self.version = None
+        self.module = None
+        self.enabled = False
+        self.muted = False
+        self.config = {}
+        self.configured_regions = []
+        self.timeout = None
+        self.required_resources = []
+        self.required_tags = []
+        self.email_templates = {}
+        self.error = None
+        self.resolved_regions = None
+
+
+    @staticmethod
+    def from_item(item: dict, defaults: dict = None):
+        """
+        Compile a check item from the DynamoDB checks table
+
+        An invalid config doesn't raise. It's kept in the error attribute, so only this check fails
+
+        Args:
+            item (dict): The check item
+            defaults (dict): Optional. The settings defaults
+
+        Returns (CheckPlan): A CheckPlan object
+        """
+        defaults = defaults or {}
+        plan = CheckPlan()
+
+        plan.id = item.get('id')
+        plan.name = item.get('name')
+        plan.title = item.get('title', plan.name)
+        plan.description = item.get('description')
+        plan.version = item.get('version')
+        plan.module = item.get('module')
+        plan.enabled = item.get('enabled') == True
+        plan.muted = bool(item.get('muted', False))
+        plan.configured_regions = defaults.get('regions', [])
+        plan.timeout = defaults.get('checkTimeout', 50)
+
+        try:
+            if 'config' in item:
+                plan.config = json.loads(item['config'])
+
+            if 'email_templates' in item:
+                plan.email_templates = json.loads(item['email_templates'])
+
+            # The check config overrides the default regions and timeout
+            if 'regions' in plan.config:
+                plan.configured_regions = plan.config['regions']
+            if 'timeout' in plan.config:
+                plan.timeout = plan.config['timeout']
+
+            if not isinstance(plan.configured_regions, list) or \
+                    not all(isinstance(region, str) for region in plan.configured_regions):
+                raise ValueError('regions must be a list of region names')
+
+            if plan.name == CheckType.MISSING_TAGS.value:
+                if not isinstance(plan.config.get('resources'), list) or \
+                        not isinstance(plan.config.get('requiredTags'), list):
+                    raise ValueError('resources and requiredTags must be lists')
+
+                plan.required_resources = plan.config['resources']
+                plan.required_tags = plan.config['requiredTags']
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError too
+            plan.error = f'Invalid config of check {plan.name}: {str(e)}'
+
+        return plan
+
+
+    @property
+    def regions(self) -> list:
+        """
+        The regions the check runs in. Resolved on first use, skipping the regions that are not enabled
+        """
+        if self.resolved_regions is None:
+            if len(self.configured_regions) == 1 and self.configured_regions[0] == '*':
+                self.resolved_regions = region_catalog.get_enabled_regions()
+            else:
+                # Skip configured regions that are not enabled, so no request is made to them
+                self.resolved_regions = [region for region in self.configured_regions
+                                         if region_catalog.is_enabled(region)]
+
+        return list(self.resolved_regions)
+
+
+    def for_regions(self, regions: list):
+        """
+        Get a copy of the plan that runs in the given regions only, as a shard of a regional check does
+
+        Args:
+            regions (list): The region names
+
+        Returns (CheckPlan): A CheckPlan object
+        """
+        plan = CheckPlan()
+        for slot in CheckPlan.__slots__:
+            setattr(plan, slot, getattr(self, slot))
+        plan.resolved_regions = list(regions)
+
+        return plan
+
+
+def compile_check_plans(items: list, settings: Settings = None) -> list:
+    """
+    Compile the check items of a run
+
+    Args:
+        items (list): A list of check items, in the checks table order
+        settings (Settings): Optional. The settings object
+
+    Returns (list): A list of CheckPlan objects in the same order
+    """
+    defaults = settings.defaults if settings is not None else {}
+
+    return [CheckPlan.from_item(item, defaults) for item in items]
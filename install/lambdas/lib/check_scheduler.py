@@ -0,0 +1,147 @@
+import time
+import threading
+from collections import deque
+
+# How often the scheduler tests a shared cancellation event, which can't wake it up
+CANCELLED_POLL_INTERVAL = 0.1
+
+
+class CheckCancelled(Exception):
+    """
+    Raised by a check body that stopped because the check was no longer waited for
+    """
+
+
+class ScheduledCheck:
+    def __init__(self, name: str, check_function, timeout: float = None) -> None:
+        """
+        Initialize a check to be run by the CheckScheduler
+
+        Args:
+            name (str): The check name
+            check_function (callable): A function that gets the check cancellation event and runs the check
+            timeout (float): Optional. The maximum number of seconds the check may run
+        """
+        self.name = name
+        self.check_function = check_function
+        self.timeout = timeout
+        # Set when the check timed out or was deferred, so its body stops making requests
+        self.cancelled = threading.Event()
+        self.value = None
+        self.error = None
+        self.timed_out = False
+        self.deferred = False
+        self.started_at = None
+        self.duration = None
+
+
+class CheckScheduler:
+    def __init__(self, max_workers: int = 4, default_timeout: float = None) -> None:
+        """
+        Initialize the CheckScheduler class
+
+        Args:
+            max_workers (int): The maximum number of checks to run at the same time. Default: 4
+            default_timeout (float): Optional. The timeout in seconds for checks without their own timeout
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.default_timeout = default_timeout
+
+
+    def run(self, scheduled_checks: list, deadline: float = None, cancelled: threading.Event = None) -> list:
+        """
+        Run a list of independent checks concurrently
+
+        A check that runs longer than its timeout is marked as timed out and its worker is abandoned,
+        so it no longer counts against the concurrency cap. Checks that did not complete by the deadline
+        are marked as deferred, so they can be run again later.
+
+        Python threads can't be stopped from the outside. An abandoned worker keeps running until its check
+        body returns, and in a Lambda environment that is reused it resumes in the next invocation. So the
+        cancelled event of a timed out or deferred check is set, and check bodies are expected to test it
+        between requests and raise CheckCancelled. A request that is already in flight still completes.
+
+        A shared cancelled event, set by a caller that no longer waits for the checks, is handled like the 
+        deadline.
+
+        Args:
+            scheduled_checks (list): A list of ScheduledCheck objects
+            deadline (float): Optional. A time.monotonic() value after which no check is waited for
+            cancelled (threading.Event): Optional. When set, no check is waited for
+
+        Returns (list): The same ScheduledCheck objects, in the original order, with their value or error set
+        """
+        condition = threading.Condition()
+        pending = deque(scheduled_checks)
+        running = {}
+        finished = set()
+
+        def worker(scheduled_check: ScheduledCheck) -> None:
+            value = None
+            error = None
+            try:
+                value = scheduled_check.check_function(scheduled_check.cancelled)
+            except Exception as e:
+                error = e
+
+            with condition:
+                # A check that already timed out or was deferred is no longer waited for
+                if not scheduled_check.timed_out and not scheduled_check.deferred:
+                    scheduled_check.value = value
+                    scheduled_check.error = error
+                finished.add(id(scheduled_check))
+                condition.notify_all()
+
+        with condition:
+            while pending or running:
+                if (deadline is not None and time.monotonic() >= deadline) or \
+                        (cancelled is not None and cancelled.is_set()):
+                    # Out of time. Whatever did not complete is deferred
+                    for scheduled_check in list(pending) + list(running.values()):
+                        scheduled_check.deferred = True
+                        scheduled_check.cancelled.set()
+                    break
+
+                # Start as many checks as the concurrency cap allows
+                while pending and len(running) < self.max_workers:
+                    scheduled_check = pending.popleft()
+                    if scheduled_check.timeout is None:
+                        scheduled_check.timeout = self.default_timeout
+
+                    scheduled_check.started_at = time.monotonic()
+                    running[id(scheduled_check)] = scheduled_check
+                    threading.Thread(target=worker, args=(scheduled_check,), daemon=True).start()
+
+                # Wait for a check to complete or for the closest timeout
+                wait_time = None
+                now = time.monotonic()
+                for scheduled_check in running.values():
+                    if scheduled_check.timeout is not None:
+                        remaining = scheduled_check.started_at + scheduled_check.timeout - now
+                        wait_time = remaining if wait_time is None else min(wait_time, remaining)
+
+                if deadline is not None:
+                    wait_time = deadline - now if wait_time is None else min(wait_time, deadline - now)
+
+                if cancelled is not None:
+                    wait_time = CANCELLED_POLL_INTERVAL if wait_time is None else \
+                        min(wait_time, CANCELLED_POLL_INTERVAL)
+
+                if not finished.intersection(running.keys()):
+                    condition.wait(timeout=max(wait_time, 0) if wait_time is not None else None)
+
+                now = time.monotonic()
+                for check_key, scheduled_check in list(running.items()):
+                    if check_key in finished:
+                        scheduled_check.duration = now - scheduled_check.started_at
+                        del running[check_key]
+                    elif scheduled_check.timeout is not None and \
+                            now - scheduled_check.started_at >= scheduled_check.timeout:
+                        scheduled_check.timed_out = True
+                        scheduled_check.cancelled.set()
+                        scheduled_check.duration = now - scheduled_check.started_at
+                        scheduled_check.error = TimeoutError(
+                            f'Check {scheduled_check.name} timed out after {scheduled_check.timeout} seconds')
+                        del running[check_key]
+
+        return scheduled_checks
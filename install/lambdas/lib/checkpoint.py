@@ -0,0 +1,148 @@
+import json
+import zlib
+import datetime
+import boto3
+
+# The compressed results are split into items of up to this many bytes, well below the DynamoDB item size limit
+CHECKPOINT_CHUNK_SIZE = 350 * 1024
+
+
+class Checkpoint:
+    def __init__(self, run_id: str, results: list = None, pending_checks: list = None,
+                 continuations: int = 0) -> None:
+        """
+        Initialize a checkpoint of a run that did not complete in a single invocation
+
+        Args:
+            run_id (str): The run id
+            results (list): The results of the checks that completed so far
+            pending_checks (list): The names of the checks that still need to run
+            continuations (int): The number of continuation invocations made so far
+        """
+        self.run_id = run_id
+        self.results = results or []
+        self.pending_checks = pending_checks or []
+        self.continuations = continuations
+
+
+class CheckpointStore:
+    def __init__(self, table_name: str, chunk_size: int = CHECKPOINT_CHUNK_SIZE) -> None:
+        """
+        Initialize the CheckpointStore class
+
+        Args:
+            table_name (str): The DynamoDB runs table name
+            chunk_size (int): Optional. The maximum size in bytes of the results stored in a single item.
+                Default: 358400
+        """
+        self.table_name = table_name
+        self.chunk_size = max(1, int(chunk_size))
+        self.dynamodb = boto3.resource('dynamodb')
+
+
+    def get_key(self, run_id: str) -> dict:
+        return {'id': f'checkpoint#{run_id}'}
+
+
+    def get_chunk_key(self, run_id: str, generation: int, chunk_index: int) -> dict:
+        return {'id': f'checkpoint#{run_id}#{generation}#{chunk_index:05d}'}
+
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """
+        Save a run checkpoint
+
+        The compressed results are split into chunk items, written before the checkpoint item that references
+        them. Each save writes its chunks under its own generation, so a failed save leaves the previous
+        checkpoint intact. The chunks of the previous generation are deleted once the new one is saved.
+
+        Args:
+            checkpoint (Checkpoint): The checkpoint to save
+        """
+        table = self.dynamodb.Table(self.table_name)
+        previous_item = table.get_item(Key=self.get_key(checkpoint.run_id), ConsistentRead=True).get('Item')
+
+        # Results can be large, so they are stored compressed
+        results = zlib.compress(json.dumps(checkpoint.results).encode('utf-8'))
+        chunks = [results[i:i + self.chunk_size] for i in range(0, len(results), self.chunk_size)]
+        generation = checkpoint.continuations
+
+        for chunk_index, chunk in enumerate(chunks):
+            table.put_item(Item={
+                **self.get_chunk_key(checkpoint.run_id, generation, chunk_index),
+                'run_id': checkpoint.run_id,
+                'results': chunk
+            })
+
+        table.put_item(Item={
+            **self.get_key(checkpoint.run_id),
+            'run_id': checkpoint.run_id,
+            'record_type': 'checkpoint',
+            'generation': generation,
+            'chunk_count': len(chunks),
+            'pending_checks': checkpoint.pending_checks,
+            'continuations': checkpoint.continuations,
+            'updated_at': datetime.datetime.now().isoformat()
+        })
+
+        if previous_item is not None and int(previous_item['generation']) != generation:
+            self.delete_chunks(checkpoint.run_id, previous_item)
+
+
+    def load(self, run_id: str) -> Checkpoint:
+        """
+        Load a run checkpoint
+
+        Args:
+            run_id (str): The run id
+
+        Returns (Checkpoint): The checkpoint. None if there's no checkpoint for the run
+        """
+        table = self.dynamodb.Table(self.table_name)
+        response = table.get_item(Key=self.get_key(run_id), ConsistentRead=True)
+
+        if 'Item' not in response:
+            return None
+
+        item = response['Item']
+        results = b''
+        for chunk_index in range(int(item['chunk_count'])):
+            chunk_key = self.get_chunk_key(run_id, int(item['generation']), chunk_index)
+            chunk = table.get_item(Key=chunk_key, ConsistentRead=True)['Item']['results']
+            # Items read through boto3 wrap binary attributes
+            results += getattr(chunk, 'value', chunk)
+
+        results = json.loads(zlib.decompress(results).decode('utf-8'))
+
+        return Checkpoint(run_id, results, list(item.get('pending_checks', [])), int(item.get('continuations', 0)))
+
+
+    def delete_chunks(self, run_id: str, item: dict) -> None:
+        """
+        Delete the chunk items of a checkpoint
+
+        Args:
+            run_id (str): The run id
+            item (dict): The checkpoint item that references the chunks
+        """
+        table = self.dynamodb.Table(self.table_name)
+
+        for chunk_index in range(int(item['chunk_count'])):
+            table.delete_item(Key=self.get_chunk_key(run_id, int(item['generation']), chunk_index))
+
+
+    def delete(self, run_id: str) -> None:
+        """
+        Delete a run checkpoint and its chunks
+
+        Args:
+            run_id (str): The run id
+        """
+        table = self.dynamodb.Table(self.table_name)
+        response = table.get_item(Key=self.get_key(run_id), ConsistentRead=True)
+
+        if 'Item' not in response:
+            return
+
+        table.delete_item(Key=self.get_key(run_id))
+        self.delete_chunks(run_id, response['Item'])
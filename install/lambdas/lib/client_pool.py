@@ -0,0 +1,119 @@
+import threading
+import boto3
+from botocore.config import Config
+
+
+class ClientPool:
+    def __init__(self, max_pool_connections: int = 10) -> None:
+        """
+        Initialize the ClientPool class
+
+        Args:
+            max_pool_connections (int): The maximum number of HTTP connections each client keeps. Default: 10
+        """
+        self.lock = threading.Lock()
+        self.session = None
+        self.clients = {}
+        self.max_pool_connections = max_pool_connections
+        self.event_handlers = []
+
+
+    def configure(self, max_pool_connections: int) -> None:
+        """
+        Set the HTTP connection pool size of the clients. Cached clients are dropped if the size changed
+
+        Args:
+            max_pool_connections (int): The maximum number of HTTP connections each client keeps
+        """
+        max_pool_connections = max(1, int(max_pool_connections))
+
+        with self.lock:
+            if max_pool_connections != self.max_pool_connections:
+                self.max_pool_connections = max_pool_connections
+                self.clients = {}
+
+
+    def register_event_handler(self, event_name: str, handler) -> None:
+        """
+        Register a botocore event handler on all the cached clients and on the ones created later
+
+        Args:
+            event_name (str): The botocore event name, for example after-call
+            handler (callable): The event handler
+        """
+        with self.lock:
+            self.event_handlers.append((event_name, handler))
+
+            for client in self.clients.values():
+                client.meta.events.register(event_name, handler)
+
+
+    def unregister_event_handler(self, event_name: str, handler) -> None:
+        """
+        Unregister a botocore event handler from all the cached clients
+
+        Args:
+            event_name (str): The botocore event name
+            handler (callable): The event handler
+        """
+        with self.lock:
+            self.event_handlers = [(name, h) for name, h in self.event_handlers
+                                   if (name, h) != (event_name, handler)]
+
+            for client in self.clients.values():
+                client.meta.events.unregister(event_name, handler)
+
+
+    def get_client(self, service: str, region: str = None, config: dict = None):
+        """
+        Get a cached boto3 client, creating it on first use
+
+        Args:
+            service (str): The AWS service name
+            region (str): Optional. The region name. The default region is used if not set
+            config (dict): Optional. Extra botocore Config arguments
+
+        Returns (botocore.client.BaseClient): A boto3 client
+        """
+        config = config or {}
+        key = (service, region, tuple(sorted(config.items())))
+
+        client = self.clients.get(key)
+        if client is not None:
+            return client
+
+        # boto3 sessions are not thread safe, so clients are created one at a time
+        with self.lock:
+            client = self.clients.get(key)
+
+            if client is None:
+                if self.session is None:
+                    self.session = boto3.session.Session()
+
+                client_config = Config(**{'max_pool_connections': self.max_pool_connections, **config})
+                client = self.session.client(service, region_name=region, config=client_config)
+
+                for event_name, handler in self.event_handlers:
+                    client.meta.events.register(event_name, handler)
+
+                self.clients[key] = client
+
+        return client
+
+
+# A single pool for the whole process, so warm Lambda invocations reuse the clients and their connections
+client_pool = ClientPool()
+
+
+def get_client(service: str, region: str = None, config: dict = None):
+    """
+    Get a cached boto3 client from the process wide pool
+
+    Args:
+        service (str): The AWS service name
+        region (str): Optional. The region name. The default region is used if not set
+        config (dict): Optional. Extra botocore Config arguments
+
+    Returns (botocore.client.BaseClient): A boto3 client
+    """
+    return client_pool.get_client(service, region, config)
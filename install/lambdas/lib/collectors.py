@@ -0,0 +1,46 @@
+def iter_records(client, operation: str, result_key: str, page_size: int = None, **kwargs):
+    """
+    Stream the records of a describe/list operation one by one, reading all the pages
+
+    Only one page is held in memory at a time. Operations without a paginator are called once
+
+    Args:
+        client (botocore.client.BaseClient): A boto3 client
+        operation (str): The client operation name, for example describe_instances
+        result_key (str): The key of the records list in the operation response
+        page_size (int): Optional. The number of records to request per page
+        kwargs: Extra arguments for the operation, for example Filters
+
+    Returns (generator): A generator of the operation records
+    """
+    if client.can_paginate(operation):
+        paginator = client.get_paginator(operation)
+        pagination_config = {}
+
+        if page_size is not None:
+            pagination_config['PageSize'] = page_size
+
+        for page in paginator.paginate(PaginationConfig=pagination_config, **kwargs):
+            for record in page.get(result_key, []):
+                yield record
+    else:
+        response = getattr(client, operation)(**kwargs)
+        for record in response.get(result_key, []):
+            yield record
+
+
+def first_record(client, operation: str, result_key: str, **kwargs):
+    """
+    Get the first record of a describe/list operation, requesting a single record page when possible
+
+    Args:
+        client (botocore.client.BaseClient): A boto3 client
+        operation (str): The client operation name
+        result_key (str): The key of the records list in the operation response
+        kwargs: Extra arguments for the operation
+
+    Returns (dict): The first record. None if there are no records
+    """
+    page_size = 1 if client.can_paginate(operation) else None
+
+    return next(iter_records(client, operation, result_key, page_size, **kwargs), None)
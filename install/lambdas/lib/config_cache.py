@@ -0,0 +1,106 @@
+import copy
+import time
+import threading
+from .client_pool import get_client
+
+# The checks table item that holds the configuration version. Writers of the checks or the settings bump it
+CONFIG_VERSION_ID = 'config#version'
+
+# The number of seconds a cached value is kept at most, in case a writer didn't bump the configuration version
+DEFAULT_MAX_STALENESS = 300
+
+
+class ConfigCache:
+    def __init__(self, max_staleness: int = DEFAULT_MAX_STALENESS) -> None:
+        """
+        Initialize the ConfigCache class, which keeps the checks and settings between warm Lambda invocations
+
+        A cached value is reused while the configuration version in the checks table is unchanged, and fetched
+        again after max_staleness seconds even if the version didn't change. Every read still costs a single
+        strongly consistent GetItem of the version item, instead of a scan of the checks or settings table.
+
+        Args:
+            max_staleness (int): Optional. The number of seconds a value is kept at most. Default: 300
+        """
+        self.lock = threading.Lock()
+        self.max_staleness = max_staleness
+        self.entries = {}
+
+
+    def get_version(self, table_name: str) -> int:
+        """
+        Get the configuration version
+
+        Args:
+            table_name (str): The checks table name
+
+        Returns (int): The configuration version. 0 if it was never set
+        """
+        dynamodb_client = get_client('dynamodb')
+        response = dynamodb_client.get_item(
+            TableName=table_name,
+            Key={'id': {'S': CONFIG_VERSION_ID}},
+            ProjectionExpression='#version',
+            ExpressionAttributeNames={'#version': 'version'},
+            ConsistentRead=True
+        )
+
+        return int(response.get('Item', {}).get('version', {}).get('N', 0))
+
+
+    def bump_version(self, table_name: str) -> None:
+        """
+        Increase the configuration version, so all the cached values are fetched again
+
+        Args:
+            table_name (str): The checks table name
+        """
+        dynamodb_client = get_client('dynamodb')
+        dynamodb_client.update_item(
+            TableName=table_name,
+            Key={'id': {'S': CONFIG_VERSION_ID}},
+            UpdateExpression='ADD #version :one',
+            ExpressionAttributeNames={'#version': 'version'},
+            ExpressionAttributeValues={':one': {'N': '1'}}
+        )
+
+        self.invalidate()
+
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.entries = {}
+
+
+    def get(self, name: str, table_name: str, loader):
+        """
+        Get a cached value, loading it when the configuration version changed or the value is too old
+
+        Args:
+            name (str): The value name
+            table_name (str): The checks table name, which holds the configuration version
+            loader (callable): A function with no arguments that loads the value
+
+        Returns (any): A copy of the value, so callers can't change the cached one
+        """
+        # The version is read before loading, so a change made during the load is seen by the next call
+        version = self.get_version(table_name)
+
+        with self.lock:
+            entry = self.entries.get(name)
+
+        if entry is not None:
+            cached_version, loaded_at, value = entry
+            if cached_version == version and time.monotonic() - loaded_at < self.max_staleness:
+                return copy.deepcopy(value)
+
+        value = loader()
+
+        with self.lock:
+            self.entries[name] = (version, time.monotonic(), value)
+
+        return copy.deepcopy(value)
+
+
+# A single cache for the whole process, so warm Lambda invocations skip the table scans
+config_cache = ConfigCache()
@@ -0,0 +1,155 @@
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from .client_pool import get_client
+from .check_scheduler import CheckCancelled
+
+
+class Dispatcher(ABC):
+    def __init__(self, max_workers: int = 16) -> None:
+        """
+        Initialize a dispatcher that sends (check, region) shards to workers
+
+        Args:
+            max_workers (int): The maximum number of shards in flight at the same time. Default: 16
+        """
+        self.max_workers = max(1, int(max_workers))
+
+
+    @abstractmethod
+    def run_shard(self, shard: dict, cancelled: threading.Event) -> dict:
+        """
+        Run a single shard on a worker
+
+        Args:
+            shard (dict): A shard with the check name and the region (None for global checks)
+            cancelled (threading.Event): Set at the deadline, when the shard is no longer waited for
+
+        Returns (dict): The shard result, in the same format as a checks result
+        """
+
+
+    def dispatch(self, shards: list, deadline: float = None) -> tuple[list, list]:
+        """
+        Run all the shards concurrently until they complete or until a deadline
+
+        Shards still running at the deadline are not waited for and the ones that didn't start are cancelled.
+        The cancelled event shared by the shards is set, so the workers still running stop making requests
+        instead of spilling into the next invocation. Their results are dropped.
+
+        Args:
+            shards (list): A list of shards
+            deadline (float): Optional. A time.monotonic() value after which no shard is waited for
+
+        Returns (tuple): A list of the completed shard results in the shards order and a list of the shards 
+            that did not complete
+        """
+        if len(shards) == 0:
+            return [], []
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(shards)))
+        cancelled = threading.Event()
+        futures = [executor.submit(self.run_shard, shard, cancelled) for shard in shards]
+
+        timeout = max(deadline - time.monotonic(), 0) if deadline is not None else None
+        done, not_done = wait(futures, timeout=timeout)
+        if len(not_done) > 0:
+            cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        shard_results = []
+        pending_shards = []
+        for shard, future in zip(shards, futures):
+            if future not in done or future.cancelled():
+                pending_shards.append(shard)
+                continue
+
+            try:
+                shard_results.append(future.result())
+            except Exception as e:
+                print(f"Error running shard {shard['check']} ({shard['region']}): {str(e)}")
+                shard_results.append({
+                    'check': shard['check'],
+                    'region': shard['region'],
+                    'pass': None,
+                    'info': [],
+                    'error': str(e)
+                })
+
+        return shard_results, pending_shards
+
+
+class ThreadDispatcher(Dispatcher):
+    def __init__(self, worker_function, max_workers: int = 16) -> None:
+        """
+        Initialize a dispatcher that runs the shards in process, on worker threads
+
+        Args:
+            worker_function (callable): A function that gets a shard and the cancelled event and returns the 
+                shard result
+            max_workers (int): The maximum number of shards to run at the same time. Default: 16
+        """
+        super().__init__(max_workers)
+        self.worker_function = worker_function
+
+
+    def run_shard(self, shard: dict, cancelled: threading.Event) -> dict:
+        return self.worker_function(shard, cancelled)
+
+
+class LambdaDispatcher(Dispatcher):
+    def __init__(self, function_name: str, max_workers: int = 16) -> None:
+        """
+        Initialize a dispatcher that runs each shard in its own Lambda invocation
+
+        Args:
+            function_name (str): The name of the worker Lambda Function
+            max_workers (int): The maximum number of invocations in flight at the same time. Default: 16
+        """
+        super().__init__(max_workers)
+        self.function_name = function_name
+
+
+    def run_shard(self, shard: dict, cancelled: threading.Event) -> dict:
+        # A running worker invocation can't be cancelled, it stops at its own timeout
+        if cancelled.is_set():
+            raise CheckCancelled(f"Shard {shard['check']} ({shard['region']}) cancelled before it started")
+
+        # Each worker returns its shard result in the response payload
+        lambda_client = get_client('lambda', config={'read_timeout': 900})
+        response = lambda_client.invoke(
+            FunctionName=self.function_name,
+            InvocationType='RequestResponse',
+            Payload=json.dumps({'shard': shard})
+        )
+
+        payload = json.loads(response['Payload'].read())
+
+        if 'FunctionError' in response:
+            raise Exception(payload.get('errorMessage', response['FunctionError']))
+
+        return payload
+
+
+def create_dispatcher(dispatcher_type: str, worker_function, function_name: str = None,
+                      max_workers: int = 16) -> Dispatcher:
+    """
+    Create a dispatcher by its type
+
+    Args:
+        dispatcher_type (str): The dispatcher type, thread or lambda
+        worker_function (callable): A function that runs a shard in process. Used by the thread dispatcher
+        function_name (str): Optional. The worker Lambda Function name. Used by the lambda dispatcher
+        max_workers (int): The maximum number of shards in flight at the same time. Default: 16
+
+    Returns (Dispatcher): A dispatcher
+    """
+    match dispatcher_type:
+        case 'lambda':
+            return LambdaDispatcher(function_name, max_workers)
+        case 'thread':
+            return ThreadDispatcher(worker_function, max_workers)
+
+    raise ValueError(f'Unknown dispatcher type {dispatcher_type}. Expecting thread or lambda')
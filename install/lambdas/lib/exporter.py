@@ -0,0 +1,213 @@
+import os
+import io
+import json
+import gzip
+import datetime
+from abc import ABC, abstractmethod
+from .client_pool import get_client
+from .findings import iter_findings, get_check_error
+
+# Parquet export is optional. pyarrow is not part of the Lambda Function package by default
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ExportSink(ABC):
+    @abstractmethod
+    def write(self, key: str, body: bytes, content_type: str) -> None:
+        """
+        Write an exported file
+
+        Args:
+            key (str): The file key, relative to the sink location
+            body (bytes): The file content
+            content_type (str): The file content type
+        """
+
+
+class S3Sink(ExportSink):
+    def __init__(self, bucket: str, prefix: str = '') -> None:
+        """
+        Initialize a sink that writes the exported files to an S3 bucket
+
+        Args:
+            bucket (str): The bucket name
+            prefix (str): Optional. A key prefix for all the exported files
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+
+    def write(self, key: str, body: bytes, content_type: str) -> None:
+        s3_client = get_client('s3')
+        s3_client.put_object(
+            Bucket=self.bucket,
+            Key=f'{self.prefix}/{key}' if self.prefix else key,
+            Body=body,
+            ContentType=content_type
+        )
+
+
+class LocalSink(ExportSink):
+    def __init__(self, directory: str) -> None:
+        """
+        Initialize a sink that writes the exported files to a local directory
+
+        Args:
+            directory (str): The directory path
+        """
+        self.directory = directory
+
+
+    def write(self, key: str, body: bytes, content_type: str) -> None:
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as f:
+            f.write(body)
+
+
+def create_sink(sink_type: str, bucket: str = None, prefix: str = '', directory: str = None) -> ExportSink:
+    """
+    Create an export sink by its type
+
+    Args:
+        sink_type (str): The sink type, s3 or local
+        bucket (str): Optional. The bucket name. Used by the s3 sink
+        prefix (str): Optional. A key prefix. Used by the s3 sink
+        directory (str): Optional. The directory path. Used by the local sink
+
+    Returns (ExportSink): An export sink
+    """
+    match sink_type:
+        case 's3':
+            return S3Sink(bucket, prefix)
+        case 'local':
+            return LocalSink(directory)
+
+    raise ValueError(f'Unknown export sink type {sink_type}. Expecting s3 or local')
+
+
+class ResultsExporter:
+    def __init__(self, sink: ExportSink, formats: list = None) -> None:
+        """
+        Initialize the ResultsExporter class
+
+        Args:
+            sink (ExportSink): The sink the exported files are written to
+            formats (list): Optional. The export formats, jsonl and parquet. Default: jsonl
+        """
+        self.sink = sink
+        self.formats = formats or ['jsonl']
+
+        if 'parquet' in self.formats and pyarrow is None:
+            print('Skipping the parquet export. pyarrow is not installed')
+            self.formats = [f for f in self.formats if f != 'parquet']
+
+
+    def iter_rows(self, processed_check: dict, run_id: str, timestamp: str):
+        """
+        Iterate over the export rows of a processed check, one per finding
+
+        A check without findings, because it passed or errored, has a single row without finding columns.
+
+        Args:
+            processed_check (dict): A processed check from the checker
+            run_id (str): The run id
+            timestamp (str): The run timestamp
+
+        Yields (dict): An export row
+        """
+        row = {
+            'run_id': run_id,
+            'timestamp': timestamp,
+            'check': processed_check['check'],
+            'pass': processed_check['pass'],
+            'error': get_check_error(processed_check)
+        }
+
+        has_findings = False
+        for finding in iter_findings(processed_check):
+            has_findings = True
+            yield {
+                **row,
+                'fingerprint': finding['fingerprint'],
+                'region': finding['region'],
+                'resource': finding['resource'],
+                'info': json.dumps(finding['info'], default=str)
+            }
+
+        if not has_findings:
+            yield {**row, 'fingerprint': None, 'region': None, 'resource': None, 'info': None}
+
+
+    def export(self, processed_checks: list, run_id: str, timestamp: datetime.datetime = None) -> list:
+        """
+        Export the results of a run, one file per check and format, partitioned by date and check
+
+        Args:
+            processed_checks (list): A list of processed checks from the checker
+            run_id (str): The run id
+            timestamp (datetime): Optional. The run time. Default: now
+
+        Returns (list): The keys of the exported files
+        """
+        timestamp = timestamp or datetime.datetime.now()
+        date = timestamp.strftime('%Y-%m-%d')
+        keys = []
+
+        for processed_check in processed_checks:
+            partition = f"date={date}/check={processed_check['check']}"
+            rows = self.iter_rows(processed_check, run_id, timestamp.isoformat())
+
+            if 'parquet' in self.formats:
+                # Parquet needs all the rows of the file, so they are kept for it while streaming the JSONL file
+                rows = list(rows)
+
+            if 'jsonl' in self.formats:
+                key = f'{partition}/{run_id}.jsonl.gz'
+                self.sink.write(key, self.to_jsonl_gzip(rows), 'application/gzip')
+                keys.append(key)
+
+            if 'parquet' in self.formats:
+                key = f'{partition}/{run_id}.parquet'
+                self.sink.write(key, self.to_parquet(rows), 'application/vnd.apache.parquet')
+                keys.append(key)
+
+        return keys
+
+
+    def to_jsonl_gzip(self, rows) -> bytes:
+        """
+        Compress rows into a gzip JSON lines file, one row at a time
+
+        Args:
+            rows (iterable): The export rows
+
+        Returns (bytes): The file content
+        """
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as gzip_file:
+            for row in rows:
+                gzip_file.write(json.dumps(row, default=str).encode('utf-8'))
+                gzip_file.write(b'\n')
+
+        return buffer.getvalue()
+
+
+    def to_parquet(self, rows: list) -> bytes:
+        """
+        Write rows into a Parquet file
+
+        Args:
+            rows (list): The export rows
+
+        Returns (bytes): The file content
+        """
+        buffer = io.BytesIO()
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(rows), buffer, compression='snappy')
+
+        return buffer.getvalue()
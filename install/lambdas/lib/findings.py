@@ -0,0 +1,280 @@
+import json
+import hashlib
+import datetime
+import boto3
+from .batch_writer import BatchWriter
+
+# The info keys that identify the resource of a finding, in order of preference
+RESOURCE_KEYS = ['resource_arn', 'resource_id', 'bucket_name', 'volume_id', 'publicIp', 'user_name', 'service',
+                 'resource']
+
+# The resource id of account level findings
+ACCOUNT_RESOURCE = 'account'
+
+
+def get_finding_resource(info: dict) -> str:
+    """
+    Get the identifier of the resource a finding is about
+
+    Args:
+        info (dict): A finding information from the checker
+
+    Returns (str): The resource identifier. An empty string for account level findings
+    """
+    for key in RESOURCE_KEYS:
+        if key in info:
+            return str(info[key])
+
+    return ''
+
+
+def get_fingerprint(check_name: str, region: str, resource: str) -> str:
+    """
+    Get a stable fingerprint of a finding
+
+    Args:
+        check_name (str): The check name
+        region (str): The finding region
+        resource (str): The resource identifier
+
+    Returns (str): The finding fingerprint
+    """
+    return hashlib.sha1(f'{check_name}|{region}|{resource}'.encode('utf-8')).hexdigest()
+
+
+def create_finding(check_name: str, info) -> dict:
+    """
+    Create a finding from a single information item of a check
+
+    Account level checks, like a missing password policy, report a text instead of a resource. It's a single
+    global finding with a fixed resource id, so it keeps the same fingerprint between runs.
+
+    Args:
+        check_name (str): The check name
+        info (dict): The finding information from the checker, or a text for account level findings
+
+    Returns (dict): A finding with its fingerprint, check name, region, resource and information
+    """
+    if not isinstance(info, dict):
+        info = {'resource': ACCOUNT_RESOURCE, 'description': str(info)}
+
+    region = info.get('region', 'global')
+    resource = get_finding_resource(info)
+
+    return {
+        'fingerprint': get_fingerprint(check_name, region, resource),
+        'check_name': check_name,
+        'region': region,
+        'resource': resource,
+        'info': info
+    }
+
+
+def iter_findings(processed_check: dict):
+    """
+    Iterate over the findings of a processed check, one per resource
+
+    A failed check without resources, like a missing password policy, is a single account level finding.
+
+    Args:
+        processed_check (dict): A processed check from the checker
+
+    Yields (dict): A finding with its fingerprint, check name, region, resource and information
+    """
+    if processed_check['pass'] is not False:
+        return
+
+    check_name = processed_check['check']
+    info = processed_check.get('info')
+
+    if isinstance(info, dict):
+        # Findings grouped by service, like the missing tags check
+        for items in info.values():
+            if isinstance(items, list):
+                for item in items:
+                    yield create_finding(check_name, item)
+    elif info:
+        for item in info:
+            yield create_finding(check_name, item)
+    else:
+        yield create_finding(check_name, {})
+
+
+def get_check_error(processed_check: dict) -> str:
+    """
+    Get the error of a check that errored, or the region errors of a check that completed in some regions only
+
+    Args:
+        processed_check (dict): A processed check from the checker
+
+    Returns (str): The error message. None if the check had no errors
+    """
+    if processed_check['pass'] is None:
+        return processed_check.get('error') or 'Unknown error'
+
+    region_errors = processed_check.get('region_errors') or {}
+    if len(region_errors) > 0:
+        return ' '.join(f'{region}: {error}' for region, error in region_errors.items())
+
+    return None
+
+
+def filter_processed_checks(processed_checks: list, fingerprints: set) -> list:
+    """
+    Keep only the failed checks and the findings with the given fingerprints
+
+    Args:
+        processed_checks (list): A list of processed checks from the checker
+        fingerprints (set): The fingerprints of the findings to keep
+
+    Returns (list): A list of failed processed checks that still have findings after filtering
+    """
+    filtered_checks = []
+
+    for processed_check in processed_checks:
+        if processed_check['pass'] is not False:
+            continue
+
+        check_name = processed_check['check']
+        info = processed_check.get('info')
+
+        if isinstance(info, dict):
+            filtered_info = {}
+            for key, items in info.items():
+                if isinstance(items, list):
+                    filtered_info[key] = [item for item in items
+                                          if create_finding(check_name, item)['fingerprint'] in fingerprints]
+            has_findings = any(len(items) > 0 for items in filtered_info.values())
+        elif info:
+            filtered_info = [item for item in info if create_finding(check_name, item)['fingerprint'] in fingerprints]
+            has_findings = len(filtered_info) > 0
+        else:
+            filtered_info = info
+            has_findings = create_finding(check_name, {})['fingerprint'] in fingerprints
+
+        if has_findings:
+            filtered_checks.append({**processed_check, 'info': filtered_info})
+
+    return filtered_checks
+
+
+class FindingsDelta:
+    def __init__(self) -> None:
+        """
+        Initialize the changes in the open findings between the previous run and the current one
+        """
+        self.new = []
+        self.still_open = []
+        self.resolved = []
+
+
+    def has_changes(self) -> bool:
+        return len(self.new) > 0 or len(self.resolved) > 0
+
+
+    def get_new_fingerprints(self) -> set:
+        return {finding['fingerprint'] for finding in self.new}
+
+
+class FindingsStore:
+    def __init__(self, table_name: str, max_workers: int = 1) -> None:
+        """
+        Initialize the FindingsStore class
+
+        Args:
+            table_name (str): The DynamoDB findings table name
+            max_workers (int): Optional. The maximum number of batches written at the same time. Default: 1
+        """
+        self.table_name = table_name
+        self.batch_writer = BatchWriter(table_name, max_workers)
+
+
+    def load_open_findings(self) -> list:
+        """
+        Load the findings that were open after the previous run
+
+        Returns (list): A list of open finding items
+        """
+        dynamodb = boto3.resource('dynamodb')
+        table = dynamodb.Table(self.table_name)
+
+        scan_args = {}
+        items = []
+        while True:
+            response = table.scan(**scan_args)
+            items.extend(response['Items'])
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        return items
+
+
+    def compute_delta(self, processed_checks: list, open_findings: list = None) -> FindingsDelta:
+        """
+        Compare the findings of the current run with the open findings of the previous run
+
+        Only checks that completed are compared, so a check that errored does not resolve its findings. 
+        Neither do the regions a check failed in, listed in its region_errors.
+
+        Args:
+            processed_checks (list): A list of processed checks from the checker
+            open_findings (list): Optional. The open finding items. Loaded from the table if not set
+
+        Returns (FindingsDelta): The new, still open and resolved findings
+        """
+        if open_findings is None:
+            open_findings = self.load_open_findings()
+
+        open_by_check = {}
+        for item in open_findings:
+            open_by_check.setdefault(item['check_name'], {})[item['fingerprint']] = item
+
+        delta = FindingsDelta()
+        for processed_check in processed_checks:
+            if processed_check['pass'] is None:
+                continue
+
+            current = {finding['fingerprint']: finding for finding in iter_findings(processed_check)}
+            previous = open_by_check.get(processed_check['check'], {})
+            failed_regions = processed_check.get('region_errors') or {}
+
+            for fingerprint, finding in current.items():
+                if fingerprint in previous:
+                    delta.still_open.append(finding)
+                else:
+                    delta.new.append(finding)
+
+            for fingerprint, item in previous.items():
+                if fingerprint not in current and item.get('region') not in failed_regions:
+                    delta.resolved.append(item)
+
+        return delta
+
+
+    def apply(self, delta: FindingsDelta) -> None:
+        """
+        Save the new findings and remove the resolved ones, so the table holds the current open findings
+
+        Args:
+            delta (FindingsDelta): The findings delta of the current run
+        """
+        first_seen = datetime.datetime.now().isoformat()
+
+        new_items = [{
+            'check_name': finding['check_name'],
+            'fingerprint': finding['fingerprint'],
+            'region': finding['region'],
+            'resource': finding['resource'],
+            'info': json.dumps(finding['info'], default=str),
+            'first_seen': first_seen
+        } for finding in delta.new]
+        resolved_keys = [{'check_name': item['check_name'], 'fingerprint': item['fingerprint']}
+                         for item in delta.resolved]
+
+        reports = [self.batch_writer.write(new_items), self.batch_writer.delete(resolved_keys)]
+
+        for report in reports:
+            for failed_item in report.failed_items:
+                print(f"Failed to update finding: {failed_item['item']}. Error: {failed_item['error']}")
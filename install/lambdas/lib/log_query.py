@@ -0,0 +1,230 @@
+import json
+import base64
+import boto3
+from boto3.dynamodb.conditions import Key, Attr
+from .logger import Logger
+
+# The log table indexes. Both are sorted by the item timestamp
+CHECK_INDEX_NAME = 'check_id-timestamp'
+STATUS_INDEX_NAME = 'status-timestamp'
+
+# The key attributes of a LastEvaluatedKey, for the table and for each index
+TABLE_KEY = ['run_id', 'id']
+INDEX_KEYS = {
+    CHECK_INDEX_NAME: ['check_id', 'timestamp'] + TABLE_KEY,
+    STATUS_INDEX_NAME: ['status', 'timestamp'] + TABLE_KEY
+}
+
+# The log item attributes that can be requested
+LOG_FIELDS = ['run_id', 'id', 'check_id', 'check_name', 'timestamp', 'version', 'module', 'muted', 'status',
+              'chunk', 'chunk_count', 'finding_count', 'regions', 'findings', 'error', 'message']
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_evaluated_key: dict) -> str:
+    """
+    Encode a DynamoDB LastEvaluatedKey into an opaque cursor
+
+    Args:
+        last_evaluated_key (dict): The LastEvaluatedKey of a query
+
+    Returns (str): The cursor. None if there are no more pages
+    """
+    if last_evaluated_key is None:
+        return None
+
+    return base64.urlsafe_b64encode(json.dumps(last_evaluated_key).encode('utf-8')).decode('utf-8')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor into a DynamoDB ExclusiveStartKey
+
+    Args:
+        cursor (str): A cursor returned by a previous page
+
+    Returns (dict): The ExclusiveStartKey
+    """
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+class LogQuery:
+    def __init__(self, logs_table_name: str) -> None:
+        """
+        Initialize the LogQuery class
+
+        Args:
+            logs_table_name (str): The DynamoDB logs table name
+        """
+        self.logs_table_name = logs_table_name
+
+
+    def build_query(self, filters: dict) -> dict:
+        """
+        Build the Query arguments for a set of filters
+
+        The most selective key is used for the key condition: the run, then the check, then the status.
+        The other filters become a filter expression, including the time bounds of a run.
+
+        Args:
+            filters (dict): The filters. run_id, check_id, status, region, since and until, all optional
+
+        Returns (dict): The Query arguments
+        """
+        run_id = filters.get('run_id')
+        check_id = filters.get('check_id')
+        status = filters.get('status')
+        region = filters.get('region')
+        since = filters.get('since')
+        until = filters.get('until')
+
+        filter_conditions = []
+        query_args = {'ScanIndexForward': False}
+
+        if run_id is not None:
+            query_args['KeyConditionExpression'] = Key('run_id').eq(run_id)
+            if check_id is not None:
+                filter_conditions.append(Attr('check_id').eq(check_id))
+            # The table is sorted by item id, so the time bounds are filters
+            if since is not None:
+                filter_conditions.append(Attr('timestamp').gte(since))
+            if until is not None:
+                filter_conditions.append(Attr('timestamp').lte(until))
+        else:
+            if check_id is not None:
+                query_args['IndexName'] = CHECK_INDEX_NAME
+                key_condition = Key('check_id').eq(check_id)
+            else:
+                # Without a run or a check, the failures are listed by default
+                query_args['IndexName'] = STATUS_INDEX_NAME
+                key_condition = Key('status').eq(status or 'failed')
+
+            if since is not None and until is not None:
+                key_condition = key_condition & Key('timestamp').between(since, until)
+            elif since is not None:
+                key_condition = key_condition & Key('timestamp').gte(since)
+            elif until is not None:
+                key_condition = key_condition & Key('timestamp').lte(until)
+
+            query_args['KeyConditionExpression'] = key_condition
+
+        if status is not None:
+            if query_args.get('IndexName') != STATUS_INDEX_NAME:
+                filter_conditions.append(Attr('status').eq(status))
+        elif query_args.get('IndexName') == CHECK_INDEX_NAME:
+            # Leave out the daily summaries unless they are asked for
+            filter_conditions.append(Attr('status').ne('rollup'))
+
+        if region is not None:
+            filter_conditions.append(Attr('regions').contains(region))
+
+        if len(filter_conditions) > 0:
+            filter_expression = filter_conditions[0]
+            for condition in filter_conditions[1:]:
+                filter_expression = filter_expression & condition
+            query_args['FilterExpression'] = filter_expression
+
+        return query_args
+
+
+    def get_start_key(self, cursor: str, query_args: dict, filters: dict) -> dict:
+        """
+        Get the ExclusiveStartKey of a cursor, checking it was returned by the same query
+
+        Args:
+            cursor (str): A cursor returned by a previous page
+            query_args (dict): The Query arguments of the page
+            filters (dict): The page filters
+
+        Returns (dict): The ExclusiveStartKey. A ValueError is raised if the cursor is of another query
+        """
+        start_key = decode_cursor(cursor)
+        index_name = query_args.get('IndexName')
+        key_attributes = INDEX_KEYS.get(index_name, TABLE_KEY)
+
+        if not isinstance(start_key, dict) or sorted(start_key.keys()) != sorted(key_attributes) or \
+                not all(isinstance(value, str) for value in start_key.values()):
+            raise ValueError('Invalid cursor')
+
+        # The partition of the cursor must be the one of the query
+        partition_values = {
+            None: filters.get('run_id'),
+            CHECK_INDEX_NAME: filters.get('check_id'),
+            STATUS_INDEX_NAME: filters.get('status') or 'failed'
+        }
+        if start_key[key_attributes[0]] != partition_values[index_name]:
+            raise ValueError('Invalid cursor')
+
+        return start_key
+
+
+    def get_projection(self, fields: list) -> dict:
+        """
+        Get the projection arguments for the requested fields
+
+        Args:
+            fields (list): The requested field names
+
+        Returns (dict): The ProjectionExpression and ExpressionAttributeNames arguments
+        """
+        unknown_fields = [f for f in fields if f not in LOG_FIELDS]
+        if len(unknown_fields) > 0:
+            raise ValueError(f"Unknown fields: {', '.join(unknown_fields)}")
+
+        attributes = list(fields)
+        if 'findings' in fields:
+            # The findings of large items are stored compressed
+            attributes.append('findings_z')
+
+        return {
+            'ProjectionExpression': ', '.join(f'#f{i}' for i in range(len(attributes))),
+            'ExpressionAttributeNames': {f'#f{i}': attribute for i, attribute in enumerate(attributes)}
+        }
+
+
+    def query_page(self, filters: dict, fields: list = None, limit: int = DEFAULT_PAGE_SIZE,
+                   cursor: str = None) -> dict:
+        """
+        Read a single page of log items
+
+        Args:
+            filters (dict): The filters. run_id, check_id, status, region, since and until, all optional
+            fields (list): Optional. The fields to return. All the fields if not set
+            limit (int): Optional. The maximum number of items to read. Default: 50
+            cursor (str): Optional. The cursor of the page to read
+
+        Returns (dict): The page items and the cursor of the next page. The cursor is None on the last page
+        """
+        query_args = self.build_query(filters)
+        query_args['Limit'] = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        if fields:
+            query_args.update(self.get_projection(fields))
+        if cursor:
+            query_args['ExclusiveStartKey'] = self.get_start_key(cursor, query_args, filters)
+
+        dynamodb = boto3.resource('dynamodb')
+        table = dynamodb.Table(self.logs_table_name)
+        response = table.query(**query_args)
+
+        region = filters.get('region')
+        items = []
+        for item in response['Items']:
+            if 'findings' in item or 'findings_z' in item:
+                findings = Logger.get_item_findings(item)
+                if region is not None:
+                    findings = [finding for finding in findings if finding['region'] == region]
+                item.pop('findings_z', None)
+                item['findings'] = findings
+
+            items.append(item)
+
+        return {
+            'items': items,
+            'cursor': encode_cursor(response.get('LastEvaluatedKey'))
+        }
@@ -4,113 +4,319 @@ import boto3
 import time
 import logging
 import json
+import zlib
 from botocore.exceptions import ClientError
 from .check_type import CheckType 
+from .batch_writer import BatchWriter
+from .findings import FindingsDelta, iter_findings, get_check_error
+from .check_plan import CheckPlan
 
 
 class Logger:
-    def __init__(self, logs_table_name: str, checks_config: list) -> None:
+    def __init__(self, logs_table_name: str, checks_config: list, max_workers: int = 1, chunk_size: int = 100,
+                 compress_threshold: int = 32768, retention_days: int = None) -> None:
         """
         Initialize the Logger class
         
         Args:
             logs_table_name (str): The DynamoDB logs table name
-            checks_config (list): A list of checks configuration
+            checks_config (list): A list of CheckPlan objects
+            max_workers (int): Optional. The maximum number of log batches written at the same time. Default: 1
+            chunk_size (int): Optional. The maximum number of findings in a single log item. Default: 100
+            compress_threshold (int): Optional. The size in bytes above which the findings of a log item are 
+                compressed. Default: 32768
+            retention_days (int): Optional. The number of days the log items are kept before they expire. 
+                The items never expire if not set
         """
         self.checks_config_dict = {}
         self.logs_table_name = logs_table_name
+        self.batch_writer = BatchWriter(logs_table_name, max_workers)
+        self.chunk_size = max(1, int(chunk_size))
+        self.compress_threshold = compress_threshold
+        self.retention_days = retention_days
+        self.dynamodb = boto3.resource('dynamodb')
         
         for c in checks_config:
-            self.checks_config_dict[c['name']] = {
-                'name': c['name'],
-                'id': c['id'],
-                'enabled': c['enabled'],
-                'module': c['module'],
-                'muted': c['muted'],
-                'version': c['version']
-            }
+            self.checks_config_dict[c.name] = c
         
         
         
-    def log_checks(self, processed_checks: list) -> None:
+    def log_checks(self, processed_checks: list, run_id: str = None, delta: FindingsDelta = None) -> dict:
         """
         Log a list of processed checks
         
+        The findings of each failed check are logged as compact records, split into log items of up to 
+        chunk_size findings each. A check that errored or timed out is logged with the error status and its 
+        error message, in both modes. So is a check that failed in some of its regions, with the region errors.
+        
         Aegs:
             processed_checks (list): A list of items from the checker
+            run_id (str): Optional. The id of the run the checks belong to. A new id is used if not set
+            delta (FindingsDelta): Optional. When set, only the new and the resolved findings are logged
+        
+        Returns (dict): A report with the number of written items and the items that could not be written
         """
         
+        if run_id is None:
+            run_id = str(uuid.uuid4())
+        timestamp = datetime.datetime.now().isoformat()
+        
+        # Group the finding records by check and status
+        failed_records = {}
+        resolved_records = {}
+        
+        if delta is not None:
+            for finding in delta.new:
+                failed_records.setdefault(finding['check_name'], []).append(self.create_finding_record(finding))
+            
+            for finding in delta.resolved:
+                resolved_records.setdefault(finding['check_name'], []).append(self.create_finding_record(finding))
+        else:
+            for processed_check in processed_checks:
+                # Only log failed checks
+                if processed_check['pass'] is False:
+                    failed_records[processed_check['check']] = [self.create_finding_record(finding)
+                                                                for finding in iter_findings(processed_check)]
+        
         items = []
+        for status, check_records in [('failed', failed_records), ('resolved', resolved_records)]:
+            for check_name, records in check_records.items():
+                if check_name in self.checks_config_dict:
+                    check_config = self.checks_config_dict[check_name]
+                    items.extend(self.create_items(check_config, run_id, timestamp, status, records))
+        
+        # Checks that could not complete have no findings, only an error
         for processed_check in processed_checks:
-            # Only log failed checks
-            if processed_check['pass'] is False: 
-                if processed_check['check'] in self.checks_config_dict:
-                    check_config = self.checks_config_dict[processed_check['check']]
-                    
-                    # Create an empty message and only add content to it when there's some
-                    message = ''
-                    match processed_check['check']:
-                        case CheckType.MISSING_TAGS.value:
-                            for key, value in processed_check['info'].items():
-                                if value:  # Check if the array is not empty
-                                    for item in value:
-                                        message += f"Resource: {item['resource_type']}. Id: {item['resource_arn']}\n\n"
-                        case CheckType.PUBLIC_BUCKETS.value:
-                            for info in processed_check['info']:
-                                reasons = '\n'.join(info['reasons'])
-                                message += f"Bucket: {info['bucket_name']}. Reasons: {reasons}\n\n"
-                        case CheckType.UNUSED_EIP.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. IP: {info['publicIp']}\n\n"
-                        case CheckType.UNATTACHED_EBS_VOLUMES.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Volume: {info['volume_id']}. Size: {info['size']}\n\n"
-                        case CheckType.USING_DEFAULT_VPC.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Resource: {info['resource']}\n\n"
-                        case CheckType.EC2_IN_PUBLIC_SUBNET.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Instance: {info['resource']}\n\n"
-                        case CheckType.RESOURCES_IN_OTHER_REGIONS.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Service: {info['service']}. Cost: {info['cost']}\n\n"
-                        case CheckType.RDS_PUBLIC_ACCESS.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Resource: {info['resource']}\n\n"
-                        case CheckType.RDS_IN_PUBLIC_SUBNET.value:
-                            for info in processed_check['info']:
-                                message += f"Region: {info['region']}. Resource: {info['resource']}\n\n"
-                        case CheckType.HAS_IAM_USRES.value:
-                            for info in processed_check['info']:
-                                message += f"User: {info['user_name']}. created at: {info['created_at']}. last login: {info['last_login']}\n\n"
-                    
-                    item_uuid = uuid.uuid4()
-                    item_id = str(item_uuid)
-                    
-                    item = {
-                        "id": item_id,
-                        "check_id": check_config['id'],
-                        "check_name": check_config['name'],
-                        "timestamp": datetime.datetime.now().isoformat(),
-                        "version": check_config['version'],
-                        "module": check_config['module'],
-                        "muted": bool(check_config['muted']),
-                        "status": 'failed',
-                        "message": json.dumps(message)
-                    }
-                    
-                    items.append(item)
-        
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(self.logs_table_name)
-        
-        failed_items = []
-        
-        # Add each item one at a time
-        for item in items:
+            error = get_check_error(processed_check)
+            if error is not None and processed_check['check'] in self.checks_config_dict:
+                check_config = self.checks_config_dict[processed_check['check']]
+                items.extend(self.create_items(check_config, run_id, timestamp, 'error', [], error=error))
+        
+        # Write the items in batches, retrying the ones DynamoDB did not process
+        report = self.batch_writer.write(items)
+        
+        for failed_item in report.failed_items:
+            print(f"Failed to add item: {failed_item['item']['id']}. Error: {failed_item['error']}")
+        
+        return report.to_dict()
+    
+    
+    def create_finding_record(self, finding: dict) -> dict:
+        """
+        Create a compact log record of a single finding
+        
+        Args:
+            finding (dict): A finding, or an open finding item of a resolved finding
+        
+        Returns (dict): The finding record
+        """
+        info = finding.get('info')
+        if isinstance(info, str):
+            # Open finding items keep the information as a JSON string
+            info = json.loads(info)
+        
+        return {
+            'fingerprint': finding['fingerprint'],
+            'region': finding['region'],
+            'resource': finding['resource'],
+            'detail': self.get_finding_detail(finding['check_name'], info or {})
+        }
+    
+    
+    def get_finding_detail(self, check_name: str, info: dict) -> str:
+        """
+        Get the readable detail of a single finding
+        
+        Args:
+            check_name (str): The check name
+            info (dict): The finding information from the checker
+        
+        Returns (str): The finding detail. Empty if the finding has no details
+        """
+        if not info:
+            return ''
+        
+        match check_name:
+            case CheckType.MISSING_TAGS.value:
+                return f"Resource: {info['resource_type']}. Id: {info['resource_arn']}"
+            case CheckType.PUBLIC_BUCKETS.value:
+                reasons = '\n'.join(info['reasons'])
+                return f"Bucket: {info['bucket_name']}. Reasons: {reasons}"
+            case CheckType.UNUSED_EIP.value:
+                return f"Region: {info['region']}. IP: {info['publicIp']}"
+            case CheckType.UNATTACHED_EBS_VOLUMES.value:
+                return f"Region: {info['region']}. Volume: {info['volume_id']}. Size: {info['size']}"
+            case CheckType.USING_DEFAULT_VPC.value:
+                return f"Region: {info['region']}. Resource: {info['resource']}"
+            case CheckType.EC2_IN_PUBLIC_SUBNET.value:
+                return f"Region: {info['region']}. Instance: {info['resource']}"
+            case CheckType.RESOURCES_IN_OTHER_REGIONS.value:
+                return f"Region: {info['region']}. Service: {info['service']}. Cost: {info['cost']}"
+            case CheckType.RDS_PUBLIC_ACCESS.value:
+                return f"Region: {info['region']}. Resource: {info['resource']}"
+            case CheckType.RDS_IN_PUBLIC_SUBNET.value:
+                return f"Region: {info['region']}. Resource: {info['resource']}"
+            case CheckType.HAS_IAM_USRES.value:
+                return f"User: {info['user_name']}. created at: {info['created_at']}. last login: {info['last_login']}"
+        
+        return ''
+    
+    
+    def create_items(self, check_config: CheckPlan, run_id: str, timestamp: str, status: str, records: list, 
+                     error: str = None) -> list:
+        """
+        Create the log items of a check, each with a chunk of its finding records
+        
+        Args:
+            check_config (CheckPlan): The check plan
+            run_id (str): The run id
+            timestamp (str): The run timestamp
+            status (str): The items status, failed, resolved or error
+            records (list): The finding records
+            error (str): Optional. The error message of a check that could not complete
+        
+        Returns (list): A list of log items
+        """
+        chunks = [records[i:i + self.chunk_size] for i in range(0, len(records), self.chunk_size)] or [[]]
+        
+        # The DynamoDB TTL attribute. The daily rollups keep the trends after the items expire
+        expires_at = None
+        if self.retention_days is not None:
+            expires_at = int(time.time()) + int(self.retention_days) * 86400
+        
+        items = []
+        for chunk_index, chunk in enumerate(chunks):
+            item = {
+                "run_id": run_id,
+                "id": f"{check_config.name}#{status}#{chunk_index:05d}",
+                "check_id": check_config.id,
+                "check_name": check_config.name,
+                "timestamp": timestamp,
+                "version": check_config.version,
+                "module": check_config.module,
+                "muted": bool(check_config.muted),
+                "status": status,
+                "chunk": chunk_index,
+                "chunk_count": len(chunks),
+                "finding_count": len(records),
+                "regions": sorted({record['region'] for record in chunk})
+            }
+            
+            if expires_at is not None:
+                item['expires_at'] = expires_at
+            
+            if error is not None:
+                item['error'] = error
+            
+            # Large chunks are stored compressed to stay well below the DynamoDB item size limit
+            findings = json.dumps(chunk, separators=(',', ':'))
+            if len(findings) > self.compress_threshold:
+                item['findings_z'] = zlib.compress(findings.encode('utf-8'))
+            else:
+                item['findings'] = chunk
+            
+            items.append(item)
+        
+        return items
+    
+    
+    @staticmethod
+    def get_item_findings(item: dict) -> list:
+        """
+        Get the finding records of a log item, decompressing them if needed
+        
+        Args:
+            item (dict): A log item
+        
+        Returns (list): A list of finding records
+        """
+        if 'findings_z' in item:
+            findings_z = item['findings_z']
+            # Items read through boto3 wrap binary attributes
+            findings_z = getattr(findings_z, 'value', findings_z)
+            return json.loads(zlib.decompress(findings_z).decode('utf-8'))
+        
+        return item.get('findings', [])
+    
+    
+    def roll_up(self, processed_checks: list, delta: FindingsDelta = None, run_id: str = None) -> None:
+        """
+        Add the results of a run to the daily summary item of each check
+        
+        The summary is updated as the run is logged, so it never depends on log items that already expired. 
+        It holds the number of runs and failed runs, the number of open, new and resolved findings, and the 
+        first and last time the check failed that day.
+        
+        Args:
+            processed_checks (list): A list of items from the checker
+            delta (FindingsDelta): Optional. The findings delta of the run, used to count new and resolved findings
+            run_id (str): Optional. The run id. When set, a run is only added once to each summary, so a retried 
+                run doesn't count twice
+        """
+        now = datetime.datetime.now()
+        timestamp = now.isoformat()
+        date = now.strftime('%Y-%m-%d')
+        
+        new_counts = {}
+        resolved_counts = {}
+        if delta is not None:
+            for finding in delta.new:
+                new_counts[finding['check_name']] = new_counts.get(finding['check_name'], 0) + 1
+            for finding in delta.resolved:
+                resolved_counts[finding['check_name']] = resolved_counts.get(finding['check_name'], 0) + 1
+        
+        table = self.dynamodb.Table(self.logs_table_name)
+        
+        for processed_check in processed_checks:
+            check_name = processed_check['check']
+            
+            # Checks that errored have no results to summarize
+            if processed_check['pass'] is None or check_name not in self.checks_config_dict:
+                continue
+            
+            check_config = self.checks_config_dict[check_name]
+            failed = processed_check['pass'] is False
+            open_findings = sum(1 for finding in iter_findings(processed_check))
+            
+            update_expression = ('ADD runs :one, failed_runs :failed, open_findings :open, new_findings :new, '
+                                 'resolved_findings :resolved '
+                                 'SET check_id = :check_id, check_name = :check_name, #timestamp = :date, '
+                                 '#status = :status, #module = :module, muted = :muted, last_open_findings = :open')
+            update_args = {}
+            if failed:
+                update_expression += ', first_seen = if_not_exists(first_seen, :now), last_seen = :now'
+            
+            expression_values = {
+                ':one': 1,
+                ':failed': 1 if failed else 0,
+                ':open': open_findings,
+                ':new': new_counts.get(check_name, 0),
+                ':resolved': resolved_counts.get(check_name, 0),
+                ':check_id': check_config.id,
+                ':check_name': check_name,
+                ':date': date,
+                ':status': 'rollup',
+                ':module': check_config.module,
+                ':muted': bool(check_config.muted)
+            }
+            if failed:
+                expression_values[':now'] = timestamp
+            
+            if run_id is not None:
+                update_expression += ', last_run_id = :run_id'
+                expression_values[':run_id'] = run_id
+                update_args['ConditionExpression'] = 'attribute_not_exists(last_run_id) OR last_run_id <> :run_id'
+            
             try:
-                response = table.put_item(Item=item)
+                table.update_item(
+                    Key={'run_id': f'rollup#{date}', 'id': check_name},
+                    UpdateExpression=update_expression,
+                    ExpressionAttributeNames={'#timestamp': 'timestamp', '#status': 'status', '#module': 'module'},
+                    ExpressionAttributeValues=expression_values,
+                    **update_args
+                )
             except ClientError as e:
-                error_message = e.response['Error']['Message']
-                print(f"Failed to add item: {item}. Error: {error_message}")
-        
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    # The run was already added to this summary
+                    continue
+                print(f"Failed to update the daily summary of {check_name}. Error: {e.response['Error']['Message']}")
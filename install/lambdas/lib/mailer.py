@@ -2,6 +2,7 @@ import os
 import boto3
 import json
 from .check_type import CheckType 
+from .findings import FindingsDelta, filter_processed_checks
 from botocore.exceptions import ClientError
 
     
@@ -21,7 +22,7 @@ class Templates:
         Templates class constructor
         
         Args:
-            checks (list): A list of checks settings
+            checks (list): A list of CheckPlan objects
         """
         self.email_templates = {}
         cwd = os.getcwd()
@@ -42,19 +43,34 @@ class Templates:
         
         self.email_templates['main'] = template
         
+        # The resolved findings section of a deltas email
+        template = Template(txt=default_section_text, html=default_section_html,
+                            item_txt=default_section_item_text, item_html=default_section_item_html,
+                            title='Resolved findings',
+                            description='These findings were open in the previous run and are now resolved')
+        self.email_templates['resolved'] = template
+        
+        # The section of the checks that errored or timed out
+        template = Template(txt=default_section_text, html=default_section_html,
+                            item_txt=default_section_item_text, item_html=default_section_item_html,
+                            title='Checks that could not complete',
+                            description='These checks errored or timed out, so their findings in these regions '
+                                        'are unknown')
+        self.email_templates['errors'] = template
+        
         
         for check in checks:
             
             template = Template()
-            template.title = check['title']
-            template.description = check['description']
+            template.title = check.title
+            template.description = check.description or ''
             template.txt = default_section_text
             template.html = default_section_html
             template.item_txt = default_section_item_text
             template.item_html = default_section_item_html
             
-            if 'email_templates' in check:
-                email_template = json.loads(check['email_templates'])
+            if check.email_templates:
+                email_template = check.email_templates
                 
                 if 'baseFileName' in email_template:
                     file_txt_path = f'{templates_location}{email_template["baseFileName"]}.txt'
@@ -77,7 +93,7 @@ class Templates:
                     if os.path.exists(file_html_path):
                         template.item_html = open(file_html_path).read()
                 
-            self.email_templates[check['name']] = template
+            self.email_templates[check.name] = template
     
         
     def get_template(self, check_type: str) -> Template:
@@ -168,7 +184,7 @@ class Mailer:
         Initialize the Mailer class
         
         Args:
-            checks (list): A list of checks settings
+            checks (list): A list of CheckPlan objects
             sender (str): The sender email address
             recipient (str): The recipient email address
         """
@@ -220,26 +236,36 @@ class Mailer:
             raise(e)
     
     
-    def send_message_from_checks(self, processed_checks: list) -> Message:
+    def send_message_from_checks(self, processed_checks: list, delta: FindingsDelta = None) -> Message:
         """
         Compile an email message from AWS Best practices checks
         
         Args:
             processed_checks(list): A list of items from the checker
+            delta (FindingsDelta): Optional. When set, only the new and the resolved findings are sent. 
+                No email is sent if nothing changed and no check errored
             
         Returns (Message): A Message object containig the email text and html sections
         """
         
+        # Checks that errored, timed out or failed in some regions are listed in their own section
+        errored_checks = [c for c in processed_checks if c['pass'] is None or c.get('region_errors')]
+        
+        if delta is not None:
+            if not delta.has_changes() and len(errored_checks) == 0:
+                return None
+            
+            processed_checks = filter_processed_checks(processed_checks, delta.get_new_fingerprints())
+        
         findings_text = ''
         findings_html = ''
         required_tags = ''
         
         # Get the required tags from the checks configuration
         for c in self.checks:
-            match c['name']:
+            match c.name:
                 case CheckType.MISSING_TAGS.value:
-                    missing_tags_config = json.loads(c['config'])
-                    required_tags = ' | '.join(missing_tags_config['requiredTags'])
+                    required_tags = ' | '.join(c.required_tags)
         
         
         # Go through the processed checks
@@ -298,6 +324,16 @@ class Mailer:
                 if message is not None:
                     findings_text += message.message_text
                     findings_html += message.message_html
+        
+        if delta is not None and len(delta.resolved) > 0:
+            message = self.compile_resolved_message(delta.resolved)
+            findings_text += message.message_text
+            findings_html += message.message_html
+        
+        if len(errored_checks) > 0:
+            message = self.compile_errors_message(errored_checks)
+            findings_text += message.message_text
+            findings_html += message.message_html
          
         main_template = self.email_templates.get_template('main')
         main_text = ''
@@ -310,6 +346,65 @@ class Mailer:
         
         message = Message(main_html, main_text, subject='AWS Best Practices Checks') #TODO: Move subject to configuration
         self.send(message)
+        
+        return message
+    
+    
+    def compile_resolved_message(self, resolved_findings: list) -> Message:
+        """
+        Compile the resolved findings email section
+        
+        Args:
+            resolved_findings (list): A list of resolved finding items
+        
+        Returns (Message): A Message object containig the email text and html sections
+        """
+        template = self.email_templates.get_template('resolved')
+        check_titles = {c.name: c.title for c in self.checks}
+        
+        items = []
+        for finding in resolved_findings:
+            title = check_titles.get(finding['check_name'], finding['check_name'])
+            resource = f"{title}. {finding['resource']}" if finding['resource'] else title
+            items.append({'region': finding['region'], 'resource': resource})
+        
+        mapping = {
+            '***REGION***': 'region',
+            '***RESOURCE***': 'resource'
+        }
+        
+        return Message.from_template(template=template, item_text_map=mapping, item_html_map=mapping, items=items)
+    
+    
+    def compile_errors_message(self, errored_checks: list) -> Message:
+        """
+        Compile the email section of the checks that errored or timed out, one item per failed region
+        
+        Args:
+            errored_checks (list): A list of processed checks with no result or with region errors
+        
+        Returns (Message): A Message object containig the email text and html sections
+        """
+        template = self.email_templates.get_template('errors')
+        check_titles = {c.name: c.title for c in self.checks}
+        
+        items = []
+        for c in errored_checks:
+            title = check_titles.get(c['check'], c['check'])
+            
+            if c['pass'] is None:
+                error = c.get('error') or 'Unknown error'
+                items.append({'region': 'global', 'resource': f"{title}. {error}"})
+            else:
+                for region, error in c['region_errors'].items():
+                    items.append({'region': region, 'resource': f"{title}. {error}"})
+        
+        mapping = {
+            '***REGION***': 'region',
+            '***RESOURCE***': 'resource'
+        }
+        
+        return Message.from_template(template=template, item_text_map=mapping, item_html_map=mapping, items=items)
     
     
     def compile_simple_message(self, check_type: str, processed_checks = []) -> Message:
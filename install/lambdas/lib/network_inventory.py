@@ -0,0 +1,197 @@
+import threading
+from .collectors import iter_records
+
+
+class RouteTableIndex:
+    def __init__(self, route_tables: list, subnets: list) -> None:
+        """
+        Initialize a subnet classification index from all the route tables and subnets of a region
+
+        Args:
+            route_tables (list): All the route tables of the region
+            subnets (list): All the subnets of the region
+        """
+        self.subnet_route_tables = {}
+        self.main_route_tables = {}
+        self.subnet_vpcs = {subnet['SubnetId']: subnet['VpcId'] for subnet in subnets}
+        self.public_route_tables = set()
+
+        for rt in route_tables:
+            route_table_id = rt['RouteTableId']
+
+            for association in rt.get('Associations', []):
+                if association.get('Main', False):
+                    self.main_route_tables[rt['VpcId']] = route_table_id
+                elif association.get('SubnetId'):
+                    self.subnet_route_tables[association['SubnetId']] = route_table_id
+
+            if self.has_internet_gateway_route(rt):
+                self.public_route_tables.add(route_table_id)
+
+
+    def has_internet_gateway_route(self, route_table: dict) -> bool:
+        """
+        Check if a route table has a default route to an Internet Gateway
+
+        Args:
+            route_table (dict): A route table as returned by describe_route_tables
+
+        Returns (bool): True if the route table routes 0.0.0.0/0 to an Internet Gateway and False otherwise
+        """
+        for route in route_table.get('Routes', []):
+            if (route.get('GatewayId') or '').startswith('igw-') and route.get('DestinationCidrBlock') == '0.0.0.0/0':
+                return True
+
+        return False
+
+
+    def get_route_table_id(self, subnet_id: str) -> str:
+        """
+        Get the id of the route table a subnet uses, falling back to the main route table of its VPC
+
+        Args:
+            subnet_id (str): The subnet id
+
+        Returns (str): The route table id. None if the subnet has no route table
+        """
+        route_table_id = self.subnet_route_tables.get(subnet_id)
+
+        if route_table_id is None:
+            route_table_id = self.main_route_tables.get(self.subnet_vpcs.get(subnet_id))
+
+        return route_table_id
+
+
+    def is_subnet_public(self, subnet_id: str) -> bool:
+        """
+        Check if a subnet is public by verifying if its route table has a route to an Internet Gateway
+
+        Args:
+            subnet_id (str): The subnet id
+
+        Returns (bool): True if the subnet is public and False otherwise
+        """
+        return self.get_route_table_id(subnet_id) in self.public_route_tables
+
+
+class NetworkInventory:
+    def __init__(self, ec2_client) -> None:
+        """
+        Initialize a lazily loaded snapshot of the EC2 network resources of a single region
+
+        Each collection and each index built from them is made once, on first use, under the lock, and shared 
+        by all the checks of the run
+
+        Args:
+            ec2_client (botocore.client.BaseClient): An EC2 client for the region
+        """
+        self.ec2_client = ec2_client
+        # Reentrant, since an index reads the collections it's built from while holding it
+        self.lock = threading.RLock()
+        self.collections = {}
+
+
+    def get_or_build(self, name: str, build_function):
+        """
+        Get a collection or an index, building it once on first use
+
+        Args:
+            name (str): A unique name for the collection or index
+            build_function (callable): A function with no arguments that builds it
+
+        Returns (object): The collection or index
+        """
+        if name not in self.collections:
+            with self.lock:
+                if name not in self.collections:
+                    self.collections[name] = build_function()
+
+        return self.collections[name]
+
+
+    def get_collection(self, operation: str, result_key: str, page_size: int = 1000) -> list:
+        """
+        Get all the items of an EC2 describe operation, fetching all the pages on first use
+
+        Args:
+            operation (str): The name of the describe operation, for example describe_vpcs
+            result_key (str): The key of the items list in the operation response
+            page_size (int): The number of items to request per page. Default: 1000
+
+        Returns (list): All the items of the collection
+        """
+        return self.get_or_build(operation, lambda: list(iter_records(self.ec2_client, operation, result_key,
+                                                                      page_size=page_size)))
+
+
+    def group_by(self, index_name: str, items: list, key: str) -> dict:
+        """
+        Index a list of items by one of the item attributes, building the index on first use
+
+        Args:
+            index_name (str): A unique name for the index
+            items (list): The items to index
+            key (str): The item attribute to index by
+
+        Returns (dict): A dictionary of the attribute value to a list of items
+        """
+        def build_index() -> dict:
+            index = {}
+            for item in items:
+                index.setdefault(item.get(key), []).append(item)
+
+            return index
+
+        return self.get_or_build(index_name, build_index)
+
+
+    @property
+    def vpcs(self) -> list:
+        return self.get_collection('describe_vpcs', 'Vpcs')
+
+
+    @property
+    def subnets(self) -> list:
+        return self.get_collection('describe_subnets', 'Subnets')
+
+
+    @property
+    def route_tables(self) -> list:
+        # describe_route_tables allows at most 100 results per page
+        return self.get_collection('describe_route_tables', 'RouteTables', page_size=100)
+
+
+    @property
+    def instances(self) -> list:
+        return self.get_or_build('instances', lambda: [
+            instance for reservation in self.get_collection('describe_instances', 'Reservations')
+            for instance in reservation['Instances']
+        ])
+
+
+    @property
+    def route_table_index(self) -> RouteTableIndex:
+        return self.get_or_build('route_table_index', lambda: RouteTableIndex(self.route_tables, self.subnets))
+
+
+    @property
+    def default_vpc(self) -> dict:
+        """
+        Get the default VPC of the region
+
+        Returns (dict): The default VPC. None if the region has no default VPC
+        """
+        for vpc in self.vpcs:
+            if vpc.get('IsDefault', False):
+                return vpc
+
+        return None
+
+
+    def subnets_in_vpc(self, vpc_id: str) -> list:
+        return self.group_by('subnets_by_vpc', self.subnets, 'VpcId').get(vpc_id, [])
+
+
+    def instances_in_vpc(self, vpc_id: str) -> list:
+        return self.group_by('instances_by_vpc', self.instances, 'VpcId').get(vpc_id, [])
+
@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PostProcessor:
+    def __init__(self, max_workers: int = 4) -> None:
+        """
+        Initialize a post processing stage that hands the run results to independent sinks
+
+        Args:
+            max_workers (int): The maximum number of sinks running at the same time. Default: 4
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.sinks = []
+
+
+    def add_sink(self, name: str, sink_function) -> None:
+        """
+        Add a sink
+
+        Args:
+            name (str): The sink name, used in the status report
+            sink_function (callable): A function with no arguments that runs the sink
+        """
+        self.sinks.append((name, sink_function))
+
+
+    def run_sink(self, name: str, sink_function) -> dict:
+        started_at = time.monotonic()
+
+        try:
+            sink_function()
+            status = {'status': 'success'}
+        except Exception as e:
+            print(f"Error running the {name} sink: {str(e)}")
+            status = {'status': 'error', 'error': str(e)}
+
+        status['duration'] = round(time.monotonic() - started_at, 3)
+
+        return status
+
+
+    def run(self, skip_sinks: set = None) -> dict:
+        """
+        Run all the sinks concurrently. A failing sink does not stop the others
+
+        Args:
+            skip_sinks (set): Optional. The names of sinks that already completed and are not run again
+
+        Returns (dict): A dictionary of sink name to its status, error and duration in seconds
+        """
+        skip_sinks = skip_sinks or set()
+        report = {name: {'status': 'skipped'} for name, sink_function in self.sinks if name in skip_sinks}
+        sinks = [(name, sink_function) for name, sink_function in self.sinks if name not in skip_sinks]
+
+        if len(sinks) == 0:
+            return report
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sinks))) as executor:
+            futures = [(name, executor.submit(self.run_sink, name, sink_function)) for name, sink_function in sinks]
+
+        report.update({name: future.result() for name, future in futures})
+
+        return report
+
+
+    def succeeded(self, report: dict) -> bool:
+        return all(status['status'] in ['success', 'skipped'] for status in report.values())
@@ -0,0 +1,74 @@
+import time
+import threading
+from .client_pool import get_client
+
+ENABLED_OPT_IN_STATUSES = ['opt-in-not-required', 'opted-in']
+
+
+class RegionCatalog:
+    def __init__(self, ttl: int = 3600) -> None:
+        """
+        Initialize the RegionCatalog class
+
+        Args:
+            ttl (int): The number of seconds the regions list is kept before it's fetched again. Default: 3600
+        """
+        self.lock = threading.Lock()
+        self.ttl = ttl
+        self.regions = None
+        self.fetched_at = None
+
+
+    def configure(self, ttl: int) -> None:
+        """
+        Set the time to live of the regions list
+
+        Args:
+            ttl (int): The number of seconds the regions list is kept before it's fetched again
+        """
+        self.ttl = ttl
+
+
+    def get_regions(self) -> dict:
+        """
+        Get all the regions and their opt-in status, fetching them when the cached list expired
+
+        Returns (dict): A dictionary of region name to its opt-in status
+        """
+        with self.lock:
+            if self.regions is None or time.monotonic() - self.fetched_at >= self.ttl:
+                ec2_client = get_client('ec2')
+                response = ec2_client.describe_regions(AllRegions=True)
+
+                self.regions = {region['RegionName']: region.get('OptInStatus', 'opt-in-not-required')
+                                for region in response['Regions']}
+                self.fetched_at = time.monotonic()
+
+            return self.regions
+
+
+    def get_enabled_regions(self) -> list:
+        """
+        Get the regions enabled for the account
+
+        Returns (list): A list of enabled region names
+        """
+        return [name for name, status in self.get_regions().items() if status in ENABLED_OPT_IN_STATUSES]
+
+
+    def is_enabled(self, region: str) -> bool:
+        """
+        Check if a region is enabled for the account. Regions unknown to the catalog are considered enabled
+
+        Args:
+            region (str): The region name
+
+        Returns (bool): True if the region is enabled and False otherwise
+        """
+        status = self.get_regions().get(region)
+
+        return status is None or status in ENABLED_OPT_IN_STATUSES
+
+
+# A single catalog for the whole process, so warm Lambda invocations reuse the regions list
+region_catalog = RegionCatalog()
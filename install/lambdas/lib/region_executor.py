@@ -0,0 +1,133 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .check_scheduler import CheckCancelled
+
+
+class RegionErrors(Exception):
+    def __init__(self, errors: dict) -> None:
+        """
+        Initialize a RegionErrors exception
+
+        Args:
+            errors (dict): A dictionary of region name to the exception raised for that region
+        """
+        self.errors = errors
+        regions = ', '.join(errors.keys())
+        super().__init__(f'Check failed in {len(errors)} region(s): {regions}')
+
+
+class RegionResults:
+    def __init__(self, regions: list) -> None:
+        """
+        Initialize the results of a per region run
+
+        Args:
+            regions (list): The regions the run was made for, in the order the results should be merged
+        """
+        self.regions = regions
+        self.results = {}
+        self.errors = {}
+        self.durations = {}
+
+
+    def merged_list(self) -> list:
+        """
+        Merge list results from all the regions, in the region order
+
+        Returns (list): A single list with the items of all the regions
+        """
+        merged = []
+        for region in self.regions:
+            merged.extend(self.results.get(region) or [])
+
+        return merged
+
+
+    def merged_dict(self) -> dict:
+        """
+        Merge dictionary results of lists from all the regions, in the region order
+
+        Returns (dict): A single dictionary with the items of all the regions for each key
+        """
+        merged = {}
+        for region in self.regions:
+            for key, value in (self.results.get(region) or {}).items():
+                merged.setdefault(key, []).extend(value)
+
+        return merged
+
+
+    def get_error_messages(self) -> dict:
+        """
+        Get the errors of the regions that failed
+
+        Returns (dict): A dictionary of region name to error message
+        """
+        return {region: str(error) for region, error in self.errors.items()}
+
+
+    def raise_if_all_failed(self) -> None:
+        """
+        Raise a RegionErrors exception if every region failed, so there's no result to report
+
+        The errors of a partial failure don't raise. The results of the regions that succeeded are kept
+        """
+        for region, error in self.errors.items():
+            print(f"Error checking region {region}: {str(error)}")
+
+        if len(self.errors) > 0 and len(self.errors) == len(self.regions):
+            raise RegionErrors(self.errors)
+
+
+class RegionExecutor:
+    def __init__(self, max_workers: int = 8) -> None:
+        """
+        Initialize the RegionExecutor class
+
+        Args:
+            max_workers (int): The maximum number of regions to check at the same time. Default: 8
+        """
+        self.max_workers = max(1, int(max_workers))
+
+
+    def run(self, regions: list, region_function, cancelled: threading.Event = None) -> RegionResults:
+        """
+        Run a function for each one of the regions in parallel
+
+        Args:
+            regions (list): A list of regions
+            region_function (callable): A function that gets a region name and returns the region results
+            cancelled (threading.Event): Optional. When set, the regions that did not start yet are skipped
+                with a CheckCancelled error
+
+        Returns (RegionResults): The results and the errors of each region
+        """
+        # Remove duplicates while keeping the configured order
+        regions = list(dict.fromkeys(regions))
+        region_results = RegionResults(regions)
+
+        if len(regions) == 0:
+            return region_results
+
+        def timed_region_function(region: str):
+            if cancelled is not None and cancelled.is_set():
+                raise CheckCancelled(f'Check cancelled before region {region} started')
+
+            started_at = time.monotonic()
+            try:
+                return region_function(region)
+            finally:
+                region_results.durations[region] = round(time.monotonic() - started_at, 3)
+
+        workers = min(self.max_workers, len(regions))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {region: executor.submit(timed_region_function, region) for region in regions}
+
+            for region, future in futures.items():
+                try:
+                    region_results.results[region] = future.result()
+                except Exception as e:
+                    region_results.errors[region] = e
+
+        return region_results
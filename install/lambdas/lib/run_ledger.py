@@ -0,0 +1,273 @@
+import datetime
+from decimal import Decimal
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from .client_pool import get_client
+from .log_query import decode_cursor
+
+METRICS_COUNTERS = ['duration', 'api_calls', 'api_attempts', 'throttles']
+METRICS_MAPS = ['check_durations', 'region_durations', 'finding_counts', 'api_calls_by_operation']
+
+# Keeps each map update well within the update expression size limit
+METRICS_MAP_CHUNK_SIZE = 25
+
+RUNS_INDEX_NAME = 'record_type-started_at'
+RUNS_INDEX_KEY = ['id', 'record_type', 'started_at']
+DEFAULT_RUNS_PAGE_SIZE = 20
+MAX_RUNS_PAGE_SIZE = 100
+
+
+class RunLedger:
+    def __init__(self, table_name: str) -> None:
+        """
+        Initialize the RunLedger class, which records the progress of each run so a retried run can skip
+        the work that already completed
+
+        Args:
+            table_name (str): The DynamoDB runs table name
+        """
+        self.table_name = table_name
+        self.serializer = TypeSerializer()
+        self.deserializer = TypeDeserializer()
+
+
+    def get_key(self, run_id: str) -> dict:
+        return {'id': {'S': f'run#{run_id}'}}
+
+
+    def update(self, run_id: str, update_expression: str, names: dict, values: dict,
+               return_values: str = 'NONE') -> dict:
+        """
+        Update the ledger item of a run
+
+        The pooled client is used since sinks record their completion from their own threads
+
+        Args:
+            run_id (str): The run id
+            update_expression (str): The update expression
+            names (dict): The expression attribute names
+            values (dict): The expression attribute values
+            return_values (str): Optional. The values to return. Default: NONE
+
+        Returns (dict): The returned attributes
+        """
+        dynamodb_client = get_client('dynamodb')
+        response = dynamodb_client.update_item(
+            TableName=self.table_name,
+            Key=self.get_key(run_id),
+            UpdateExpression=update_expression,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={key: self.serializer.serialize(value) for key, value in values.items()},
+            ReturnValues=return_values
+        )
+
+        return self.deserialize_item(response.get('Attributes', {}))
+
+
+    def deserialize_item(self, item: dict) -> dict:
+        return {key: self.deserializer.deserialize(value) for key, value in item.items()}
+
+
+    def get_run(self, run_id: str) -> dict:
+        """
+        Get the summary of a run
+
+        Args:
+            run_id (str): The run id
+
+        Returns (dict): The run summary. None if the run doesn't exist
+        """
+        dynamodb_client = get_client('dynamodb')
+        response = dynamodb_client.get_item(TableName=self.table_name, Key=self.get_key(run_id))
+
+        if 'Item' not in response:
+            return None
+
+        return self.deserialize_item(response['Item'])
+
+
+    def get_start_key(self, cursor: str) -> dict:
+        """
+        Get the ExclusiveStartKey of a cursor, checking it was returned by a page of the run summaries
+
+        Args:
+            cursor (str): A cursor returned by a previous page
+
+        Returns (dict): The ExclusiveStartKey. A ValueError is raised if the cursor is not a runs page key
+        """
+        start_key = decode_cursor(cursor)
+
+        if not isinstance(start_key, dict) or sorted(start_key.keys()) != sorted(RUNS_INDEX_KEY) or \
+                not all(isinstance(value, dict) and list(value.keys()) == ['S'] and isinstance(value['S'], str)
+                        for value in start_key.values()):
+            raise ValueError('Invalid cursor')
+
+        if start_key['record_type']['S'] != 'run' or not start_key['id']['S'].startswith('run#'):
+            raise ValueError('Invalid cursor')
+
+        return start_key
+
+
+    def get_recent_runs(self, limit: int = DEFAULT_RUNS_PAGE_SIZE, start_key: dict = None) -> tuple[list, dict]:
+        """
+        Get a page of the run summaries, newest first
+
+        Args:
+            limit (int): Optional. The page size. Default: 20
+            start_key (dict): Optional. The LastEvaluatedKey of the previous page
+
+        Returns (tuple): A list of run summaries and the LastEvaluatedKey for the next page, None on the last page
+        """
+        if limit < 1 or limit > MAX_RUNS_PAGE_SIZE:
+            raise ValueError(f'The limit must be between 1 and {MAX_RUNS_PAGE_SIZE}')
+
+        query_parameters = {
+            'TableName': self.table_name,
+            'IndexName': RUNS_INDEX_NAME,
+            'KeyConditionExpression': 'record_type = :record_type',
+            'ExpressionAttributeValues': {':record_type': {'S': 'run'}},
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        if start_key is not None:
+            query_parameters['ExclusiveStartKey'] = start_key
+
+        dynamodb_client = get_client('dynamodb')
+        response = dynamodb_client.query(**query_parameters)
+
+        return [self.deserialize_item(item) for item in response.get('Items', [])], response.get('LastEvaluatedKey')
+
+
+    def start(self, run_id: str) -> dict:
+        """
+        Record the start of a run. A retried run keeps its original start time and completed sinks
+
+        Args:
+            run_id (str): The run id
+
+        Returns (dict): The run ledger item
+        """
+        now = datetime.datetime.now().isoformat()
+
+        return self.update(
+            run_id,
+            'SET run_id = :run_id, record_type = :record_type, '
+            'started_at = if_not_exists(started_at, :now), updated_at = :now, '
+            '#status = if_not_exists(#status, :running), sinks = if_not_exists(sinks, :sinks), '
+            'attempts = if_not_exists(attempts, :zero) + :one, ' +
+            ', '.join(f'{name} = if_not_exists({name}, :empty)' for name in METRICS_MAPS),
+            {'#status': 'status'},
+            {
+                ':run_id': run_id,
+                ':record_type': 'run',
+                ':now': now,
+                ':running': 'running',
+                ':sinks': {},
+                ':empty': {},
+                ':zero': 0,
+                ':one': 1
+            },
+            'ALL_NEW'
+        )
+
+
+    def is_completed(self, ledger_item: dict) -> bool:
+        return ledger_item.get('status') == 'completed'
+
+
+    def get_completed_sinks(self, ledger_item: dict) -> set:
+        """
+        Get the sinks that already completed for a run
+
+        Args:
+            ledger_item (dict): The run ledger item
+
+        Returns (set): The names of the completed sinks
+        """
+        return {name for name, status in ledger_item.get('sinks', {}).items() if status == 'success'}
+
+
+    def complete_sink(self, run_id: str, sink_name: str) -> None:
+        """
+        Record that a sink completed for a run
+
+        Args:
+            run_id (str): The run id
+            sink_name (str): The sink name
+        """
+        self.update(
+            run_id,
+            'SET sinks.#sink = :success, updated_at = :now',
+            {'#sink': sink_name},
+            {':success': 'success', ':now': datetime.datetime.now().isoformat()}
+        )
+
+
+    def to_dynamodb_numbers(self, value):
+        # The serializer doesn't accept floats
+        if isinstance(value, float):
+            return Decimal(str(value))
+        if isinstance(value, dict):
+            return {key: self.to_dynamodb_numbers(v) for key, v in value.items()}
+        if isinstance(value, list):
+            return [self.to_dynamodb_numbers(v) for v in value]
+
+        return value
+
+
+    def record_metrics(self, run_id: str, metrics: dict) -> None:
+        """
+        Add the metrics of an invocation to the run summary. The counters of the continuations of a run add up
+
+        Args:
+            run_id (str): The run id
+            metrics (dict): The metrics summary of the invocation, see RunMetrics.get_summary
+        """
+        metrics = self.to_dynamodb_numbers(metrics)
+
+        self.update(
+            run_id,
+            'SET updated_at = :now ADD invocations :one, ' +
+            ', '.join(f'#{name} :{name}' for name in METRICS_COUNTERS),
+            {f'#{name}': name for name in METRICS_COUNTERS},
+            {':now': datetime.datetime.now().isoformat(), ':one': 1,
+             **{f':{name}': metrics.get(name, 0) for name in METRICS_COUNTERS}}
+        )
+
+        for map_name in METRICS_MAPS:
+            entries = list(metrics.get(map_name, {}).items())
+
+            for start in range(0, len(entries), METRICS_MAP_CHUNK_SIZE):
+                chunk = entries[start:start + METRICS_MAP_CHUNK_SIZE]
+                names = {f'#k{index}': key for index, (key, value) in enumerate(chunk)}
+                values = {f':v{index}': value for index, (key, value) in enumerate(chunk)}
+
+                # The API calls add up over the invocations, while each check and region runs in a single one
+                if map_name == 'api_calls_by_operation':
+                    assignments = [f'{map_name}.#k{index} = if_not_exists({map_name}.#k{index}, :zero) + :v{index}'
+                                   for index in range(len(chunk))]
+                    values[':zero'] = 0
+                else:
+                    assignments = [f'{map_name}.#k{index} = :v{index}' for index in range(len(chunk))]
+
+                self.update(run_id, 'SET ' + ', '.join(assignments), names, values)
+
+
+    def complete(self, run_id: str, started_at: str = None) -> None:
+        """
+        Record that a run completed, so retries of it are no-ops
+
+        Args:
+            run_id (str): The run id
+            started_at (str): Optional. The ISO start time of the run, used to record the elapsed time
+        """
+        now = datetime.datetime.now()
+        names = {'#status': 'status'}
+        values = {':completed': 'completed', ':now': now.isoformat()}
+        update_expression = 'SET #status = :completed, completed_at = :now, updated_at = :now'
+
+        if started_at:
+            elapsed = now - datetime.datetime.fromisoformat(started_at)
+            update_expression += ', elapsed = :elapsed'
+            values[':elapsed'] = Decimal(str(round(elapsed.total_seconds(), 3)))
+
+        self.update(run_id, update_expression, names, values)
@@ -0,0 +1,103 @@
+import time
+import threading
+from .client_pool import client_pool
+from .findings import iter_findings
+
+THROTTLING_ERROR_CODES = ['Throttling', 'ThrottlingException', 'ThrottledException', 'RequestLimitExceeded',
+                          'TooManyRequestsException', 'ProvisionedThroughputExceededException', 'SlowDown',
+                          'RequestThrottled', 'RequestThrottledException']
+
+
+class RunMetrics:
+    def __init__(self) -> None:
+        """
+        Initialize the RunMetrics class, which counts the AWS API calls made through the client pool
+        """
+        self.lock = threading.Lock()
+        self.api_calls = {}
+        self.api_attempts = 0
+        self.throttles = 0
+        self.started_at = None
+        self.stopped_at = None
+
+
+    def on_before_send(self, **kwargs) -> None:
+        # Called for each HTTP attempt, including the retries
+        with self.lock:
+            self.api_attempts += 1
+
+
+    def on_needs_retry(self, response=None, **kwargs) -> None:
+        # Only observes the response. Returning None leaves the retry decision to botocore
+        if response is None:
+            return
+
+        error_code = response[1].get('Error', {}).get('Code')
+        if error_code in THROTTLING_ERROR_CODES:
+            with self.lock:
+                self.throttles += 1
+
+
+    def on_after_call(self, model=None, **kwargs) -> None:
+        # Called once per API call, after the retries
+        operation = f'{model.service_model.service_name}.{model.name}'
+
+        with self.lock:
+            self.api_calls[operation] = self.api_calls.get(operation, 0) + 1
+
+
+    def get_handlers(self) -> list:
+        return [
+            ('before-send', self.on_before_send),
+            ('needs-retry', self.on_needs_retry),
+            ('after-call', self.on_after_call)
+        ]
+
+
+    def start(self) -> None:
+        """
+        Start counting the API calls of the pooled clients
+        """
+        self.started_at = time.monotonic()
+
+        for event_name, handler in self.get_handlers():
+            client_pool.register_event_handler(event_name, handler)
+
+
+    def stop(self) -> None:
+        """
+        Stop counting the API calls
+        """
+        self.stopped_at = time.monotonic()
+
+        for event_name, handler in self.get_handlers():
+            client_pool.unregister_event_handler(event_name, handler)
+
+
+    def get_summary(self, results: list, basic_checker=None) -> dict:
+        """
+        Get a summary of the metrics of the checks
+
+        Args:
+            results (list): A list of check results
+            basic_checker (Basic): Optional. The basic checks module, used for the checks and regions timing
+
+        Returns (dict): The metrics summary
+        """
+        stopped_at = self.stopped_at or time.monotonic()
+
+        with self.lock:
+            summary = {
+                'duration': round(stopped_at - self.started_at, 3) if self.started_at is not None else 0,
+                'api_calls': sum(self.api_calls.values()),
+                'api_attempts': self.api_attempts,
+                'throttles': self.throttles,
+                'api_calls_by_operation': dict(self.api_calls)
+            }
+
+        summary['finding_counts'] = {result['check']: sum(1 for finding in iter_findings(result))
+                                     for result in results}
+        summary['check_durations'] = dict(basic_checker.check_durations) if basic_checker is not None else {}
+        summary['region_durations'] = dict(basic_checker.region_durations) if basic_checker is not None else {}
+
+        return summary
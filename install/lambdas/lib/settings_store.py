@@ -0,0 +1,120 @@
+import boto3
+from botocore.exceptions import ClientError
+
+# The key of the settings item
+SETTINGS_ID = 'settings'
+
+
+class SettingsStore:
+    def __init__(self, table_name: str) -> None:
+        """
+        Initialize the SettingsStore class, which reads and writes the single settings item by its key
+
+        Args:
+            table_name (str): The DynamoDB settings table name
+        """
+        self.dynamodb = boto3.resource('dynamodb')
+        self.table = self.dynamodb.Table(table_name)
+
+
+    def get(self, consistent_read: bool = False) -> dict:
+        """
+        Get the settings item. Settings of an older install, stored under a random id, are moved to the settings key
+
+        Args:
+            consistent_read (bool): Optional. Whether to use a strongly consistent read. Default: False
+
+        Returns (dict): The settings item. None if there are no settings
+        """
+        response = self.table.get_item(Key={'id': SETTINGS_ID}, ConsistentRead=consistent_read)
+
+        if 'Item' in response:
+            return response['Item']
+
+        return self.migrate()
+
+
+    def get_legacy_item(self) -> dict:
+        """
+        Find the settings item of an older install
+
+        Returns (dict): The settings item. None if there's none
+        """
+        items = []
+        scan_parameters = {}
+
+        while True:
+            response = self.table.scan(**scan_parameters)
+            items.extend(item for item in response.get('Items', []) if item['id'] != SETTINGS_ID)
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_parameters['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        if len(items) == 0:
+            return None
+
+        # Prefer a complete settings item, and the same one on every call
+        return sorted(items, key=lambda item: ('subscriber' not in item, item['id']))[0]
+
+
+    def migrate(self) -> dict:
+        """
+        Move the settings item of an older install to the settings key
+
+        Returns (dict): The settings item. None if there are no settings
+        """
+        legacy_item = self.get_legacy_item()
+
+        if legacy_item is None:
+            return None
+
+        item = {**legacy_item, 'id': SETTINGS_ID}
+
+        try:
+            self.table.put_item(Item=item, ConditionExpression='attribute_not_exists(id)')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+            # Another invocation migrated the settings first
+            return self.table.get_item(Key={'id': SETTINGS_ID}, ConsistentRead=True).get('Item')
+
+        self.table.delete_item(Key={'id': legacy_item['id']})
+        print(f"Moved the settings item {legacy_item['id']} to the {SETTINGS_ID} key")
+
+        return item
+
+
+    def update(self, values: dict) -> bool:
+        """
+        Update some of the settings
+
+        Args:
+            values (dict): A dictionary of the settings to update
+
+        Returns (bool): True if the settings were updated and False if there are no settings
+        """
+        if len(values) == 0:
+            return False
+
+        update_parameters = {
+            'Key': {'id': SETTINGS_ID},
+            'UpdateExpression': 'SET ' + ', '.join(f'#f{index} = :f{index}' for index in range(len(values))),
+            'ConditionExpression': 'attribute_exists(id)',
+            'ExpressionAttributeNames': {f'#f{index}': key for index, key in enumerate(values)},
+            'ExpressionAttributeValues': {f':f{index}': value for index, value in enumerate(values.values())}
+        }
+
+        try:
+            self.table.update_item(**update_parameters)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+            # The settings may still be stored under the id of an older install
+            if self.migrate() is None:
+                return False
+            self.table.update_item(**update_parameters)
+
+        return True
@@ -3,8 +3,23 @@ import re
 import hashlib
 import json
 import boto3
+from decimal import Decimal
 from botocore.exceptions import ClientError
 from .settings import Settings
+from .settings_store import SettingsStore
+from .config_cache import config_cache, CONFIG_VERSION_ID
+from .client_pool import get_client
+
+# The check attributes each kind of caller needs. The full profile reads all of them
+CHECK_PROFILES = {
+    'full': None,
+    'runner': ['id', 'name', 'title', 'description', 'version', 'module', 'enabled', 'muted', 'config',
+               'email_templates'],
+    'ui': ['id', 'name', 'title', 'description', 'enabled', 'muted']
+}
+
+# The maximum number of items in a DynamoDB transaction
+TRANSACTION_SIZE = 100
 
 class Utils:
     def __init__(self) -> None:
@@ -15,6 +30,8 @@ class Utils:
         self.settings_table_name = os.environ.get('settings_table_name')
         self.checks_table_name = os.environ.get('checks_table_name')
         self.log_table_name = os.environ.get('log_table_name')
+        self.runs_table_name = os.environ.get('runs_table_name')
+        self.findings_table_name = os.environ.get('findings_table_name')
         
     
     def is_valid_uuid(self, uuid_string: str) -> bool:
@@ -46,37 +63,85 @@ class Utils:
     
     
     def get_settings(self) -> Settings:
+        """
+        Get the settings, from the configuration cache when they didn't change since they were last read
+        
+        Returns (Settings): The settings. None if there are no settings
+        """
+        return config_cache.get('settings', self.checks_table_name, self.load_settings)
+    
+    
+    def load_settings(self) -> Settings:
         """
         Get the settings from the DynamoDB settings table
         
         Returns (dict): A dictionary containing the settings information 
         """
         settings = None
-            
-        table = self.dynamodb.Table(self.settings_table_name)
         
-        # Scan the table and limit to 1 item
-        response = table.scan(
-            Limit=1
-        )
+        settings_item = SettingsStore(self.settings_table_name).get()
         
-        if response['Items']:
-            settings = Settings.from_query(response['Items'][0])
+        if settings_item is not None:
+            settings = Settings.from_query(settings_item)
     
         return settings
     
     
-    def get_checks(self) -> list:
+    def iter_scan(self, table_name: str, fields: list = None):
         """
-        Get the check items from DynamoDB
+        Scan a DynamoDB table, following the pages until the whole table was read
+        
+        Args:
+            table_name (str): The table name
+            fields (list): Optional. The attributes to read. All the attributes if not set
+        
+        Returns (generator): The table items
+        """
+        table = self.dynamodb.Table(table_name)
+        scan_parameters = {}
+        
+        if fields is not None:
+            scan_parameters['ProjectionExpression'] = ', '.join(f'#f{index}' for index in range(len(fields)))
+            scan_parameters['ExpressionAttributeNames'] = {f'#f{index}': field for index, field in enumerate(fields)}
+        
+        while True:
+            response = table.scan(**scan_parameters)
+            
+            for item in response.get('Items', []):
+                yield item
+            
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_parameters['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    
+    def get_checks(self, profile: str = 'full') -> list:
+        """
+        Get the check items, from the configuration cache when they didn't change since they were last read
+        
+        Args:
+            profile (str): Optional. The attributes profile, one of CHECK_PROFILES. Default: full
         
         Returns (list): List of check items. None in case of an error
         """
-        table = self.dynamodb.Table(self.checks_table_name)
-        response = table.scan()
+        if profile not in CHECK_PROFILES:
+            raise ValueError(f'Unknown checks profile {profile}')
+        
+        return config_cache.get(f'checks:{profile}', self.checks_table_name, lambda: self.load_checks(profile))
+    
+    
+    def load_checks(self, profile: str = 'full') -> list:
+        """
+        Get the check items from DynamoDB
+        
+        Args:
+            profile (str): Optional. The attributes profile, one of CHECK_PROFILES. Default: full
         
-        # Get the items from the response
-        items = response.get('Items', [])
+        Returns (list): List of check items. None in case of an error
+        """
+        # Get the items, without the configuration version item
+        items = [item for item in self.iter_scan(self.checks_table_name, CHECK_PROFILES[profile])
+                 if item.get('id') != CONFIG_VERSION_ID]
         
         # Sort the itmes to get a consistent check list
         sorted_items = sorted(items, key=lambda x: x.get('name', ''))
@@ -105,40 +170,108 @@ class Utils:
         return errors
     
     
-    def update_checks(self, checks: dict) -> list:
+    def update_checks(self, checks: list) -> list:
         """
-        Update checks in DynamoDB
+        Update the enabled field of checks in DynamoDB
+        
+        The checks whose enabled field didn't change are skipped. The others are updated in transactions of up to 
+        100 checks, so either all the checks of a transaction are updated or none of them is.
         
         Args:
-            checks (dict): A dictionary of checks to update
+            checks (list): A list of checks to update, each with its id and enabled fields
         
-        Returns (list): List of failed updates. Empty list if all updates were successful
+        Returns (list): List of failed updates, each with an error field. Empty list if all updates were successful
         """
+        # The last change of a check wins, since a transaction can't update an item twice
+        changes = {item['id']: item for item in checks}
+        current_checks = {c['id']: c for c in self.get_checks('ui')}
+        changed_checks = [item for item in changes.values()
+                          if current_checks.get(item['id'], {}).get('enabled') != item['enabled']]
+        
         failed_updates = []
-        table = self.dynamodb.Table(self.checks_table_name)
-        
-        # Process items and update the enabled field
-        for item in checks:
-            try:
-                response = table.update_item(
-                    Key={
-                        'id': item['id']
-                    },
-                    UpdateExpression='SET #field = :val',
-                    ExpressionAttributeNames={
-                        '#field': 'enabled'
-                    },
-                    ExpressionAttributeValues={
-                        ':val': item['enabled']
-                    },
-                    ReturnValues="UPDATED_NEW"
-                )
-            except Exception as e:
-                failed_updates.append(item)
+        for start in range(0, len(changed_checks), TRANSACTION_SIZE):
+            failed_updates.extend(self.update_checks_transaction(changed_checks[start:start + TRANSACTION_SIZE]))
+        
+        # Let the cached checks of all the Lambda Functions expire
+        if len(failed_updates) < len(changed_checks):
+            self.bump_config_version()
     
         return failed_updates
     
     
+    def update_checks_transaction(self, checks: list) -> list:
+        """
+        Update the enabled field of checks in a single transaction
+        
+        Args:
+            checks (list): A list of up to 100 checks to update
+        
+        Returns (list): List of failed updates, each with an error field. All the checks if the transaction failed
+        """
+        transact_items = [{
+            'Update': {
+                'TableName': self.checks_table_name,
+                'Key': {'id': {'S': item['id']}},
+                'UpdateExpression': 'SET #field = :val',
+                # Don't create items for unknown checks
+                'ConditionExpression': 'attribute_exists(id)',
+                'ExpressionAttributeNames': {'#field': 'enabled'},
+                'ExpressionAttributeValues': {':val': {'BOOL': item['enabled']}}
+            }
+        } for item in checks]
+        
+        try:
+            dynamodb_client = get_client('dynamodb')
+            dynamodb_client.transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons', [])
+            failed_updates = []
+            
+            for index, item in enumerate(checks):
+                code = reasons[index].get('Code', 'None') if index < len(reasons) else 'None'
+                
+                if code == 'ConditionalCheckFailed':
+                    error = 'Check not found'
+                elif code != 'None':
+                    error = reasons[index].get('Message') or code
+                elif len(reasons) > 0:
+                    # The check itself was fine, but another check canceled the transaction
+                    error = 'Not updated, the transaction was canceled'
+                else:
+                    error = e.response['Error'].get('Message', str(e))
+                
+                failed_updates.append({**item, 'error': error})
+            
+            return failed_updates
+        
+        return []
+    
+    
+    def bump_config_version(self) -> None:
+        """
+        Increase the configuration version after changing the checks or the settings, so the cached copies
+        are read again
+        """
+        config_cache.bump_version(self.checks_table_name)
+    
+    
+    def json_default(self, value):
+        """
+        Convert values json can't serialize, like the DynamoDB numbers
+        
+        Args:
+            value (any): The value to convert
+        
+        Returns (any): A json serializable value
+        """
+        if isinstance(value, Decimal):
+            return int(value) if value % 1 == 0 else float(value)
+        if isinstance(value, set):
+            return sorted(value)
+        
+        return str(value)
+    
+    
     def lambda_response(self, body, http_code=200) -> dict:
         """
         Create a lambda response
@@ -155,7 +288,7 @@ class Utils:
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*"  # For CORS support
             },
-            "body": json.dumps(body)
+            "body": json.dumps(body, default=self.json_default)
         }
         
         return response
\ No newline at end of file
@@ -1,15 +1,35 @@
 import sys
 import os
-import boto3
 import botocore
 import json
 import datetime
-from datetime import timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from lib.check_type import CheckType
 from lib.settings import Settings
+from lib.region_executor import RegionExecutor, RegionResults
+from lib.check_scheduler import CheckScheduler, ScheduledCheck, CheckCancelled
+from lib.client_pool import client_pool, get_client
+from lib.network_inventory import NetworkInventory
+from lib.collectors import iter_records, first_record
+from lib.region_catalog import region_catalog
+from lib.check_plan import CheckPlan
+
+S3_PUBLIC_ACCESS_BLOCK_SETTINGS = ['BlockPublicAcls', 'BlockPublicPolicy', 'IgnorePublicAcls', 'RestrictPublicBuckets']
+
+# Checks that run per region and can be split into one shard per region
+REGIONAL_CHECKS = [
+    CheckType.MISSING_TAGS.value,
+    CheckType.UNUSED_EIP.value,
+    CheckType.UNATTACHED_EBS_VOLUMES.value,
+    CheckType.USING_DEFAULT_VPC.value,
+    CheckType.EC2_IN_PUBLIC_SUBNET.value,
+    CheckType.RDS_PUBLIC_ACCESS.value,
+    CheckType.RDS_IN_PUBLIC_SUBNET.value
+]
 
 class Basic:
     def __init__(self, checks: list, settings: Settings) -> None:
@@ -17,52 +37,99 @@ class Basic:
         Initialize the Basic checks module
         
         Args:
-            checks (list): A list of checks to run
+            checks (list): A list of CheckPlan objects to run
         """
         self.checks = checks
         self.settings = settings
+        
+        defaults = settings.defaults if settings is not None else {}
+        self.region_executor = RegionExecutor(defaults.get('regionWorkers', 8))
+        self.check_scheduler = CheckScheduler(defaults.get('checkWorkers', 4))
+        
+        # Size the clients connection pools to the number of requests that may share a client
+        client_pool.configure(defaults.get('maxPoolConnections', 16))
+        region_catalog.configure(defaults.get('regionCatalogTtl', 3600))
+        
+        # Network inventories are shared by the VPC, EC2 and RDS checks of this run
+        self.network_inventories = {}
+        self.network_inventories_lock = threading.Lock()
+        
+        self.s3_workers = max(1, int(defaults.get('s3Workers', 16)))
+        self.account_id = None
+        
+        # Timing of the checks and of their regions, in seconds
+        self.check_durations = {}
+        self.region_durations = {}
+        self.durations_lock = threading.Lock()
+        
+        # The errors of the regions that failed while other regions of the same check succeeded
+        self.region_errors = {}
+        
+        # The cancellation event of the check running in the current thread
+        self.check_context = threading.local()
+    
+    def get_network_inventory(self, region: str) -> NetworkInventory:
+        """
+        Get the network inventory of a region for this run
+        
+        Args:
+            region (str): The region name
+        
+        Returns (NetworkInventory): The region network inventory
+        """
+        with self.network_inventories_lock:
+            if region not in self.network_inventories:
+                self.network_inventories[region] = NetworkInventory(get_client('ec2', region))
+            
+            return self.network_inventories[region]
+    
     
     def get_all_regions(self) -> list:
         """
-        Get a list of all regions
+        Get a list of all the regions enabled for the account
         
         Returns (list): A list of regions
         """
-        ec2_client = boto3.client('ec2')
-        regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
-        
-        return regions
+        # The catalog is cached across warm invocations and only lists regions enabled for the account
+        return region_catalog.get_enabled_regions()
         
         
-    def get_region_list(self, check_info: dict) -> list:
+    def run_in_regions(self, check_info: CheckPlan, region_function) -> RegionResults:
         """
-        Get a list of regions from a config section
+        Run a check function for each one of the check regions in parallel
+        
+        The check only errors if every region failed. Otherwise the results of the regions that succeeded are 
+        returned, and the errors of the others are attached to the check result.
         
         Args:
-            check_info (dict): check_info (dict): The check information as stored in the DB
+            check_info (CheckPlan): The check plan
+            region_function (callable): A function that gets a region name and returns the region results
         
-        Returns (list): A list of regions
+        Returns (RegionResults): The results of all the regions
         """
+        regions = check_info.regions
+        region_results = self.region_executor.run(regions, region_function, self.get_cancelled_event())
         
-        region_response = []
-        regions = []
+        with self.durations_lock:
+            self.region_durations.setdefault(check_info.name, {}).update(region_results.durations)
         
-        # Use the default regions and override if the regions are explicitly configured
-        if 'regions' in self.settings.defaults:
-            regions = self.settings.defaults['regions']
+        region_results.raise_if_all_failed()
         
-        if 'config' in check_info:
-            config = json.loads(check_info['config'])
-            
-            if 'regions' in config:
-                regions = config['regions']
-            
-        if len(regions) == 1 and regions[0] == "*":
-            region_response = self.get_all_regions()
-        else:
-            region_response = regions
+        if len(region_results.errors) > 0:
+            with self.durations_lock:
+                self.region_errors.setdefault(check_info.name, {}).update(region_results.get_error_messages())
+        
+        return region_results
+    
+    
+    def get_cancelled_event(self) -> threading.Event:
+        """
+        Get the cancellation event of the check running in the current thread
         
-        return region_response
+        Returns (threading.Event): The event set when the check timed out or was deferred. None outside a check
+        """
+        return getattr(self.check_context, 'cancelled', None)
+    
     
     def has_required_tags(self, tags, required_tags):
         """
@@ -88,105 +155,318 @@ class Basic:
     
     def run_checks(self) -> list:
         """
-        Run the module checks and return a list of results
+        Run the module checks concurrently and return a list of results in the checks order
+        """
+        results, pending_checks = self.run_checks_until()
+                        
+        return results
+    
+    
+    def run_checks_until(self, deadline: float = None, check_names: list = None,
+                         cancelled: threading.Event = None) -> tuple[list, list]:
+        """
+        Run the module checks concurrently until they complete, until a deadline or until they are cancelled
+        
+        Args:
+            deadline (float): Optional. A time.monotonic() value after which no check is waited for
+            check_names (list): Optional. The names of the checks to run. All the enabled checks if not set
+            cancelled (threading.Event): Optional. When set, the checks that did not complete are cancelled
+        
+        Returns (tuple): A list of results in the checks order and a list of the check names that did not complete
         """
         
+        scheduled_checks = []
+        for c in self.checks:
+            if c.enabled and (check_names is None or c.name in check_names):
+                scheduled_checks.append(ScheduledCheck(
+                    c.name,
+                    lambda cancelled, check_info=c: self.run_check(check_info, cancelled),
+                    c.timeout
+                ))
+        
         results = []
+        pending_checks = []
+        for scheduled_check in self.check_scheduler.run(scheduled_checks, deadline, cancelled):
+            if scheduled_check.deferred:
+                pending_checks.append(scheduled_check.name)
+            else:
+                self.record_check_duration(scheduled_check)
+                results.append(self.get_check_result(scheduled_check))
+                        
+        return results, pending_checks
+    
+    
+    def record_check_duration(self, scheduled_check: ScheduledCheck) -> None:
+        """
+        Record how long a check ran. The shards of a check run in parallel, so the longest one is kept
+        
+        Args:
+            scheduled_check (ScheduledCheck): A check after it was run
+        """
+        if scheduled_check.duration is None:
+            return
+        
+        duration = round(scheduled_check.duration, 3)
+        with self.durations_lock:
+            self.check_durations[scheduled_check.name] = max(self.check_durations.get(scheduled_check.name, 0),
+                                                             duration)
+    
+    
+    def get_check_result(self, scheduled_check: ScheduledCheck) -> dict:
+        """
+        Get the result of a check that was run by the scheduler
+        
+        Args:
+            scheduled_check (ScheduledCheck): A check after it was run
+        
+        Returns (dict): The check result. A check that completed in only some of its regions has the errors of 
+            the other regions in region_errors
+        """
+        result = {
+            'check': scheduled_check.name,
+            'pass': True,
+            'info': []
+        }
+        
+        if scheduled_check.error is not None:
+            # The check could not complete, so it neither passed nor failed
+            print(f"Error running check {scheduled_check.name}: {str(scheduled_check.error)}")
+            result['pass'] = None
+            result['error'] = str(scheduled_check.error)
+            return result
+        
+        if len(scheduled_check.value) > 0:
+            result['pass'] = False
+            result['info'] = scheduled_check.value
+        
+        with self.durations_lock:
+            region_errors = dict(self.region_errors.get(scheduled_check.name, {}))
+        if len(region_errors) > 0:
+            result['region_errors'] = region_errors
+        
+        return result
+    
+    
+    def get_shards(self) -> list:
+        """
+        Split the enabled checks into (check, region) shards
+        
+        Returns (list): A list of shards. Global checks have a single shard with no region
+        """
+        shards = []
         for c in self.checks:
-            if c['enabled'] == True:
-                
-                result = {
-                    'check': c['name'],
-                    'pass': True,
-                    'info': []
-                }
-                
-                resources = []
-                match c['name']:
-                    case CheckType.MISSING_TAGS.value:
-                        resources = self.check_tags(c)
-                    case CheckType.NO_MFA_ON_ROOT.value:
-                        if not self.has_mfa_on_root():
-                            resources = [c['title']]
-                    case CheckType.NO_PASSWORD_POLICY.value:
-                        if not self.has_password_policy():
-                            resources = [c['title']]
-                    case CheckType.PUBLIC_BUCKETS.value:
-                        resources = self.check_s3_public_buckets()
-                    case CheckType.NO_PREMIUM_SUPPORT.value:
-                        if not self.has_premuim_support():
-                            resources = [c['title']]
-                    case CheckType.NO_BUDGET.value:
-                        if not self.has_budget():
-                            resources = [c['title']]
-                    case CheckType.UNUSED_EIP.value:
-                        resources = self.check_unused_eip(c)
-                    case CheckType.UNATTACHED_EBS_VOLUMES.value:
-                        resources = self.check_unattached_ebs_volumes(c)
-                    case CheckType.USING_DEFAULT_VPC.value:
-                        resources = self.check_using_default_vpc(c)
-                    case CheckType.EC2_IN_PUBLIC_SUBNET.value:
-                        resources = self.check_ec2_in_public_subnet(c)
-                    case CheckType.RESOURCES_IN_OTHER_REGIONS.value:        
-                        resources = self.check_for_resources_in_other_regions(c)
-                    case CheckType.RDS_PUBLIC_ACCESS.value:        
-                        resources = self.check_for_public_rds(c)
-                    case CheckType.RDS_IN_PUBLIC_SUBNET.value:
-                        resources = self.check_for_rds_in_public_subnet(c)
-                    case CheckType.HAS_IAM_USRES.value:
-                        resources = self.check_has_iam_users(c)
-                
-                if len(resources) > 0:
+            if c.enabled:
+                if c.name in REGIONAL_CHECKS:
+                    for region in dict.fromkeys(c.regions):
+                        shards.append({'check': c.name, 'region': region})
+                else:
+                    shards.append({'check': c.name, 'region': None})
+        
+        return shards
+    
+    
+    def run_shard(self, shard: dict, cancelled: threading.Event = None) -> dict:
+        """
+        Run a single (check, region) shard
+        
+        Args:
+            shard (dict): A shard with the check name and the region (None for global checks)
+            cancelled (threading.Event): Optional. Set by the dispatcher when it no longer waits for the shard
+        
+        Returns (dict): The shard result, in the same format as a checks result, with the shard region
+        """
+        check_info = next((c for c in self.checks if c.name == shard['check']), None)
+        
+        if check_info is None:
+            return {'check': shard['check'], 'region': shard['region'], 'pass': None, 'info': [],
+                    'error': 'Unknown check'}
+        
+        if shard['region'] is not None:
+            check_info = check_info.for_regions([shard['region']])
+        
+        scheduled_check = ScheduledCheck(
+            check_info.name,
+            lambda cancelled: self.run_check(check_info, cancelled),
+            check_info.timeout
+        )
+        self.check_scheduler.run([scheduled_check], cancelled=cancelled)
+        self.record_check_duration(scheduled_check)
+        
+        return {**self.get_check_result(scheduled_check), 'region': shard['region']}
+    
+    
+    def aggregate_shard_results(self, shard_results: list) -> list:
+        """
+        Gather shard results back into a single result per check
+        
+        A check errors only if all its shards failed. Otherwise the findings of the shards that completed are 
+        kept, and the errors of the others are attached in region_errors.
+        
+        Args:
+            shard_results (list): A list of shard results, in the shards order
+        
+        Returns (list): A list of check results in the checks order
+        """
+        aggregated = {}
+        for shard_result in shard_results:
+            check_name = shard_result['check']
+            
+            if check_name not in aggregated:
+                aggregated[check_name] = {'check': check_name, 'pass': True, 'info': [], 'errors': {},
+                                          'region_errors': {}, 'completed': 0}
+            result = aggregated[check_name]
+            
+            if shard_result.get('error') is not None:
+                result['errors'][shard_result.get('region') or 'global'] = shard_result['error']
+                continue
+            
+            result['completed'] += 1
+            result['region_errors'].update(shard_result.get('region_errors') or {})
+            
+            info = shard_result.get('info') or []
+            if isinstance(info, dict):
+                # Missing tags results are grouped by service
+                merged_info = result['info'] if isinstance(result['info'], dict) else {}
+                for key, value in info.items():
+                    merged_info.setdefault(key, []).extend(value)
+                result['info'] = merged_info
+            else:
+                result['info'].extend(info)
+        
+        results = []
+        for result in aggregated.values():
+            errors = result.pop('errors')
+            completed = result.pop('completed')
+            result['region_errors'].update(errors)
+            
+            if completed == 0:
+                # No shard completed, so the check neither passed nor failed
+                result['pass'] = None
+                result['error'] = ' '.join(errors.values())
+                del result['region_errors']
+            else:
+                if len(result['info']) > 0:
                     result['pass'] = False
-                    result['info'] = resources
-                    
-                results.append(result)
-                        
+                if len(result['region_errors']) == 0:
+                    del result['region_errors']
+            
+            results.append(result)
+        
         return results
+    
+    
+    def run_check(self, c: CheckPlan, cancelled: threading.Event = None) -> list:
+        """
+        Run a single check
+        
+        Args:
+            c (CheckPlan): The check plan
+            cancelled (threading.Event): Optional. Set by the scheduler when the check timed out or was deferred. 
+                The check stops before its next region or bucket
+        
+        Returns (list): The resources found by the check. Empty list if the check passed
+        """
+        # An invalid config fails only its own check
+        if c.error is not None:
+            raise Exception(c.error)
+        
+        self.check_context.cancelled = cancelled
+        
+        resources = []
+        match c.name:
+            case CheckType.MISSING_TAGS.value:
+                resources = self.check_tags(c)
+            case CheckType.NO_MFA_ON_ROOT.value:
+                if not self.has_mfa_on_root():
+                    resources = [c.title]
+            case CheckType.NO_PASSWORD_POLICY.value:
+                if not self.has_password_policy():
+                    resources = [c.title]
+            case CheckType.PUBLIC_BUCKETS.value:
+                resources = self.check_s3_public_buckets()
+            case CheckType.NO_PREMIUM_SUPPORT.value:
+                if not self.has_premuim_support():
+                    resources = [c.title]
+            case CheckType.NO_BUDGET.value:
+                if not self.has_budget():
+                    resources = [c.title]
+            case CheckType.UNUSED_EIP.value:
+                resources = self.check_unused_eip(c)
+            case CheckType.UNATTACHED_EBS_VOLUMES.value:
+                resources = self.check_unattached_ebs_volumes(c)
+            case CheckType.USING_DEFAULT_VPC.value:
+                resources = self.check_using_default_vpc(c)
+            case CheckType.EC2_IN_PUBLIC_SUBNET.value:
+                resources = self.check_ec2_in_public_subnet(c)
+            case CheckType.RESOURCES_IN_OTHER_REGIONS.value:        
+                resources = self.check_for_resources_in_other_regions(c)
+            case CheckType.RDS_PUBLIC_ACCESS.value:        
+                resources = self.check_for_public_rds(c)
+            case CheckType.RDS_IN_PUBLIC_SUBNET.value:
+                resources = self.check_for_rds_in_public_subnet(c)
+            case CheckType.HAS_IAM_USRES.value:
+                resources = self.check_has_iam_users(c)
+        
+        return resources
 
 
-    def check_tags(self, check_info: dict) -> list:
+    def check_tags(self, check_info: CheckPlan) -> list:
         """
         Check if the rquired tags are set for the services set in the congfig
         
         Args:
-            check_info (dict): The check information as stored in the DB
+            check_info (CheckPlan): The check plan
             
         Returns (list): A list of resources with missing tags
         """
         
+        required_resources = check_info.required_resources
+        required_tags = check_info.required_tags
+        
+        region_results = self.run_in_regions(
+            check_info,
+            lambda region: self.check_tags_in_region(region, required_resources, required_tags)
+        )
+        
+        return region_results.merged_dict()
+    
+    
+    def check_tags_in_region(self, region: str, required_resources: list, required_tags: list) -> dict:
+        """
+        Check if the required tags are set for the services in a single region
+        
+        Args:
+            region (str): The region to check
+            required_resources (list): A list of services that requires tags
+            required_tags (list): A list of required tag keys
+            
+        Returns (dict): A dictionary of service name to a list of resources with missing tags
+        """
+        
         non_compliant_resources = {}
-        regions = self.get_region_list(check_info)
-        check_config = json.loads(check_info['config'])
-        required_resources = check_config['resources']
-        required_tags = check_config['requiredTags']
+        tagging_client = get_client('resourcegroupstaggingapi', region)
         
-        try:
-            for region in regions:
-                tagging_client = boto3.client('resourcegroupstaggingapi', region_name=region)
-                
-                paginator = tagging_client.get_paginator('get_resources')
-                for page in paginator.paginate():
-                    for resource in page['ResourceTagMappingList']:
-                        resource_arn = resource['ResourceARN']
-                        tags = resource['Tags']
-                        
-                        # Extract service name from ARN
-                        service_name = resource_arn.split(':')[2]
-                        
-                        if service_name not in non_compliant_resources:
-                            non_compliant_resources[service_name] = []
-                        
-                        # Check if required tags are present
-                        if service_name in required_resources and not self.has_required_tags(tags, required_tags):
-                            non_compliant_resources[service_name].append({
-                                'resource_arn': resource_arn,
-                                'resource_type': service_name
-                            })
-                                
-        except Exception as e:
-            print(e)
-            raise(e)
+        # Only ask for the resources of the required services
+        resources = iter_records(tagging_client, 'get_resources', 'ResourceTagMappingList', page_size=100,
+                                 ResourceTypeFilters=required_resources)
+        
+        for resource in resources:
+            resource_arn = resource['ResourceARN']
+            tags = resource['Tags']
+            
+            # Extract service name from ARN
+            service_name = resource_arn.split(':')[2]
+            
+            if service_name not in non_compliant_resources:
+                non_compliant_resources[service_name] = []
+            
+            # Check if required tags are present
+            if service_name in required_resources and not self.has_required_tags(tags, required_tags):
+                non_compliant_resources[service_name].append({
+                    'region': region,
+                    'resource_arn': resource_arn,
+                    'resource_type': service_name
+                })
         
         return non_compliant_resources
         
@@ -199,7 +479,7 @@ class Basic:
         """
         
         try:
-            iam_client = boto3.client('iam')
+            iam_client = get_client('iam')
             account_summary = iam_client.get_account_summary()
             root_mfa_enabled = bool(account_summary['SummaryMap'].get('AccountMFAEnabled', 0))
             
@@ -217,7 +497,7 @@ class Basic:
         """
         
         try:
-            iam = boto3.client('iam')
+            iam = get_client('iam')
             response = iam.get_account_password_policy()
             
             # If we get here, a password policy exists
@@ -236,6 +516,61 @@ class Basic:
             raise(e)
     
     
+    def get_account_id(self) -> str:
+        """
+        Get the id of the account the checks run on
+        
+        Returns (str): The AWS account id
+        """
+        if self.account_id is None:
+            self.account_id = get_client('sts').get_caller_identity().get('Account')
+        
+        return self.account_id
+    
+    
+    def get_account_public_access_block(self) -> dict:
+        """
+        Get the account level S3 public access block configuration
+        
+        Returns (dict): The account public access block configuration. Empty dictionary if there's none
+        """
+        try:
+            s3control_client = get_client('s3control')
+            response = s3control_client.get_public_access_block(AccountId=self.get_account_id())
+            
+            return response['PublicAccessBlockConfiguration']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
+                return {}
+            
+            # Without the account configuration every bucket is fully checked
+            print(f"Could not get the account public access block configuration. {str(e)}")
+            return {}
+    
+    
+    def get_bucket_region(self, bucket_name: str) -> str:
+        """
+        Get the region of an S3 bucket
+        
+        Args:
+            bucket_name (str): The bucket name
+        
+        Returns (str): The bucket region. None if the region could not be found
+        """
+        try:
+            location = get_client('s3').get_bucket_location(Bucket=bucket_name).get('LocationConstraint')
+        except ClientError:
+            return None
+        
+        # Buckets in us-east-1 have no location constraint and old eu-west-1 buckets use 'EU'
+        if location is None or location == '':
+            return 'us-east-1'
+        if location == 'EU':
+            return 'eu-west-1'
+        
+        return location
+    
+    
     def check_s3_public_buckets(self) -> list:
         """
         Search for S3 public access
@@ -243,92 +578,111 @@ class Basic:
         Returns (list): A list of S3 buckets with public access. Empty list if there are none
         """
         
-        s3_client = boto3.client('s3')
-        public_buckets = []
-        buckets = []
+        s3_client = get_client('s3')
+        
+        # When the account blocks all public access no bucket can be public
+        account_block = self.get_account_public_access_block()
+        if all(account_block.get(setting, False) for setting in S3_PUBLIC_ACCESS_BLOCK_SETTINGS):
+            return []
         
         try:
-            buckets = s3_client.list_buckets()['Buckets']
+            bucket_names = [bucket['Name'] for bucket in iter_records(s3_client, 'list_buckets', 'Buckets')]
         except Exception as e:
             print(e)
             raise(e)
         
-        if len(buckets) > 0:
-            for bucket in buckets:
-                bucket_name = bucket['Name']
-                public_access = False
-                public_reason = []
-                
-                # Check bucket public access block settings
-                try:
-                    public_access_block = s3_client.get_public_access_block(Bucket=bucket_name)
-                    block_config = public_access_block['PublicAccessBlockConfiguration']
-                    
-                    # If any of these are False, the bucket might allow public access
-                    if not block_config.get('BlockPublicAcls', True):
-                        public_reason.append("BlockPublicAcls disabled")
-                        public_access = True
-                    if not block_config.get('BlockPublicPolicy', True):
-                        public_reason.append("BlockPublicPolicy disabled")
-                        public_access = True
-                    if not block_config.get('IgnorePublicAcls', True):
-                        public_reason.append("IgnorePublicAcls disabled")
-                        public_access = True
-                    if not block_config.get('RestrictPublicBuckets', True):
-                        public_reason.append("RestrictPublicBuckets disabled")
-                        public_access = True
-                        
-                except ClientError as e:
-                    public_access = True
-                    if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
-                        # No public access block configured - potential risk
-                        public_reason.append("The bucket might be public. No public access block configuration found")
-                    else:
-                        public_reason.append(f'The bucket might be public. Getting an error when trying to get the bucket access block configuration. {str(e)}')
+        public_buckets = []
+        cancelled = self.get_cancelled_event()
+        
+        def check_bucket(bucket_name: str) -> list:
+            # The bucket workers don't share the check thread, so the event is tested here
+            if cancelled is not None and cancelled.is_set():
+                raise CheckCancelled(f'Check cancelled before bucket {bucket_name}')
+            
+            return self.check_s3_bucket_public_access(bucket_name, account_block)
+        
+        if len(bucket_names) > 0:
+            workers = min(self.s3_workers, len(bucket_names))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                bucket_reasons = executor.map(check_bucket, bucket_names)
                 
+                for bucket_name, public_reason in zip(bucket_names, bucket_reasons):
+                    if len(public_reason) > 0:
+                        public_buckets.append({'bucket_name': bucket_name, 'reasons': public_reason})
+        
+        return public_buckets
+    
+    
+    def check_s3_bucket_public_access(self, bucket_name: str, account_block: dict) -> list:
+        """
+        Check a single S3 bucket for public access
+        
+        Args:
+            bucket_name (str): The bucket name
+            account_block (dict): The account level public access block configuration
+        
+        Returns (list): A list of reasons the bucket might be public. Empty list if the bucket is not public
+        """
+        public_reason = []
+        
+        # Use a client in the bucket region so the requests are not redirected
+        bucket_region = self.get_bucket_region(bucket_name)
+        s3_client = get_client('s3', bucket_region)
+        
+        # Check bucket public access block settings
+        try:
+            public_access_block = s3_client.get_public_access_block(Bucket=bucket_name)
+            block_config = public_access_block['PublicAccessBlockConfiguration']
+            
+            # If any of these are False and not enforced by the account, the bucket might allow public access
+            for setting in S3_PUBLIC_ACCESS_BLOCK_SETTINGS:
+                if not block_config.get(setting, True) and not account_block.get(setting, False):
+                    public_reason.append(f"{setting} disabled")
                 
-                # Check bucket ACL
-                try:
-                    acl = s3_client.get_bucket_acl(Bucket=bucket_name)
-                    for grant in acl.get('Grants', []):
-                        grantee = grant.get('Grantee', {})
-                        if grantee.get('URI') == 'http://acs.amazonaws.com/groups/global/AllUsers':
-                            public_reason.append(f"Public ACL: {grant.get('Permission')}")
-                            public_access = True
-                        elif grantee.get('URI') == 'http://acs.amazonaws.com/groups/global/AuthenticatedUsers':
-                            public_reason.append(f"ACL grants access to any AWS authenticated user: {grant.get('Permission')}")
-                            public_access = True
-                except ClientError:
-                    public_access = True
-                    public_reason.append("The bucket could potentially be public. Could not check ACL")
-                    
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
+                # No public access block configured - potential risk
+                public_reason.append("The bucket might be public. No public access block configuration found")
+            else:
+                public_reason.append(f'The bucket might be public. Getting an error when trying to get the bucket access block configuration. {str(e)}')
+        
+        
+        # Check bucket ACL, unless the account ignores public ACLs
+        if not account_block.get('IgnorePublicAcls', False):
+            try:
+                acl = s3_client.get_bucket_acl(Bucket=bucket_name)
+                for grant in acl.get('Grants', []):
+                    grantee = grant.get('Grantee', {})
+                    if grantee.get('URI') == 'http://acs.amazonaws.com/groups/global/AllUsers':
+                        public_reason.append(f"Public ACL: {grant.get('Permission')}")
+                    elif grantee.get('URI') == 'http://acs.amazonaws.com/groups/global/AuthenticatedUsers':
+                        public_reason.append(f"ACL grants access to any AWS authenticated user: {grant.get('Permission')}")
+            except ClientError:
+                public_reason.append("The bucket could potentially be public. Could not check ACL")
+            
+        
+        # Check bucket policy, unless the account restricts public bucket policies
+        if not account_block.get('RestrictPublicBuckets', False):
+            try:
+                policy = s3_client.get_bucket_policy(Bucket=bucket_name)
+                policy_str = policy.get('Policy', '')
+                policy_json = json.loads(policy_str)
                 
-                # Check bucket policy
-                try:
-                    policy = s3_client.get_bucket_policy(Bucket=bucket_name)
-                    policy_str = policy.get('Policy', '')
-                    policy_json = json.loads(policy_str)
+                # Simple check for public policy - look for Principal: "*" or Principal: {"AWS": "*"}
+                for statement in policy_json.get('Statement', []):
+                    principal = statement.get('Principal', {})
+                    effect = statement.get('Effect', '')
                     
-                    # Simple check for public policy - look for Principal: "*" or Principal: {"AWS": "*"}
-                    for statement in policy_json.get('Statement', []):
-                        principal = statement.get('Principal', {})
-                        effect = statement.get('Effect', '')
+                    if effect == 'Allow' and (principal == '*' or principal == {"AWS": "*"} or 
+                                              (isinstance(principal, dict) and principal.get('AWS') == '*')):
+                        public_reason.append("Bucket policy allows public access")
+                        break
                         
-                        if effect == 'Allow' and (principal == '*' or principal == {"AWS": "*"} or 
-                                                  (isinstance(principal, dict) and principal.get('AWS') == '*')):
-                            public_reason.append("Bucket policy allows public access")
-                            public_access = True
-                            break
-                            
-                except ClientError as e:
-                    if e.response['Error']['Code'] != 'NoSuchBucketPolicy':
-                        public_reason.append(f"The bucket could potentially be public. Error checking policy: {str(e)}")
-                        public_access = True
-                
-                if public_access:
-                    public_buckets.append({'bucket_name': bucket_name, 'reasons': public_reason})
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'NoSuchBucketPolicy':
+                    public_reason.append(f"The bucket could potentially be public. Error checking policy: {str(e)}")
         
-        return public_buckets
+        return public_reason
     
     
     def has_premuim_support(self) -> bool:
@@ -337,7 +691,7 @@ class Basic:
         
         Returns (bool): True if the account has premium support and False otherwise
         """
-        support_client = boto3.client('support')
+        support_client = get_client('support')
         has_premium_support = True
         
         try:
@@ -361,14 +715,12 @@ class Basic:
         has_budgets = False
         
         try:
-            account_id = boto3.client('sts').get_caller_identity().get('Account')
-            budget_client = boto3.client('budgets')
-            response = budget_client.describe_budgets(
-                AccountId=account_id
-            )
-            
-            budgets = response.get('Budgets', [])
-            has_budgets = len(budgets) > 0
+            account_id = self.get_account_id()
+            budget_client = get_client('budgets')
+            
+            # A single budget is enough, so only the first one is requested
+            budget = first_record(budget_client, 'describe_budgets', 'Budgets', AccountId=account_id)
+            has_budgets = budget is not None
         except Exception as e:
             print(str(e))
             raise(e)
@@ -376,275 +728,261 @@ class Basic:
         return has_budgets
     
     
-    def check_unused_eip(self, check_info: dict) -> list:
+    def check_unused_eip(self, check_info: CheckPlan) -> list:
         """
         Check for unused elastic ips
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of unused elastic ips. Empty list if there are none
         """
-        unused_eips = []
-        regions = self.get_region_list(check_info)
+        region_results = self.run_in_regions(check_info, self.check_unused_eip_in_region)
         
-        try:
-            for region in regions:
-                regional_ec2 = boto3.client('ec2', region_name=region)
-                addresses = regional_ec2.describe_addresses()['Addresses']
-                
-                for address in addresses:
-                    if 'InstanceId' not in address and 'NetworkInterfaceId' not in address:
-                        eip_info = {
-                            'region': region,
-                            'allocationId': address.get('AllocationId', 'N/A'),
-                            'publicIp': address.get('PublicIp', 'N/A'),
-                            'tags': address.get('Tags', [])
-                        }
-                        unused_eips.append(eip_info)
-            
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
+        return region_results.merged_list()
+    
+    
+    def check_unused_eip_in_region(self, region: str) -> list:
+        """
+        Check for unused elastic ips in a single region
+        
+        Args:
+            region (str): The region to check
+        
+        Returns (list): A list of unused elastic ips. Empty list if there are none
+        """
+        unused_eips = []
+        regional_ec2 = get_client('ec2', region)
+        addresses = iter_records(regional_ec2, 'describe_addresses', 'Addresses')
+        
+        for address in addresses:
+            if 'InstanceId' not in address and 'NetworkInterfaceId' not in address:
+                eip_info = {
+                    'region': region,
+                    'allocationId': address.get('AllocationId', 'N/A'),
+                    'publicIp': address.get('PublicIp', 'N/A'),
+                    'tags': address.get('Tags', [])
+                }
+                unused_eips.append(eip_info)
         
         return unused_eips
     
-    def check_unattached_ebs_volumes(self, check_info: dict) -> list:
+    
+    def check_unattached_ebs_volumes(self, check_info: CheckPlan) -> list:
         """
         Check for unattached EBS volumes
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of unattached EBS volumes. Empty list if there are none
         """
+        region_results = self.run_in_regions(check_info, self.check_unattached_ebs_volumes_in_region)
         
-        unattached_ebs_volumes = []
-        regions = self.get_region_list(check_info)
+        return region_results.merged_list()
+    
+    
+    def check_unattached_ebs_volumes_in_region(self, region: str) -> list:
+        """
+        Check for unattached EBS volumes in a single region
         
-        try:
-            for region in regions:
-                ec2 = boto3.resource('ec2', region_name=region)
-                
-                # Filter for available (unattached) volumes
-                volumes = ec2.volumes.filter(
-                    Filters=[{'Name': 'status', 'Values': ['available']}]
-                )
-                
-                for volume in volumes:
-                    volume_info = {
-                        'region': region,
-                        'volume_id': volume.id,
-                        'size': f"{volume.size} GB"
-                    }
-                    
-                    unattached_ebs_volumes.append(volume_info)
+        Args:
+            region (str): The region to check
+        
+        Returns (list): A list of unattached EBS volumes. Empty list if there are none
+        """
+        unattached_ebs_volumes = []
+        # boto3 resources are not thread safe, so the volumes are read with the pooled client
+        ec2_client = get_client('ec2', region)
+        
+        # Filter for available (unattached) volumes
+        volumes = iter_records(ec2_client, 'describe_volumes', 'Volumes', page_size=500,
+                               Filters=[{'Name': 'status', 'Values': ['available']}])
+        
+        for volume in volumes:
+            volume_info = {
+                'region': region,
+                'volume_id': volume['VolumeId'],
+                'size': f"{volume['Size']} GB"
+            }
             
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
+            unattached_ebs_volumes.append(volume_info)
         
         return unattached_ebs_volumes
         
     
-    def check_using_default_vpc(self, check_info: dict) -> list:
+    def check_using_default_vpc(self, check_info: CheckPlan) -> list:
         """
         Check for default VPC usage
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of resources in a default vpc. Empty list if there's no default vpc
         """
+        region_results = self.run_in_regions(check_info, self.check_using_default_vpc_in_region)
+        
+        return region_results.merged_list()
+    
+    
+    def check_using_default_vpc_in_region(self, region: str) -> list:
+        """
+        Check for default VPC usage in a single region
+        
+        Args:
+            region (str): The region to check
         
+        Returns (list): A list of resources in a default vpc. Empty list if there's no default vpc
+        """
         default_vpc_resources = []
-        regions = self.get_region_list(check_info)
+        ec2_client = get_client('ec2', region)
+        inventory = self.get_network_inventory(region)
+        default_vpc = inventory.default_vpc
         
-        try:
-            for region in regions:
-                ec2 = boto3.client('ec2', region_name=region)
-                response = ec2.describe_vpcs()
+        if default_vpc:
+            vpc_id = default_vpc['VpcId']
+            
+            # Collect EC2 Instances details
+            for instance in inventory.instances_in_vpc(vpc_id):
+                instance_id = instance['InstanceId']
+                instance_name = instance.get('KeyName', '')
                 
-                default_vpc = None
-                for vpc in response['Vpcs']:
-                    if vpc.get('IsDefault', False):
-                        default_vpc = vpc
-                        break
+                default_vpc_resources.append({
+                    'region': region,
+                    'resource': f'EC2 ({instance_name} - {instance_id})',
+                    'resource_id': instance_id
+                })
+            
+            # Collect security groups details
+            security_groups = iter_records(ec2_client, 'describe_security_groups', 'SecurityGroups', page_size=1000,
+                                           Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}])
+            for sg in security_groups:
+                group_name = sg['GroupName']
+                group_id = sg['GroupId']
                 
-                if default_vpc:
-                    vpc_id = default_vpc['VpcId']
-                    
-                    # Collect EC2 Instances details
-                    instances = ec2.describe_instances(
-                        Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}]
-                    )
-                    for reservation in instances['Reservations']:
-                        for instance in reservation['Instances']:
-                            instance_id = instance['InstanceId']
-                            instance_name = instance.get('KeyName', '')
-                            
-                            default_vpc_resources.append({
-                                'region': region,
-                                'resource': f'EC2 ({instance_name} - {instance_id})'
-                            })
-                    
-                    # Collect security groups details
-                    security_groups = ec2.describe_security_groups(
-                        Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}]
-                    )
-                    for sg in security_groups['SecurityGroups']:
-                        group_name = sg['GroupName']
-                        group_id = sg['GroupId']
-                        
-                        default_vpc_resources.append({
-                                'region': region,
-                                'resource': f'Security Group ({group_name} - {group_id})'
-                            })
-                    
-                    # Collect subnets details
-                    subnets = ec2.describe_subnets(
-                        Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}]
-                    )
-                    for subnet in subnets['Subnets']:
-                        subnet_id = subnet['SubnetId']
-                        cidr_block = subnet['CidrBlock']
-                        
-                        default_vpc_resources.append({
-                                'region': region,
-                                'resource': f'Subnet ({cidr_block} - {subnet_id})'
-                            })
-                    
-                    # Collect network interfaces details
-                    network_interfaces = ec2.describe_network_interfaces(
-                        Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}]
-                    )
-                    for ni in network_interfaces['NetworkInterfaces']:
-                        network_interface_id = ni['NetworkInterfaceId']
-                        
-                        default_vpc_resources.append({
-                                'region': region,
-                                'resource': f'Network Interface ({network_interface_id})'
-                            })
+                default_vpc_resources.append({
+                        'region': region,
+                        'resource': f'Security Group ({group_name} - {group_id})',
+                        'resource_id': group_id
+                    })
+            
+            # Collect subnets details
+            for subnet in inventory.subnets_in_vpc(vpc_id):
+                subnet_id = subnet['SubnetId']
+                cidr_block = subnet['CidrBlock']
+                
+                default_vpc_resources.append({
+                        'region': region,
+                        'resource': f'Subnet ({cidr_block} - {subnet_id})',
+                        'resource_id': subnet_id
+                    })
+            
+            # Collect network interfaces details
+            network_interfaces = iter_records(ec2_client, 'describe_network_interfaces', 'NetworkInterfaces',
+                                              page_size=1000, Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}])
+            for ni in network_interfaces:
+                network_interface_id = ni['NetworkInterfaceId']
+                
+                default_vpc_resources.append({
+                        'region': region,
+                        'resource': f'Network Interface ({network_interface_id})',
+                        'resource_id': network_interface_id
+                    })
+            
+            # Collect elastic load balancers details
+            elb = get_client('elbv2', region)
+            load_balancers = iter_records(elb, 'describe_load_balancers', 'LoadBalancers', page_size=400)
+            for lb in load_balancers:
+                if lb.get('VpcId') == vpc_id:
+                    load_balancer_name = lb['LoadBalancerName']
+                    load_balancer_type = lb['Type']
                     
-                    # Collect elastic load balancers details
-                    elb = boto3.client('elbv2')
-                    load_balancers = elb.describe_load_balancers()
-                    for lb in load_balancers['LoadBalancers']:
-                        if lb.get('VpcId') == vpc_id:
-                            load_balancer_name = lb['LoadBalancerName']
-                            load_balancer_type = lb['Type']
-                            
-                            default_vpc_resources.append({
-                                'region': region,
-                                'resource': f'Load Balancer ({load_balancer_name} - {load_balancer_type})'
-                            })
-                            
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
+                    default_vpc_resources.append({
+                        'region': region,
+                        'resource': f'Load Balancer ({load_balancer_name} - {load_balancer_type})',
+                        'resource_id': lb['LoadBalancerArn']
+                    })
         
         return default_vpc_resources
     
     
-    def is_subnet_public(self, subnet_id: str, ec2_client: boto3.client) -> bool:
+    def is_subnet_public(self, subnet_id: str, inventory: NetworkInventory) -> bool:
         """
         Check if a subnet is public by verifying if its route table has a route to an Internet Gateway
         
         Args:
             subnet_id (str): The subnet id
-            ec2_client (boto3.client): An initialzied boto3 client for ec2
+            inventory (NetworkInventory): The network inventory of the subnet region
         
         Returns (bool): True if the subnet is public and False otherwise
         """
-        # Get route tables associated with the subnet
-        response = ec2_client.describe_route_tables(
-            Filters=[{'Name': 'association.subnet-id', 'Values': [subnet_id]}]
-        )
-        
-        route_tables = response.get('RouteTables', [])
+        return inventory.route_table_index.is_subnet_public(subnet_id)
+    
+    
+    def check_ec2_in_public_subnet(self, check_info: CheckPlan) -> list:
+        """
+        Check for EC2 instances running in public subnets
         
-        # If no explicit association, get the main route table for the VPC
-        if not route_tables:
-            subnet_response = ec2_client.describe_subnets(SubnetIds=[subnet_id])
-            vpc_id = subnet_response['Subnets'][0]['VpcId']
-            
-            response = ec2_client.describe_route_tables(
-                Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}, {'Name': 'association.main', 'Values': ['true']}]
-            )
-            route_tables = response.get('RouteTables', [])
+        Args:
+            check_info (CheckPlan): A check plan
         
-        # Check if any route table has a route to an Internet Gateway
-        for rt in route_tables:
-            for route in rt.get('Routes', []):
-                if route.get('GatewayId', '').startswith('igw-') and route.get('DestinationCidrBlock') == '0.0.0.0/0':
-                    return True
+        Returns (list): A list of EC2 instances running in a public subnet. Empty list if there are non
+        """
+        region_results = self.run_in_regions(check_info, self.check_ec2_in_public_subnet_in_region)
         
-        return False
+        return region_results.merged_list()
     
     
-    def check_ec2_in_public_subnet(self, check_info: dict) -> list:
+    def check_ec2_in_public_subnet_in_region(self, region: str) -> list:
         """
-        Check for EC2 instances running in public subnets
+        Check for EC2 instances running in public subnets in a single region
         
         Args:
-            check_info (dict): A check information
+            region (str): The region to check
         
         Returns (list): A list of EC2 instances running in a public subnet. Empty list if there are non
         """
         instances_in_public_subnets = []
-        regions = self.get_region_list(check_info)
+        inventory = self.get_network_inventory(region)
         
-        try:
-            for region in regions:
-                ec2_client = boto3.client('ec2', region_name=region)
-                instances_response = ec2_client.describe_instances()
-                subnets_response = ec2_client.describe_subnets()
+        # Create a dictionary of subnet IDs to their public/private status
+        public_subnets = {}
+        for subnet in inventory.subnets:
+            subnet_id = subnet['SubnetId']
+            is_subnet_public = self.is_subnet_public(subnet_id, inventory)
+            
+            if is_subnet_public:
+                public_subnets[subnet_id] = subnet_id
+            
+        # Find instances in public subnets
+        for instance in inventory.instances:
+            subnet_id = instance.get('SubnetId')
+            
+            if public_subnets.get(subnet_id, False):
+                instance_id = instance['InstanceId']
+                instance_name = instance.get('KeyName', 'N/A')
                 
-                # Create a dictionary of subnet IDs to their public/private status
-                public_subnets = {}
-                for subnet in subnets_response['Subnets']:
-                    subnet_id = subnet['SubnetId']
-                    is_subnet_public = self.is_subnet_public(subnet_id, ec2_client)
-                    
-                    if is_subnet_public:
-                        public_subnets[subnet_id] = subnet_id
-                    
-                # Find instances in public subnets
-                for reservation in instances_response['Reservations']:
-                    for instance in reservation['Instances']:
-                        instance_id = instance['InstanceId']
-                        subnet_id = instance['SubnetId']
-                        
-                        if public_subnets.get(subnet_id, False):
-                            instance_id = instance['InstanceId']
-                            instance_name = instance.get('KeyName', 'N/A')
-                            
-                            instances_in_public_subnets.append({
-                                'region': region,
-                                'resource': f'{instance_name} - {instance_id}'
-                            })
-        
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
-        
+                instances_in_public_subnets.append({
+                    'region': region,
+                    'resource': f'{instance_name} - {instance_id}',
+                    'resource_id': instance_id
+                })
         
         return instances_in_public_subnets
     
     
-    def check_for_resources_in_other_regions(self, check_info: dict) -> list:
+    def check_for_resources_in_other_regions(self, check_info: CheckPlan) -> list:
         """
         Check if there are resources in other regions than the intended ones
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of resources running in unintended regions. Empty list if there are non
         """
         resources_in_other_regions = []
         
-        all_regions = self.get_all_regions()
-        intended_regions = self.get_region_list(check_info)
+        intended_regions = check_info.regions
         intended_regions.extend(['global', 'noregion'])
         
         # Get today's date and first day of the month
@@ -661,7 +999,7 @@ class Basic:
             end_date_str = end_date.strftime('%Y-%m-%d')
                 
         try:
-            client = boto3.client('ce')
+            client = get_client('ce')
             response = client.get_cost_and_usage(
                 TimePeriod={
                     'Start': start_date_str,
@@ -703,90 +1041,103 @@ class Basic:
         return resources_in_other_regions
     
     
-    def check_for_public_rds(self, check_info: dict) -> list:
+    def check_for_public_rds(self, check_info: CheckPlan) -> list:
         """
         Check if there are any RDS instances set for public access
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of RDS instances with public access. Empty list if there are non
         """
+        region_results = self.run_in_regions(check_info, self.check_for_public_rds_in_region)
         
+        return region_results.merged_list()
+    
+    
+    def check_for_public_rds_in_region(self, region: str) -> list:
+        """
+        Check if there are any RDS instances set for public access in a single region
+        
+        Args:
+            region (str): The region to check
+        
+        Returns (list): A list of RDS instances with public access. Empty list if there are non
+        """
         public_rds_instances = []
-        regions = self.get_region_list(check_info)
+        rds_client = get_client('rds', region)
+        rds_instances = iter_records(rds_client, 'describe_db_instances', 'DBInstances', page_size=100)
         
-        try:
-            for region in regions:
-                rds_client = boto3.client('rds', region_name=region)
-                response = rds_client.describe_db_instances()
+        for instance in rds_instances:
+            if instance.get('PubliclyAccessible'):
+                rds_id = instance.get('DBInstanceIdentifier')
+                rds_engine = instance.get('Engine')
                 
-                for instance in response.get('DBInstances', []):
-                    if instance.get('PubliclyAccessible'):
-                        rds_id = instance.get('DBInstanceIdentifier')
-                        rds_engine = instance.get('Engine')
-                        
-                        public_rds_instances.append({
-                            'region': region,
-                            'resource': f'RDS Id: {rds_id}. Engine: {rds_engine}'
-                        })
-        
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
+                public_rds_instances.append({
+                    'region': region,
+                    'resource': f'RDS Id: {rds_id}. Engine: {rds_engine}',
+                    'resource_id': rds_id
+                })
         
         return public_rds_instances
     
     
-    def check_for_rds_in_public_subnet(self, check_info: dict) -> list:
+    def check_for_rds_in_public_subnet(self, check_info: CheckPlan) -> list:
         """
         Check for RDS instances running in public subnets
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
+        
+        Returns (list): A list of RDS instances running in a public subnet. Empty list if there are non
+        """
+        region_results = self.run_in_regions(check_info, self.check_for_rds_in_public_subnet_in_region)
+        
+        return region_results.merged_list()
+    
+    
+    def check_for_rds_in_public_subnet_in_region(self, region: str) -> list:
+        """
+        Check for RDS instances running in public subnets in a single region
+        
+        Args:
+            region (str): The region to check
         
         Returns (list): A list of RDS instances running in a public subnet. Empty list if there are non
         """
         rds_instances_in_public_subnets = []
-        regions = self.get_region_list(check_info)
+        rds_client = get_client('rds', region)
+        inventory = self.get_network_inventory(region)
         
-        try:
-            for region in regions:
-                rds_client = boto3.client('rds', region_name=region)
-                ec2_client = boto3.client('ec2', region_name=region)
-                
-                rds_instances = rds_client.describe_db_instances()
-                
-                for instance in rds_instances['DBInstances']:
-                    rds_id = instance['DBInstanceIdentifier']
-                    rds_engine = instance.get('Engine')
-                    subnet_ids = [subnet['SubnetIdentifier'] for subnet in instance['DBSubnetGroup']['Subnets']]
-                    
-                    is_public = False
-                    for subnet_id in subnet_ids:
-                        if self.is_subnet_public(subnet_id, ec2_client):
-                            is_public = True
-                            break
-                    
-                    if is_public:
-                        rds_instances_in_public_subnets.append({
-                            'region': region,
-                            'resource': f'RDS Id: {rds_id}. Engine: {rds_engine}'
-                        })
-                
-        except Exception as e:
-            print(f"Error checking region {str(e)}")
-            raise(e)
+        rds_instances = iter_records(rds_client, 'describe_db_instances', 'DBInstances', page_size=100)
+        
+        for instance in rds_instances:
+            rds_id = instance['DBInstanceIdentifier']
+            rds_engine = instance.get('Engine')
+            subnet_ids = [subnet['SubnetIdentifier'] for subnet in instance['DBSubnetGroup']['Subnets']]
+            
+            is_public = False
+            for subnet_id in subnet_ids:
+                if self.is_subnet_public(subnet_id, inventory):
+                    is_public = True
+                    break
+            
+            if is_public:
+                rds_instances_in_public_subnets.append({
+                    'region': region,
+                    'resource': f'RDS Id: {rds_id}. Engine: {rds_engine}',
+                    'resource_id': rds_id
+                })
         
         return rds_instances_in_public_subnets
     
     
-    def check_has_iam_users(self, check_info: dict) -> list:
+    def check_has_iam_users(self, check_info: CheckPlan) -> list:
         """
         Check if the account has IAM users
         
         Args:
-            check_info (dict): A check information
+            check_info (CheckPlan): A check plan
         
         Returns (list): A list of IAM users details. Empty list if there are non
         """
@@ -794,9 +1145,8 @@ class Basic:
         iam_users = []
         
         try:
-            iam_client = boto3.client('iam')
-            response = iam_client.list_users()
-            users = response.get('Users', [])
+            iam_client = get_client('iam')
+            users = iter_records(iam_client, 'list_users', 'Users', page_size=1000)
             
             for user in users:
                 last_login_date = user.get('PasswordLastUsed', None)
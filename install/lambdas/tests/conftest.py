@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The Lambda Functions import their modules relative to the lambdas folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The clients are stubbed in the tests, but boto3 needs a region and credentials to create them
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
@@ -0,0 +1,96 @@
+import pytest
+from botocore.exceptions import ClientError
+from lib import batch_writer as batch_writer_module
+from lib.batch_writer import BatchWriter
+
+
+class FakeDynamoDBClient:
+    def __init__(self, responses: list) -> None:
+        # Each response is a number of requests to leave unprocessed, or an error code to raise
+        self.responses = list(responses)
+        self.requests = []
+
+    def batch_write_item(self, RequestItems: dict) -> dict:
+        table_name, requests = next(iter(RequestItems.items()))
+        self.requests.append(requests)
+        response = self.responses.pop(0) if self.responses else 0
+
+        if isinstance(response, str):
+            raise ClientError({'Error': {'Code': response, 'Message': response}}, 'BatchWriteItem')
+
+        return {'UnprocessedItems': {table_name: requests[:response]} if response else {}}
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    def stub(responses: list) -> FakeDynamoDBClient:
+        client = FakeDynamoDBClient(responses)
+        monkeypatch.setattr(batch_writer_module, 'get_client', lambda *args, **kwargs: client)
+        monkeypatch.setattr(batch_writer_module.time, 'sleep', lambda seconds: None)
+        return client
+
+    return stub
+
+
+def create_items(count: int) -> list:
+    return [{'id': str(i)} for i in range(count)]
+
+
+def test_items_are_written_in_batches_of_25(stub_client):
+    client = stub_client([])
+
+    report = BatchWriter('logs', max_workers=2).write(create_items(60))
+
+    assert sorted(len(requests) for requests in client.requests) == [10, 25, 25]
+    assert report.written == 60 and not report.has_failures()
+
+
+def test_unprocessed_items_are_retried(stub_client):
+    client = stub_client([3, 1])
+
+    report = BatchWriter('logs').write(create_items(5))
+
+    assert [len(requests) for requests in client.requests] == [5, 3, 1]
+    assert report.written == 5 and not report.has_failures()
+
+
+def test_throttling_errors_are_retried(stub_client):
+    client = stub_client(['ProvisionedThroughputExceededException'])
+
+    report = BatchWriter('logs').write(create_items(2))
+
+    assert len(client.requests) == 2
+    assert report.written == 2
+
+
+def test_items_still_unprocessed_after_the_retries_are_reported(stub_client):
+    stub_client([2, 2, 2])
+
+    report = BatchWriter('logs', max_retries=2).write(create_items(4))
+
+    assert report.written == 2
+    assert [failed_item['item'] for failed_item in report.failed_items] == [{'id': '0'}, {'id': '1'}]
+    assert report.to_dict()['failed'] == 2
+
+
+def test_other_errors_fail_the_batch_without_retrying(stub_client):
+    client = stub_client(['ValidationException'])
+
+    report = BatchWriter('logs').write(create_items(3))
+
+    assert len(client.requests) == 1
+    assert report.written == 0 and len(report.failed_items) == 3
+
+
+def test_delete_sends_delete_requests(stub_client):
+    client = stub_client([])
+
+    BatchWriter('findings').delete([{'check_name': 'A', 'fingerprint': 'f'}])
+
+    assert list(client.requests[0][0]) == ['DeleteRequest']
+
+
+def test_backoff_delay_is_capped():
+    batch_writer = BatchWriter('logs', base_delay=1, max_delay=2)
+
+    assert all(0 <= batch_writer.get_delay(attempt) <= 2 for attempt in range(10))
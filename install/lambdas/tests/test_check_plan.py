@@ -0,0 +1,78 @@
+import json
+import pytest
+from lib.check_plan import CheckPlan, compile_check_plans
+from lib.check_type import CheckType
+from lib.settings import Settings
+from modules.basic import Basic
+
+
+def create_item(name: str = CheckType.UNUSED_EIP.value, **attributes) -> dict:
+    return {'id': '1', 'name': name, 'title': f'{name} title', 'module': 'basic', 'enabled': True, **attributes}
+
+
+def test_defaults_are_used_without_a_config():
+    plan = CheckPlan.from_item(create_item(), {'regions': ['us-east-1'], 'checkTimeout': 20})
+
+    assert plan.error is None
+    assert plan.configured_regions == ['us-east-1']
+    assert plan.timeout == 20
+    assert plan.enabled and not plan.muted
+
+
+def test_config_overrides_the_defaults():
+    item = create_item(config=json.dumps({'regions': ['eu-west-1'], 'timeout': 5}),
+                       email_templates=json.dumps({'baseFileName': 'unused_eip'}))
+
+    plan = CheckPlan.from_item(item, {'regions': ['us-east-1'], 'checkTimeout': 20})
+
+    assert plan.configured_regions == ['eu-west-1']
+    assert plan.timeout == 5
+    assert plan.email_templates == {'baseFileName': 'unused_eip'}
+
+
+@pytest.mark.parametrize('item', [
+    create_item(config='{not json'),
+    create_item(config=json.dumps({'regions': 'us-east-1'})),
+    create_item(config=json.dumps({'regions': [1]})),
+    create_item(CheckType.MISSING_TAGS.value, config=json.dumps({'resources': 'ec2', 'requiredTags': []}))
+])
+def test_invalid_config_is_kept_as_the_plan_error(item):
+    plan = CheckPlan.from_item(item)
+
+    assert plan.error.startswith(f"Invalid config of check {item['name']}")
+
+
+def test_invalid_config_fails_only_its_own_check():
+    plans = compile_check_plans([create_item(config='{not json'), create_item(CheckType.NO_BUDGET.value)],
+                                Settings())
+    basic_checker = Basic(plans, Settings())
+
+    with pytest.raises(Exception, match='Invalid config'):
+        basic_checker.run_check(plans[0])
+    assert plans[1].error is None
+
+
+def test_missing_tags_config_is_parsed():
+    item = create_item(CheckType.MISSING_TAGS.value,
+                       config=json.dumps({'resources': ['ec2'], 'requiredTags': ['owner']}))
+
+    plan = CheckPlan.from_item(item)
+
+    assert plan.required_resources == ['ec2']
+    assert plan.required_tags == ['owner']
+
+
+def test_for_regions_copies_the_plan():
+    plan = CheckPlan.from_item(create_item(), {'regions': ['us-east-1', 'eu-west-1']})
+
+    shard_plan = plan.for_regions(['eu-west-1'])
+
+    assert shard_plan.regions == ['eu-west-1']
+    assert shard_plan.name == plan.name and shard_plan.timeout == plan.timeout
+    assert plan.resolved_regions is None
+
+
+def test_compile_keeps_the_order():
+    items = [create_item(name) for name in [CheckType.NO_BUDGET.value, CheckType.UNUSED_EIP.value]]
+
+    assert [plan.name for plan in compile_check_plans(items)] == [item['name'] for item in items]
@@ -0,0 +1,85 @@
+import time
+import threading
+from lib.check_scheduler import CheckScheduler, ScheduledCheck
+
+
+def test_run_keeps_the_order_and_records_values_and_errors():
+    def fail(cancelled):
+        raise ValueError('boom')
+
+    checks = [
+        ScheduledCheck('slow', lambda cancelled: time.sleep(0.05) or ['slow']),
+        ScheduledCheck('fail', fail),
+        ScheduledCheck('fast', lambda cancelled: [])
+    ]
+
+    results = CheckScheduler(max_workers=2).run(checks)
+
+    assert [c.name for c in results] == ['slow', 'fail', 'fast']
+    assert results[0].value == ['slow']
+    assert isinstance(results[1].error, ValueError)
+    assert results[2].value == [] and results[2].error is None
+    assert all(c.duration is not None for c in results)
+
+
+def test_max_workers_caps_the_running_checks():
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def check(cancelled):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return []
+
+    CheckScheduler(max_workers=2).run([ScheduledCheck(f'check-{i}', check) for i in range(6)])
+
+    assert peak[0] == 2
+
+
+def test_timed_out_check_is_cancelled():
+    stopped = threading.Event()
+
+    def check(cancelled):
+        # A check body stops once the scheduler no longer waits for it
+        cancelled.wait(5)
+        stopped.set()
+        return ['late']
+
+    scheduled_check = ScheduledCheck('slow', check, timeout=0.05)
+    CheckScheduler().run([scheduled_check])
+
+    assert scheduled_check.timed_out
+    assert isinstance(scheduled_check.error, TimeoutError)
+    assert scheduled_check.cancelled.is_set()
+    assert stopped.wait(1)
+    # The late value of an abandoned check is ignored
+    assert scheduled_check.value is None
+
+
+def test_checks_not_completed_by_the_deadline_are_deferred():
+    release = threading.Event()
+    checks = [ScheduledCheck('blocked', lambda cancelled: release.wait(5) and []),
+              ScheduledCheck('queued', lambda cancelled: [])]
+
+    CheckScheduler(max_workers=1).run(checks, deadline=time.monotonic() + 0.05)
+    release.set()
+
+    assert all(c.deferred and c.cancelled.is_set() for c in checks)
+    assert not any(c.timed_out for c in checks)
+
+
+def test_checks_are_deferred_when_the_shared_event_is_set():
+    cancelled = threading.Event()
+    checks = [ScheduledCheck('blocked', lambda check_cancelled: check_cancelled.wait(5) and [])]
+    threading.Timer(0.05, cancelled.set).start()
+
+    started_at = time.monotonic()
+    CheckScheduler().run(checks, cancelled=cancelled)
+
+    assert time.monotonic() - started_at < 1
+    assert checks[0].deferred and checks[0].cancelled.is_set()
@@ -0,0 +1,74 @@
+import os
+from lib.checkpoint import CHECKPOINT_CHUNK_SIZE, Checkpoint, CheckpointStore
+
+# The DynamoDB item size limit
+MAX_ITEM_SIZE = 400 * 1024
+
+
+class FakeTable:
+    def __init__(self) -> None:
+        self.items = {}
+
+    def put_item(self, Item: dict) -> None:
+        self.items[Item['id']] = Item
+
+    def get_item(self, Key: dict, ConsistentRead: bool = False) -> dict:
+        if Key['id'] not in self.items:
+            return {}
+        return {'Item': self.items[Key['id']]}
+
+    def delete_item(self, Key: dict) -> None:
+        self.items.pop(Key['id'], None)
+
+
+class FakeDynamoDB:
+    def __init__(self) -> None:
+        self.table = FakeTable()
+
+    def Table(self, table_name: str) -> FakeTable:
+        return self.table
+
+
+def create_store() -> CheckpointStore:
+    checkpoint_store = CheckpointStore('runs')
+    checkpoint_store.dynamodb = FakeDynamoDB()
+    return checkpoint_store
+
+
+def get_item_size(item: dict) -> int:
+    return sum(len(key) + len(value if isinstance(value, bytes) else str(value)) for key, value in item.items())
+
+
+def test_large_checkpoint_is_split_into_items_below_the_size_limit():
+    checkpoint_store = create_store()
+    # Random ARNs barely compress, so the results take about 1MB compressed
+    results = [{'check': 'MISSING_TAGS', 'pass': False,
+                'info': [{'resource_arn': f'arn:aws:ec2:us-east-1:1:instance/{os.urandom(24).hex()}'}
+                         for _ in range(15000)]}]
+
+    checkpoint_store.save(Checkpoint('run-1', results, ['UNUSED_EIP'], 1))
+
+    items = checkpoint_store.dynamodb.table.items
+    assert len(items) > 2
+    assert all(get_item_size(item) < MAX_ITEM_SIZE for item in items.values())
+    assert all(len(item.get('results', b'')) <= CHECKPOINT_CHUNK_SIZE for item in items.values())
+
+    checkpoint = checkpoint_store.load('run-1')
+    assert checkpoint.results == results
+    assert checkpoint.pending_checks == ['UNUSED_EIP']
+    assert checkpoint.continuations == 1
+
+
+def test_save_replaces_the_chunks_of_the_previous_checkpoint():
+    checkpoint_store = create_store()
+    checkpoint_store.chunk_size = 16
+    checkpoint_store.save(Checkpoint('run-1', [{'check': 'A', 'pass': True, 'info': []}], ['B', 'C'], 1))
+    checkpoint_store.save(Checkpoint('run-1', [{'check': 'B', 'pass': False, 'info': ['x' * 50]}], ['C'], 2))
+
+    items = checkpoint_store.dynamodb.table.items
+    assert not any(key.startswith('checkpoint#run-1#1#') for key in items)
+    assert checkpoint_store.load('run-1').results == [{'check': 'B', 'pass': False, 'info': ['x' * 50]}]
+
+    checkpoint_store.delete('run-1')
+    assert items == {}
+    assert checkpoint_store.load('run-1') is None
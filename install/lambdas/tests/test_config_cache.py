@@ -0,0 +1,58 @@
+import lib.config_cache as config_cache_module
+from lib.config_cache import ConfigCache
+
+
+class FakeDynamoDBClient:
+    def __init__(self) -> None:
+        self.version = 1
+        self.get_item_calls = []
+
+    def get_item(self, **kwargs) -> dict:
+        self.get_item_calls.append(kwargs)
+        return {'Item': {'version': {'N': str(self.version)}}}
+
+    def update_item(self, **kwargs) -> dict:
+        self.version += 1
+        return {}
+
+
+def test_value_is_reloaded_when_the_version_changes(monkeypatch):
+    client = FakeDynamoDBClient()
+    monkeypatch.setattr(config_cache_module, 'get_client', lambda *args, **kwargs: client)
+    cache = ConfigCache()
+    loads = []
+
+    def loader() -> dict:
+        loads.append(1)
+        return {'checks': len(loads)}
+
+    assert cache.get('checks', 'checks_table', loader) == {'checks': 1}
+    assert cache.get('checks', 'checks_table', loader) == {'checks': 1}
+    assert len(loads) == 1
+    # Every read checks the version with a consistent read
+    assert len(client.get_item_calls) == 2
+    assert all(call['ConsistentRead'] for call in client.get_item_calls)
+
+    client.version += 1
+    assert cache.get('checks', 'checks_table', loader) == {'checks': 2}
+
+
+def test_value_is_reloaded_after_max_staleness(monkeypatch):
+    client = FakeDynamoDBClient()
+    monkeypatch.setattr(config_cache_module, 'get_client', lambda *args, **kwargs: client)
+    cache = ConfigCache(max_staleness=0)
+    loads = []
+
+    cache.get('settings', 'checks_table', lambda: loads.append(1))
+    cache.get('settings', 'checks_table', lambda: loads.append(1))
+
+    assert len(loads) == 2
+
+
+def test_cached_value_is_a_copy(monkeypatch):
+    monkeypatch.setattr(config_cache_module, 'get_client', lambda *args, **kwargs: FakeDynamoDBClient())
+    cache = ConfigCache()
+
+    cache.get('checks', 'checks_table', lambda: [{'name': 'A'}])[0]['name'] = 'changed'
+
+    assert cache.get('checks', 'checks_table', lambda: []) == [{'name': 'A'}]
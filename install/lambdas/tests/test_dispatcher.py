@@ -0,0 +1,109 @@
+import io
+import json
+import time
+import threading
+import pytest
+from lib import dispatcher as dispatcher_module
+from lib.check_plan import CheckPlan
+from lib.dispatcher import Dispatcher, LambdaDispatcher, ThreadDispatcher, create_dispatcher
+from lib.settings import Settings
+from modules.basic import Basic
+
+
+def test_dispatcher_is_abstract():
+    with pytest.raises(TypeError):
+        Dispatcher()
+
+
+def test_dispatch_keeps_the_shards_order_and_reports_errors():
+    def worker(shard: dict, cancelled: threading.Event) -> dict:
+        if shard['region'] == 'bad':
+            raise Exception('denied')
+        return {'check': shard['check'], 'pass': True, 'info': [shard['region']]}
+
+    shards = [{'check': 'A', 'region': 'r1'}, {'check': 'A', 'region': 'bad'}, {'check': 'B', 'region': None}]
+    shard_results, pending_shards = ThreadDispatcher(worker, 2).dispatch(shards)
+
+    assert pending_shards == []
+    assert [result['check'] for result in shard_results] == ['A', 'A', 'B']
+    assert shard_results[1]['pass'] is None
+    assert shard_results[1]['error'] == 'denied'
+
+
+def test_dispatch_returns_the_shards_that_missed_the_deadline():
+    stopped = threading.Event()
+
+    def worker(shard: dict, cancelled: threading.Event) -> dict:
+        if shard['check'] == 'slow':
+            # A running shard stops once the dispatcher no longer waits for it
+            cancelled.wait(5)
+            stopped.set()
+        return {'check': shard['check'], 'pass': True, 'info': []}
+
+    shards = [{'check': 'fast', 'region': None}, {'check': 'slow', 'region': None}]
+    started_at = time.monotonic()
+    shard_results, pending_shards = ThreadDispatcher(worker, 2).dispatch(shards, time.monotonic() + 0.2)
+
+    assert time.monotonic() - started_at < 2
+    assert [result['check'] for result in shard_results] == ['fast']
+    assert pending_shards == [{'check': 'slow', 'region': None}]
+    assert stopped.wait(1)
+
+
+def test_running_shard_checks_are_cancelled_at_the_deadline():
+    plan = CheckPlan.from_item({'id': '1', 'name': 'SLOW', 'module': 'basic', 'enabled': True})
+    basic_checker = Basic([plan], Settings())
+    stopped = threading.Event()
+
+    def run_check(check_info, cancelled):
+        cancelled.wait(5)
+        stopped.set()
+        return []
+
+    basic_checker.run_check = run_check
+    started_at = time.monotonic()
+    shard_results, pending_shards = ThreadDispatcher(basic_checker.run_shard).dispatch(
+        [{'check': 'SLOW', 'region': None}], time.monotonic() + 0.2)
+
+    # The check body is cancelled along with its shard, not when the Lambda Function times out
+    assert stopped.wait(1)
+    assert time.monotonic() - started_at < 2
+    assert shard_results == []
+    assert pending_shards == [{'check': 'SLOW', 'region': None}]
+
+
+class FakeLambdaClient:
+    def __init__(self, response: dict) -> None:
+        self.response = response
+        self.calls = []
+
+    def invoke(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        return self.response
+
+
+def test_lambda_dispatcher_invokes_the_worker(monkeypatch):
+    result = {'check': 'A', 'pass': True, 'info': []}
+    client = FakeLambdaClient({'Payload': io.BytesIO(json.dumps(result).encode('utf-8'))})
+    monkeypatch.setattr(dispatcher_module, 'get_client', lambda *args, **kwargs: client)
+
+    shard_results, pending_shards = LambdaDispatcher('check42_run').dispatch([{'check': 'A', 'region': 'r1'}])
+
+    assert shard_results == [result]
+    assert json.loads(client.calls[0]['Payload']) == {'shard': {'check': 'A', 'region': 'r1'}}
+
+
+def test_lambda_dispatcher_function_error(monkeypatch):
+    client = FakeLambdaClient({'FunctionError': 'Unhandled',
+                               'Payload': io.BytesIO(json.dumps({'errorMessage': 'boom'}).encode('utf-8'))})
+    monkeypatch.setattr(dispatcher_module, 'get_client', lambda *args, **kwargs: client)
+
+    shard_results, pending_shards = LambdaDispatcher('check42_run').dispatch([{'check': 'A', 'region': 'r1'}])
+
+    assert shard_results[0]['pass'] is None
+    assert shard_results[0]['error'] == 'boom'
+
+
+def test_create_dispatcher_rejects_unknown_types():
+    with pytest.raises(ValueError):
+        create_dispatcher('sqs', None)
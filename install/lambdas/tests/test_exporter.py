@@ -0,0 +1,60 @@
+import gzip
+import json
+import datetime
+import pytest
+from lib.exporter import ExportSink, ResultsExporter, create_sink
+
+
+class MemorySink(ExportSink):
+    def __init__(self) -> None:
+        self.files = {}
+
+    def write(self, key: str, body: bytes, content_type: str) -> None:
+        self.files[key] = body
+
+
+def read_rows(body: bytes) -> list:
+    return [json.loads(line) for line in gzip.decompress(body).decode('utf-8').splitlines()]
+
+
+def test_export_sink_is_abstract():
+    with pytest.raises(TypeError):
+        ExportSink()
+
+
+@pytest.mark.parametrize('check_name', ['NO_MFA_ON_ROOT', 'NO_PASSWORD_POLICY', 'NO_PREMIUM_SUPPORT', 'NO_BUDGET'])
+def test_export_account_level_check(check_name):
+    sink = MemorySink()
+    exporter = ResultsExporter(sink)
+
+    keys = exporter.export([{'check': check_name, 'pass': False, 'info': [f'{check_name} title']}], 'run-1',
+                           datetime.datetime(2026, 1, 2))
+
+    assert keys == [f'date=2026-01-02/check={check_name}/run-1.jsonl.gz']
+    rows = read_rows(sink.files[keys[0]])
+    assert len(rows) == 1
+    assert rows[0]['resource'] == 'account'
+    assert rows[0]['region'] == 'global'
+
+
+def test_export_rows_per_finding_and_without_findings():
+    sink = MemorySink()
+    exporter = ResultsExporter(sink)
+
+    keys = exporter.export([
+        {'check': 'UNUSED_EIP', 'pass': False, 'info': [{'region': 'us-east-1', 'publicIp': '1.1.1.1'},
+                                                        {'region': 'eu-west-1', 'publicIp': '2.2.2.2'}]},
+        {'check': 'NO_BUDGET', 'pass': True, 'info': []}
+    ], 'run-1', datetime.datetime(2026, 1, 2))
+
+    eip_rows = read_rows(sink.files[keys[0]])
+    assert [row['resource'] for row in eip_rows] == ['1.1.1.1', '2.2.2.2']
+
+    budget_rows = read_rows(sink.files[keys[1]])
+    assert budget_rows[0]['pass'] is True
+    assert budget_rows[0]['fingerprint'] is None
+
+
+def test_create_sink_rejects_unknown_types():
+    with pytest.raises(ValueError):
+        create_sink('ftp')
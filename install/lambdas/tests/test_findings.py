@@ -0,0 +1,134 @@
+import json
+import pytest
+from lib.check_plan import CheckPlan
+from lib.check_type import CheckType
+from lib.findings import (ACCOUNT_RESOURCE, FindingsStore, create_finding, filter_processed_checks, get_fingerprint,
+                          iter_findings)
+from lib.check_scheduler import ScheduledCheck
+from lib.settings import Settings
+from modules import basic as basic_module
+from modules.basic import Basic
+
+# The account level checks and the Basic method each one depends on
+ACCOUNT_CHECKS = [
+    (CheckType.NO_MFA_ON_ROOT.value, 'has_mfa_on_root'),
+    (CheckType.NO_PASSWORD_POLICY.value, 'has_password_policy'),
+    (CheckType.NO_PREMIUM_SUPPORT.value, 'has_premuim_support'),
+    (CheckType.NO_BUDGET.value, 'has_budget')
+]
+
+
+def run_account_check(check_name: str, method_name: str, monkeypatch) -> dict:
+    plan = CheckPlan.from_item({'id': '1', 'name': check_name, 'title': f'{check_name} title', 'module': 'basic',
+                                'enabled': True, 'muted': False, 'version': '1'})
+    basic_checker = Basic([plan], Settings())
+    monkeypatch.setattr(basic_checker, method_name, lambda: False)
+
+    return {'check': check_name, 'pass': False, 'info': basic_checker.run_check(plan)}
+
+
+@pytest.mark.parametrize('check_name, method_name', ACCOUNT_CHECKS)
+def test_account_level_check_is_a_single_global_finding(check_name, method_name, monkeypatch):
+    processed_check = run_account_check(check_name, method_name, monkeypatch)
+
+    findings = list(iter_findings(processed_check))
+
+    assert len(findings) == 1
+    assert findings[0]['region'] == 'global'
+    assert findings[0]['resource'] == ACCOUNT_RESOURCE
+    assert findings[0]['fingerprint'] == get_fingerprint(check_name, 'global', ACCOUNT_RESOURCE)
+
+
+@pytest.mark.parametrize('check_name, method_name', ACCOUNT_CHECKS)
+def test_account_level_check_delta_and_filter(check_name, method_name, monkeypatch):
+    processed_check = run_account_check(check_name, method_name, monkeypatch)
+    findings_store = FindingsStore('findings')
+
+    delta = findings_store.compute_delta([processed_check], open_findings=[])
+    assert len(delta.new) == 1
+
+    # The next run finds the same finding open
+    open_item = {'check_name': check_name, 'fingerprint': delta.new[0]['fingerprint']}
+    delta = findings_store.compute_delta([processed_check], open_findings=[open_item])
+    assert len(delta.new) == 0
+    assert len(delta.still_open) == 1
+
+    filtered = filter_processed_checks([processed_check], {open_item['fingerprint']})
+    assert filtered == [processed_check]
+
+
+def test_fingerprint_is_stable_and_ignores_details():
+    first = create_finding('UNUSED_EIP', {'region': 'us-east-1', 'publicIp': '1.2.3.4', 'seen': 1})
+    second = create_finding('UNUSED_EIP', {'region': 'us-east-1', 'publicIp': '1.2.3.4', 'seen': 2})
+    other_region = create_finding('UNUSED_EIP', {'region': 'eu-west-1', 'publicIp': '1.2.3.4'})
+
+    assert first['fingerprint'] == second['fingerprint']
+    assert first['fingerprint'] != other_region['fingerprint']
+    assert first['resource'] == '1.2.3.4'
+
+
+def test_grouped_findings_are_flattened():
+    processed_check = {'check': 'MISSING_TAGS', 'pass': False, 'info': {
+        'ec2': [{'resource_arn': 'arn:1', 'region': 'us-east-1'}],
+        's3': [{'resource_arn': 'arn:2', 'region': 'us-east-1'}, {'resource_arn': 'arn:3', 'region': 'us-east-1'}]
+    }}
+
+    assert [finding['resource'] for finding in iter_findings(processed_check)] == ['arn:1', 'arn:2', 'arn:3']
+
+
+def test_delta_new_resolved_and_errored_checks():
+    findings_store = FindingsStore('findings')
+    kept = create_finding('UNUSED_EIP', {'region': 'us-east-1', 'publicIp': '1.1.1.1'})
+    resolved = create_finding('UNUSED_EIP', {'region': 'us-east-1', 'publicIp': '2.2.2.2'})
+    errored = create_finding('HAS_IAM_USRES', {'user_name': 'admin'})
+    open_findings = [{'check_name': f['check_name'], 'fingerprint': f['fingerprint']} for f in [kept, resolved, errored]]
+
+    delta = findings_store.compute_delta([
+        {'check': 'UNUSED_EIP', 'pass': False, 'info': [
+            {'region': 'us-east-1', 'publicIp': '1.1.1.1'}, {'region': 'us-east-1', 'publicIp': '3.3.3.3'}
+        ]},
+        # A check that errored keeps its open findings
+        {'check': 'HAS_IAM_USRES', 'pass': None, 'info': [], 'error': 'timeout'}
+    ], open_findings)
+
+    assert [f['resource'] for f in delta.new] == ['3.3.3.3']
+    assert [f['fingerprint'] for f in delta.still_open] == [kept['fingerprint']]
+    assert [f['fingerprint'] for f in delta.resolved] == [resolved['fingerprint']]
+    assert delta.has_changes()
+
+
+class FakeTaggingClient:
+    def __init__(self, region: str) -> None:
+        self.region = region
+
+    def can_paginate(self, operation: str) -> bool:
+        return False
+
+    def get_resources(self, **kwargs) -> dict:
+        if self.region == 'us-west-2':
+            raise Exception('AccessDenied')
+        return {'ResourceTagMappingList': [{'ResourceARN': f'arn:aws:ec2:{self.region}:1:instance/i-2', 'Tags': []}]}
+
+
+def test_missing_tags_findings_of_a_failed_region_stay_open(monkeypatch):
+    monkeypatch.setattr(basic_module, 'get_client', lambda service, region=None, **kwargs: FakeTaggingClient(region))
+    plan = CheckPlan.from_item({'id': '1', 'name': CheckType.MISSING_TAGS.value, 'enabled': True,
+                                'config': json.dumps({'resources': ['ec2'], 'requiredTags': ['owner']})})
+    plan = plan.for_regions(['us-east-1', 'us-west-2'])
+    basic_checker = Basic([plan], Settings())
+
+    scheduled_check = ScheduledCheck(plan.name, lambda cancelled: basic_checker.run_check(plan, cancelled))
+    basic_checker.check_scheduler.run([scheduled_check])
+    processed_check = basic_checker.get_check_result(scheduled_check)
+
+    assert processed_check['region_errors'] == {'us-west-2': 'AccessDenied'}
+    assert [f['region'] for f in iter_findings(processed_check)] == ['us-east-1']
+
+    open_findings = [create_finding(plan.name, {'region': region, 'resource_arn': f'arn:aws:ec2:{region}:1:instance/i-1',
+                                                'resource_type': 'ec2'})
+                     for region in ['us-east-1', 'us-west-2']]
+    delta = FindingsStore('findings').compute_delta([processed_check], open_findings)
+
+    # The finding of the region that succeeded is resolved, the one of the failed region stays open
+    assert [f['region'] for f in delta.resolved] == ['us-east-1']
+    assert [f['region'] for f in delta.new] == ['us-east-1']
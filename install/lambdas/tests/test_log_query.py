@@ -0,0 +1,70 @@
+import pytest
+from lib.log_query import (CHECK_INDEX_NAME, STATUS_INDEX_NAME, LogQuery, decode_cursor, encode_cursor)
+
+
+def get_filter_names(query_args: dict) -> set:
+    # Walk the condition tree to find the filtered attributes
+    names = set()
+
+    def walk(condition):
+        for value in condition.get_expression()['values']:
+            if hasattr(value, 'get_expression'):
+                walk(value)
+            elif hasattr(value, 'name'):
+                names.add(value.name)
+
+    walk(query_args['FilterExpression'])
+    return names
+
+
+def test_cursor_round_trip():
+    key = {'run_id': 'run-1', 'id': 'UNUSED_EIP#failed#00000'}
+
+    assert decode_cursor(encode_cursor(key)) == key
+    assert encode_cursor(None) is None
+
+
+def test_invalid_cursor_is_a_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor')
+
+
+def test_run_query_filters_the_time_bounds():
+    query_args = LogQuery('logs').build_query({'run_id': 'run-1', 'since': '2026-01-01', 'until': '2026-01-02'})
+
+    assert 'IndexName' not in query_args
+    assert get_filter_names(query_args) == {'timestamp'}
+
+
+def test_check_and_status_queries_use_their_index():
+    log_query = LogQuery('logs')
+
+    assert log_query.build_query({'check_id': 'c1'})['IndexName'] == CHECK_INDEX_NAME
+    assert log_query.build_query({})['IndexName'] == STATUS_INDEX_NAME
+
+
+def test_cursor_of_the_same_query_is_accepted():
+    log_query = LogQuery('logs')
+    filters = {'check_id': 'c1'}
+    key = {'check_id': 'c1', 'timestamp': '2026-01-01', 'run_id': 'run-1', 'id': 'A#failed#00000'}
+
+    assert log_query.get_start_key(encode_cursor(key), log_query.build_query(filters), filters) == key
+
+
+@pytest.mark.parametrize('filters, key', [
+    # A table key on an index query
+    ({'check_id': 'c1'}, {'run_id': 'run-1', 'id': 'A#failed#00000'}),
+    # An index key on a table query
+    ({'run_id': 'run-1'}, {'status': 'failed', 'timestamp': '2026-01-01', 'run_id': 'run-1', 'id': 'A#failed#00000'}),
+    # A cursor of another check
+    ({'check_id': 'c1'}, {'check_id': 'c2', 'timestamp': '2026-01-01', 'run_id': 'run-1', 'id': 'A#failed#00000'}),
+    # A value that is not a string
+    ({'run_id': 'run-1'}, {'run_id': 'run-1', 'id': 1}),
+    # Not a key at all
+    ({'run_id': 'run-1'}, ['run-1'])
+])
+def test_cursor_of_another_query_is_a_value_error(filters, key):
+    log_query = LogQuery('logs')
+
+    with pytest.raises(ValueError):
+        log_query.get_start_key(encode_cursor(key), log_query.build_query(filters), filters)
@@ -0,0 +1,134 @@
+import time
+import pytest
+from boto3.dynamodb.types import Binary
+from lib.logger import Logger
+from lib.batch_writer import BatchWriteReport
+from lib.check_plan import CheckPlan
+from lib.findings import FindingsDelta
+
+
+class FakeBatchWriter:
+    def __init__(self) -> None:
+        self.items = []
+
+    def write(self, items: list) -> BatchWriteReport:
+        self.items.extend(items)
+        report = BatchWriteReport()
+        report.written = len(items)
+        return report
+
+
+def create_logger(check_names: list, **kwargs) -> Logger:
+    plans = [CheckPlan.from_item({'id': f'id-{name}', 'name': name, 'enabled': True}) for name in check_names]
+    logger = Logger('logs', plans, **kwargs)
+    logger.batch_writer = FakeBatchWriter()
+    return logger
+
+
+def test_log_checks_logs_errored_checks_in_full_mode():
+    logger = create_logger(['NO_BUDGET', 'UNUSED_EIP'])
+
+    report = logger.log_checks([
+        {'check': 'NO_BUDGET', 'pass': None, 'info': [], 'error': 'Check timed out'},
+        {'check': 'UNUSED_EIP', 'pass': True, 'info': []}
+    ], run_id='run-1')
+
+    assert report['written'] == 1
+    item = logger.batch_writer.items[0]
+    assert item['id'] == 'NO_BUDGET#error#00000'
+    assert item['status'] == 'error'
+    assert item['error'] == 'Check timed out'
+    assert item['finding_count'] == 0
+
+
+def test_log_checks_logs_errored_checks_in_transitions_mode():
+    logger = create_logger(['NO_BUDGET'])
+
+    logger.log_checks([{'check': 'NO_BUDGET', 'pass': None, 'info': [], 'error': 'AccessDenied'}],
+                      run_id='run-1', delta=FindingsDelta())
+
+    assert [item['status'] for item in logger.batch_writer.items] == ['error']
+
+
+def test_log_checks_chunks_and_compresses_findings():
+    logger = create_logger(['UNUSED_EIP'], chunk_size=2, compress_threshold=200)
+    info = [{'region': 'us-east-1', 'publicIp': f'10.0.0.{i}'} for i in range(5)]
+
+    logger.log_checks([{'check': 'UNUSED_EIP', 'pass': False, 'info': info}], run_id='run-1')
+
+    items = logger.batch_writer.items
+    assert [item['id'] for item in items] == ['UNUSED_EIP#failed#00000', 'UNUSED_EIP#failed#00001',
+                                              'UNUSED_EIP#failed#00002']
+    assert all(item['chunk_count'] == 3 and item['finding_count'] == 5 for item in items)
+    assert 'findings_z' in items[0]
+    assert 'findings' in items[2]
+
+    records = [record for item in items for record in Logger.get_item_findings(item)]
+    assert [record['resource'] for record in records] == [f'10.0.0.{i}' for i in range(5)]
+
+
+def test_compressed_findings_round_trip_through_dynamodb_binary():
+    logger = create_logger(['UNUSED_EIP'], compress_threshold=0)
+    records = [{'fingerprint': 'f', 'region': 'us-east-1', 'resource': '10.0.0.1', 'detail': ''}]
+
+    item = logger.create_items(logger.checks_config_dict['UNUSED_EIP'], 'run-1', '2026-01-01', 'failed', records)[0]
+
+    assert 'findings' not in item
+    # Items read through boto3 wrap binary attributes
+    assert Logger.get_item_findings({**item, 'findings_z': Binary(item['findings_z'])}) == records
+
+
+def test_check_without_findings_has_a_single_empty_chunk():
+    logger = create_logger(['NO_BUDGET'])
+
+    items = logger.create_items(logger.checks_config_dict['NO_BUDGET'], 'run-1', '2026-01-01', 'failed', [])
+
+    assert len(items) == 1
+    assert items[0]['chunk_count'] == 1 and items[0]['findings'] == []
+    assert Logger.get_item_findings({'id': 'x'}) == []
+
+
+
+def test_items_expire_after_the_retention():
+    logger = create_logger(['NO_BUDGET'], retention_days=2)
+
+    item = logger.create_items(logger.checks_config_dict['NO_BUDGET'], 'run-1', '2026-01-01', 'failed', [])[0]
+
+    assert item['expires_at'] - time.time() == pytest.approx(2 * 86400, abs=5)
+
+
+class FakeTable:
+    def __init__(self) -> None:
+        self.updates = []
+
+    def update_item(self, **kwargs) -> None:
+        self.updates.append(kwargs)
+
+
+class FakeDynamoDBResource:
+    def __init__(self) -> None:
+        self.table = FakeTable()
+
+    def Table(self, table_name: str) -> FakeTable:
+        return self.table
+
+
+def test_roll_up_counts_the_run_once_and_skips_errored_checks():
+    logger = create_logger(['UNUSED_EIP', 'NO_BUDGET'])
+    logger.dynamodb = FakeDynamoDBResource()
+    delta = FindingsDelta()
+    delta.new = [{'check_name': 'UNUSED_EIP'}]
+
+    logger.roll_up([
+        {'check': 'UNUSED_EIP', 'pass': False, 'info': [{'region': 'us-east-1', 'publicIp': '10.0.0.1'}]},
+        {'check': 'NO_BUDGET', 'pass': None, 'info': [], 'error': 'AccessDenied'}
+    ], delta, run_id='run-1')
+
+    updates = logger.dynamodb.table.updates
+    assert len(updates) == 1
+    assert updates[0]['Key']['id'] == 'UNUSED_EIP'
+    assert updates[0]['Key']['run_id'].startswith('rollup#')
+    assert updates[0]['ExpressionAttributeValues'][':failed'] == 1
+    assert updates[0]['ExpressionAttributeValues'][':open'] == 1
+    assert updates[0]['ExpressionAttributeValues'][':new'] == 1
+    assert 'last_run_id <> :run_id' in updates[0]['ConditionExpression']
@@ -0,0 +1,51 @@
+import os
+import pytest
+from lib.mailer import Mailer
+from lib.check_plan import CheckPlan
+from lib.findings import FindingsDelta
+
+LAMBDAS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def mailer(monkeypatch):
+    # The email templates are read relative to the working directory
+    monkeypatch.chdir(LAMBDAS_DIR)
+    plans = [CheckPlan.from_item({'id': '1', 'name': 'NO_BUDGET', 'title': 'No budget', 'enabled': True})]
+    mailer = Mailer(plans, 'sender@example.com', 'recipient@example.com')
+    mailer.sent = []
+    monkeypatch.setattr(mailer, 'send', mailer.sent.append)
+    return mailer
+
+
+def test_errored_checks_are_listed(mailer):
+    message = mailer.send_message_from_checks([{'check': 'NO_BUDGET', 'pass': None, 'info': [],
+                                                'error': 'Check timed out'}])
+
+    assert mailer.sent == [message]
+    assert 'Checks that could not complete' in message.message_text
+    assert 'No budget. Check timed out' in message.message_text
+    assert 'No budget. Check timed out' in message.message_html
+
+
+def test_deltas_mode_sends_errored_checks_without_changes(mailer):
+    message = mailer.send_message_from_checks([{'check': 'NO_BUDGET', 'pass': None, 'info': [],
+                                                'error': 'AccessDenied'}], delta=FindingsDelta())
+
+    assert message is not None
+    assert 'No budget. AccessDenied' in message.message_text
+
+
+def test_deltas_mode_skips_the_email_without_changes(mailer):
+    message = mailer.send_message_from_checks([{'check': 'NO_BUDGET', 'pass': True, 'info': []}],
+                                              delta=FindingsDelta())
+
+    assert message is None
+    assert mailer.sent == []
+
+
+def test_region_errors_are_listed_per_region(mailer):
+    message = mailer.send_message_from_checks([{'check': 'NO_BUDGET', 'pass': True, 'info': [],
+                                                'region_errors': {'eu-west-1': 'AccessDenied'}}])
+
+    assert 'Region: eu-west-1. Resource: No budget. AccessDenied' in message.message_text
@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from lib.network_inventory import NetworkInventory, RouteTableIndex
+
+
+class FakeEC2Client:
+    def __init__(self) -> None:
+        self.calls = []
+        self.responses = {
+            'describe_vpcs': {'Vpcs': [{'VpcId': 'vpc-1', 'IsDefault': True}, {'VpcId': 'vpc-2'}]},
+            'describe_subnets': {'Subnets': [{'SubnetId': 'subnet-1', 'VpcId': 'vpc-1'},
+                                             {'SubnetId': 'subnet-2', 'VpcId': 'vpc-2'}]},
+            'describe_instances': {'Reservations': [{'Instances': [
+                {'InstanceId': 'i-1', 'VpcId': 'vpc-1', 'SubnetId': 'subnet-1'},
+                {'InstanceId': 'i-2', 'VpcId': 'vpc-2', 'SubnetId': 'subnet-2'}
+            ]}]}
+        }
+
+    def can_paginate(self, operation: str) -> bool:
+        return False
+
+    def __getattr__(self, operation: str):
+        def call(**kwargs):
+            self.calls.append(operation)
+            # Widen the window in which concurrent first uses could both fetch
+            time.sleep(0.01)
+            return self.responses[operation]
+        return call
+
+
+def test_collections_are_fetched_once_under_concurrent_use():
+    client = FakeEC2Client()
+    inventory = NetworkInventory(client)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: inventory.instances_in_vpc('vpc-1'), range(16)))
+
+    assert client.calls == ['describe_instances']
+    assert all(result is results[0] for result in results)
+    assert [instance['InstanceId'] for instance in results[0]] == ['i-1']
+
+
+def test_indexes_and_default_vpc():
+    inventory = NetworkInventory(FakeEC2Client())
+
+    assert inventory.default_vpc['VpcId'] == 'vpc-1'
+    assert [subnet['SubnetId'] for subnet in inventory.subnets_in_vpc('vpc-2')] == ['subnet-2']
+    assert inventory.subnets_in_vpc('vpc-3') == []
+    assert [instance['InstanceId'] for instance in inventory.instances] == ['i-1', 'i-2']
+
+
+def test_route_table_index_classifies_the_subnets():
+    subnets = [{'SubnetId': 'subnet-explicit', 'VpcId': 'vpc-1'},
+               {'SubnetId': 'subnet-main', 'VpcId': 'vpc-1'},
+               {'SubnetId': 'subnet-private', 'VpcId': 'vpc-2'},
+               {'SubnetId': 'subnet-nat', 'VpcId': 'vpc-2'}]
+    route_tables = [
+        {'RouteTableId': 'rtb-main-1', 'VpcId': 'vpc-1', 'Associations': [{'Main': True}],
+         'Routes': [{'GatewayId': 'igw-1', 'DestinationCidrBlock': '0.0.0.0/0'}]},
+        {'RouteTableId': 'rtb-explicit', 'VpcId': 'vpc-1', 'Associations': [{'SubnetId': 'subnet-explicit'}],
+         'Routes': [{'GatewayId': 'local', 'DestinationCidrBlock': '10.0.0.0/16'}]},
+        {'RouteTableId': 'rtb-main-2', 'VpcId': 'vpc-2', 'Associations': [{'Main': True}],
+         'Routes': [{'GatewayId': 'local', 'DestinationCidrBlock': '10.1.0.0/16'}]},
+        # An Internet Gateway route that is not the default route doesn't make a subnet public
+        {'RouteTableId': 'rtb-nat', 'VpcId': 'vpc-2', 'Associations': [{'SubnetId': 'subnet-nat'}],
+         'Routes': [{'GatewayId': 'igw-2', 'DestinationCidrBlock': '192.168.0.0/16'},
+                    {'NatGatewayId': 'nat-1', 'DestinationCidrBlock': '0.0.0.0/0'}]}
+    ]
+
+    index = RouteTableIndex(route_tables, subnets)
+
+    # An explicit association wins over the public main route table of the VPC
+    assert index.get_route_table_id('subnet-explicit') == 'rtb-explicit'
+    assert not index.is_subnet_public('subnet-explicit')
+    # Subnets without an association use the main route table
+    assert index.get_route_table_id('subnet-main') == 'rtb-main-1'
+    assert index.is_subnet_public('subnet-main')
+    assert not index.is_subnet_public('subnet-private')
+    assert not index.is_subnet_public('subnet-nat')
+    assert not index.is_subnet_public('subnet-unknown')
+
+
+def test_route_table_index_is_built_once_from_the_inventory():
+    client = FakeEC2Client()
+    client.responses['describe_route_tables'] = {'RouteTables': [
+        {'RouteTableId': 'rtb-1', 'VpcId': 'vpc-1', 'Associations': [{'Main': True}],
+         'Routes': [{'GatewayId': 'igw-1', 'DestinationCidrBlock': '0.0.0.0/0'}]}
+    ]}
+    inventory = NetworkInventory(client)
+
+    assert inventory.route_table_index.is_subnet_public('subnet-1')
+    assert not inventory.route_table_index.is_subnet_public('subnet-2')
+    assert inventory.route_table_index is inventory.route_table_index
+    assert sorted(client.calls) == ['describe_route_tables', 'describe_subnets']
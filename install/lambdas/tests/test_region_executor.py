@@ -0,0 +1,102 @@
+import threading
+import pytest
+from lib.check_plan import CheckPlan
+from lib.check_scheduler import CheckCancelled, ScheduledCheck
+from lib.check_type import CheckType
+from lib.findings import FindingsStore
+from lib.region_executor import RegionErrors, RegionExecutor
+from lib.settings import Settings
+from modules.basic import Basic
+
+
+def region_function(region: str) -> list:
+    if region.startswith('bad'):
+        raise Exception(f'{region} denied')
+    return [{'region': region, 'publicIp': f'ip-{region}'}]
+
+
+def create_basic(regions: list) -> tuple:
+    plan = CheckPlan.from_item({'id': '1', 'name': CheckType.UNUSED_EIP.value, 'enabled': True})
+    plan = plan.for_regions(regions)
+    return Basic([plan], Settings()), plan
+
+
+def test_run_merges_in_the_region_order_and_removes_duplicates():
+    region_results = RegionExecutor(max_workers=3).run(['r2', 'r1', 'r2', 'bad-1'], region_function)
+
+    assert region_results.regions == ['r2', 'r1', 'bad-1']
+    assert [item['region'] for item in region_results.merged_list()] == ['r2', 'r1']
+    assert region_results.get_error_messages() == {'bad-1': 'bad-1 denied'}
+    assert set(region_results.durations) == {'r2', 'r1', 'bad-1'}
+
+
+def test_merged_dict_extends_the_lists_of_each_key():
+    region_results = RegionExecutor().run(['r1', 'r2'], lambda region: {'ec2': [region], 's3': []})
+
+    assert region_results.merged_dict() == {'ec2': ['r1', 'r2'], 's3': []}
+
+
+def test_raise_if_all_failed():
+    RegionExecutor().run(['r1', 'bad-1'], region_function).raise_if_all_failed()
+
+    with pytest.raises(RegionErrors):
+        RegionExecutor().run(['bad-1', 'bad-2'], region_function).raise_if_all_failed()
+
+
+def test_cancelled_run_skips_the_regions():
+    cancelled = threading.Event()
+    cancelled.set()
+
+    region_results = RegionExecutor().run(['r1', 'r2'], region_function, cancelled)
+
+    assert region_results.results == {}
+    assert all(isinstance(error, CheckCancelled) for error in region_results.errors.values())
+
+
+def test_partial_region_failure_keeps_the_successful_regions():
+    basic_checker, plan = create_basic(['r1', 'bad-1'])
+    basic_checker.check_unused_eip_in_region = region_function
+
+    scheduled_check = ScheduledCheck(plan.name, lambda cancelled: basic_checker.run_check(plan, cancelled))
+    basic_checker.check_scheduler.run([scheduled_check])
+    result = basic_checker.get_check_result(scheduled_check)
+
+    assert result['pass'] is False
+    assert [item['region'] for item in result['info']] == ['r1']
+    assert result['region_errors'] == {'bad-1': 'bad-1 denied'}
+
+
+def test_all_regions_failing_errors_the_check():
+    basic_checker, plan = create_basic(['bad-1', 'bad-2'])
+    basic_checker.check_unused_eip_in_region = region_function
+
+    scheduled_check = ScheduledCheck(plan.name, lambda cancelled: basic_checker.run_check(plan, cancelled))
+    basic_checker.check_scheduler.run([scheduled_check])
+    result = basic_checker.get_check_result(scheduled_check)
+
+    assert result['pass'] is None
+    assert 'region_errors' not in result
+
+
+def test_aggregate_shard_results_keeps_the_completed_shards():
+    basic_checker, plan = create_basic(['r1'])
+
+    results = basic_checker.aggregate_shard_results([
+        {'check': 'A', 'region': 'r1', 'pass': False, 'info': [{'region': 'r1'}]},
+        {'check': 'A', 'region': 'r2', 'pass': None, 'info': [], 'error': 'denied'},
+        {'check': 'B', 'region': None, 'pass': None, 'info': [], 'error': 'timed out'}
+    ])
+
+    assert results[0] == {'check': 'A', 'pass': False, 'info': [{'region': 'r1'}], 'region_errors': {'r2': 'denied'}}
+    assert results[1] == {'check': 'B', 'pass': None, 'info': [], 'error': 'timed out'}
+
+
+def test_delta_keeps_the_findings_of_failed_regions_open():
+    store = FindingsStore('findings')
+    open_findings = [{'check_name': 'A', 'fingerprint': 'f-r2', 'region': 'r2'},
+                     {'check_name': 'A', 'fingerprint': 'f-r3', 'region': 'r3'}]
+
+    delta = store.compute_delta([{'check': 'A', 'pass': True, 'info': [], 'region_errors': {'r2': 'denied'}}],
+                                open_findings=open_findings)
+
+    assert [item['fingerprint'] for item in delta.resolved] == ['f-r3']
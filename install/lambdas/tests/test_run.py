@@ -0,0 +1,124 @@
+import pytest
+import check42_run
+from lib.checkpoint import Checkpoint
+from lib.findings import FindingsDelta
+from lib.settings import Settings
+
+
+class FakeCheckpointStore:
+    checkpoints = {}
+
+    def __init__(self, table_name: str) -> None:
+        pass
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        self.checkpoints[checkpoint.run_id] = checkpoint
+
+    def load(self, run_id: str) -> Checkpoint:
+        return self.checkpoints.get(run_id)
+
+    def delete(self, run_id: str) -> None:
+        self.checkpoints.pop(run_id, None)
+
+
+class FakeRunLedger:
+    items = {}
+
+    def __init__(self, table_name: str) -> None:
+        pass
+
+    def start(self, run_id: str) -> dict:
+        return dict(self.items.setdefault(run_id, {'sinks': {}}))
+
+    def is_completed(self, ledger_item: dict) -> bool:
+        return ledger_item.get('status') == 'completed'
+
+    def get_completed_sinks(self, ledger_item: dict) -> set:
+        return set(ledger_item['sinks'])
+
+    def complete_sink(self, run_id: str, sink_name: str) -> None:
+        self.items[run_id]['sinks'][sink_name] = 'success'
+
+    def record_metrics(self, run_id: str, metrics: dict) -> None:
+        pass
+
+    def complete(self, run_id: str, started_at: str = None) -> None:
+        self.items[run_id]['status'] = 'completed'
+
+
+class FakeFindingsStore:
+    def __init__(self, table_name: str, max_workers: int = 1) -> None:
+        pass
+
+    def compute_delta(self, processed_checks: list) -> FindingsDelta:
+        return FindingsDelta()
+
+    def apply(self, delta: FindingsDelta) -> None:
+        pass
+
+
+class FakeMailer:
+    failures = 1
+    sent = []
+
+    def __init__(self, checks: list, sender: str, recipient: str) -> None:
+        pass
+
+    def send_message_from_checks(self, results: list, delta: FindingsDelta = None) -> None:
+        if FakeMailer.failures > 0:
+            FakeMailer.failures -= 1
+            raise Exception('Throttling')
+        self.sent.append(results)
+
+
+def test_retried_continuation_resumes_from_the_checkpoint(monkeypatch):
+    monkeypatch.setattr(check42_run.utils, 'get_settings', lambda: Settings())
+    monkeypatch.setattr(check42_run.utils, 'get_checks', lambda profile: [])
+    monkeypatch.setattr(check42_run, 'CheckpointStore', FakeCheckpointStore)
+    monkeypatch.setattr(check42_run, 'RunLedger', FakeRunLedger)
+    monkeypatch.setattr(check42_run, 'FindingsStore', FakeFindingsStore)
+    monkeypatch.setattr(check42_run, 'Mailer', FakeMailer)
+    monkeypatch.setattr(check42_run, 'log_results', lambda *args: None)
+
+    results = [{'check': 'A', 'pass': False, 'info': []}]
+    FakeCheckpointStore.checkpoints['run-1'] = Checkpoint('run-1', results, ['B'], 1)
+
+    # The mail sink fails, so the run isn't completed and its checkpoint is kept for the retry
+    run_report = check42_run.run_checks(run_id='run-1', is_continuation=True)
+    assert run_report['sinks']['mail']['status'] == 'error'
+    assert 'run-1' in FakeCheckpointStore.checkpoints
+    assert FakeMailer.sent == []
+
+    run_report = check42_run.run_checks(run_id='run-1', is_continuation=True)
+    assert run_report['sinks']['mail']['status'] == 'success'
+    assert run_report['sinks']['log']['status'] == 'skipped'
+    assert FakeMailer.sent == [results]
+    assert FakeRunLedger.items['run-1']['status'] == 'completed'
+    assert 'run-1' not in FakeCheckpointStore.checkpoints
+
+
+class FailingCheckpointStore(FakeCheckpointStore):
+    def save(self, checkpoint: Checkpoint) -> None:
+        raise Exception('Item size has exceeded the maximum allowed size')
+
+
+def test_run_completes_when_the_checkpoint_cannot_be_saved(monkeypatch):
+    monkeypatch.setattr(check42_run.utils, 'get_settings', lambda: Settings())
+    monkeypatch.setattr(check42_run.utils, 'get_checks',
+                        lambda profile: [{'id': '1', 'name': 'A', 'module': 'basic', 'enabled': True}])
+    monkeypatch.setattr(check42_run, 'CheckpointStore', FailingCheckpointStore)
+    monkeypatch.setattr(check42_run, 'RunLedger', FakeRunLedger)
+    monkeypatch.setattr(check42_run, 'FindingsStore', FakeFindingsStore)
+    monkeypatch.setattr(check42_run, 'Mailer', FakeMailer)
+    monkeypatch.setattr(check42_run, 'log_results', lambda *args: None)
+    monkeypatch.setattr(check42_run, 'run_basic_checks', lambda *args: ([], ['A']))
+    monkeypatch.setattr(check42_run, 'invoke_continuation', lambda run_id: pytest.fail('No continuation expected'))
+    monkeypatch.setattr(FakeMailer, 'failures', 0)
+    monkeypatch.setattr(FakeMailer, 'sent', [])
+
+    run_report = check42_run.run_checks(run_id='run-2')
+
+    assert run_report['completed'] is True
+    assert FakeRunLedger.items['run-2']['status'] == 'completed'
+    assert FakeMailer.sent[0][0]['check'] == 'A'
+    assert FakeMailer.sent[0][0]['pass'] is None
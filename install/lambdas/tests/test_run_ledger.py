@@ -0,0 +1,53 @@
+import json
+import pytest
+import check42_runs
+from lib import run_ledger as run_ledger_module
+from lib.log_query import encode_cursor
+from lib.run_ledger import RunLedger
+
+RUNS_PAGE_KEY = {'id': {'S': 'run#1'}, 'record_type': {'S': 'run'}, 'started_at': {'S': '2026-10-01T10:00:00'}}
+
+
+class FakeDynamoDBClient:
+    def __init__(self) -> None:
+        self.queries = []
+
+    def query(self, **kwargs) -> dict:
+        self.queries.append(kwargs)
+        return {'Items': []}
+
+
+def test_cursor_of_a_runs_page_is_accepted(monkeypatch):
+    client = FakeDynamoDBClient()
+    monkeypatch.setattr(run_ledger_module, 'get_client', lambda *args, **kwargs: client)
+    run_ledger = RunLedger('runs')
+
+    runs, last_evaluated_key = run_ledger.get_recent_runs(20, run_ledger.get_start_key(encode_cursor(RUNS_PAGE_KEY)))
+
+    assert client.queries[0]['ExclusiveStartKey'] == RUNS_PAGE_KEY
+
+
+@pytest.mark.parametrize('key', [
+    # Not a runs page key
+    {'run_id': '1', 'id': 'UNUSED_EIP#failed#00000'},
+    {**RUNS_PAGE_KEY, 'record_type': {'S': 'checkpoint'}},
+    {**RUNS_PAGE_KEY, 'id': {'S': 'checkpoint#1'}},
+    # Not a DynamoDB string value
+    {**RUNS_PAGE_KEY, 'started_at': {'N': '1'}},
+    {**RUNS_PAGE_KEY, 'started_at': '2026-10-01T10:00:00'},
+    ['run#1']
+])
+def test_tampered_cursor_is_a_value_error(key):
+    with pytest.raises(ValueError):
+        RunLedger('runs').get_start_key(encode_cursor(key))
+
+
+def test_runs_handler_rejects_an_invalid_cursor(monkeypatch):
+    client = FakeDynamoDBClient()
+    monkeypatch.setattr(run_ledger_module, 'get_client', lambda *args, **kwargs: client)
+
+    response = check42_runs.handler({'httpMethod': 'GET', 'queryStringParameters': {'cursor': 'not a cursor'}}, None)
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['message'] == ['Invalid cursor']
+    assert client.queries == []
@@ -0,0 +1,92 @@
+from botocore.exceptions import ClientError
+from lib.settings_store import SETTINGS_ID, SettingsStore
+
+
+class FakeTable:
+    def __init__(self, items: list) -> None:
+        self.items = {item['id']: dict(item) for item in items}
+        self.scans = 0
+
+    def get_item(self, Key: dict, ConsistentRead: bool = False) -> dict:
+        item = self.items.get(Key['id'])
+        return {'Item': dict(item)} if item is not None else {}
+
+    def scan(self, **kwargs) -> dict:
+        self.scans += 1
+        return {'Items': [dict(item) for item in self.items.values()]}
+
+    def put_item(self, Item: dict, ConditionExpression: str = None) -> None:
+        if ConditionExpression is not None and Item['id'] in self.items:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, 'PutItem')
+        self.items[Item['id']] = dict(Item)
+
+    def delete_item(self, Key: dict) -> None:
+        self.items.pop(Key['id'], None)
+
+    def update_item(self, Key: dict, ConditionExpression: str = None, ExpressionAttributeNames: dict = None,
+                    ExpressionAttributeValues: dict = None, **kwargs) -> None:
+        if Key['id'] not in self.items:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, 'UpdateItem')
+        for placeholder, name in ExpressionAttributeNames.items():
+            self.items[Key['id']][name] = ExpressionAttributeValues[placeholder.replace('#', ':')]
+
+
+def create_store(items: list) -> SettingsStore:
+    store = SettingsStore('settings')
+    store.table = FakeTable(items)
+    return store
+
+
+def test_settings_are_read_by_their_key():
+    store = create_store([{'id': SETTINGS_ID, 'subscriber': 'a@example.com'}])
+
+    assert store.get()['subscriber'] == 'a@example.com'
+    assert store.table.scans == 0
+
+
+def test_legacy_settings_are_moved_to_the_key():
+    store = create_store([{'id': 'partial-id'}, {'id': 'random-id', 'subscriber': 'a@example.com'}])
+
+    item = store.get()
+
+    assert item == {'id': SETTINGS_ID, 'subscriber': 'a@example.com'}
+    assert 'random-id' not in store.table.items
+    # The next read doesn't scan again
+    store.get()
+    assert store.table.scans == 1
+
+
+def test_concurrent_migration_reads_the_winning_item():
+    store = create_store([{'id': 'random-id', 'subscriber': 'a@example.com'}])
+    winner = {'id': SETTINGS_ID, 'subscriber': 'b@example.com'}
+    original_get_legacy_item = store.get_legacy_item
+
+    def get_legacy_item() -> dict:
+        # Another invocation moves the settings between the scan and the put
+        item = original_get_legacy_item()
+        store.table.items[SETTINGS_ID] = dict(winner)
+        return item
+
+    store.get_legacy_item = get_legacy_item
+
+    assert store.migrate() == winner
+    assert 'random-id' in store.table.items
+
+
+def test_no_settings():
+    store = create_store([])
+
+    assert store.get() is None
+    assert store.update({'schedule': 'rate(1 day)'}) is False
+
+
+def test_update_migrates_legacy_settings_first():
+    store = create_store([{'id': 'random-id', 'subscriber': 'a@example.com'}])
+
+    assert store.update({'schedule': 'rate(1 day)'}) is True
+    assert store.table.items == {SETTINGS_ID: {'id': SETTINGS_ID, 'subscriber': 'a@example.com',
+                                               'schedule': 'rate(1 day)'}}
+
+
+def test_empty_update_does_nothing():
+    assert create_store([{'id': SETTINGS_ID}]).update({}) is False
@@ -0,0 +1,79 @@
+import uuid
+import pytest
+from botocore.exceptions import ClientError
+from lib import utils as utils_module
+from lib.utils import TRANSACTION_SIZE, Utils
+
+
+class FakeDynamoDBClient:
+    def __init__(self, cancellation_reasons: list = None) -> None:
+        self.transactions = []
+        self.cancellation_reasons = cancellation_reasons
+
+    def transact_write_items(self, TransactItems: list) -> dict:
+        self.transactions.append(TransactItems)
+        if self.cancellation_reasons is not None:
+            raise ClientError({'Error': {'Code': 'TransactionCanceledException', 'Message': 'canceled'},
+                               'CancellationReasons': self.cancellation_reasons}, 'TransactWriteItems')
+        return {}
+
+
+@pytest.fixture
+def utils(monkeypatch):
+    utils = Utils()
+    utils.checks_table_name = 'checks'
+    utils.bumps = 0
+    monkeypatch.setattr(utils, 'bump_config_version', lambda: setattr(utils, 'bumps', utils.bumps + 1))
+    return utils
+
+
+def stub_checks(utils: Utils, monkeypatch, checks: list, client: FakeDynamoDBClient) -> None:
+    monkeypatch.setattr(utils, 'get_checks', lambda profile='full': [dict(c) for c in checks])
+    monkeypatch.setattr(utils_module, 'get_client', lambda *args, **kwargs: client)
+
+
+def test_changed_checks_are_updated_in_transactions_of_100(utils, monkeypatch):
+    checks = [{'id': str(uuid.uuid4()), 'enabled': False} for _ in range(TRANSACTION_SIZE + 30)]
+    client = FakeDynamoDBClient()
+    stub_checks(utils, monkeypatch, checks, client)
+
+    failed_updates = utils.update_checks([{**c, 'enabled': True} for c in checks])
+
+    assert failed_updates == []
+    assert [len(transaction) for transaction in client.transactions] == [TRANSACTION_SIZE, 30]
+    assert utils.bumps == 1
+
+
+def test_unchanged_and_repeated_checks_are_skipped(utils, monkeypatch):
+    checks = [{'id': str(uuid.uuid4()), 'enabled': True}, {'id': str(uuid.uuid4()), 'enabled': False}]
+    client = FakeDynamoDBClient()
+    stub_checks(utils, monkeypatch, checks, client)
+
+    utils.update_checks([checks[0], {**checks[1], 'enabled': False}, {**checks[1], 'enabled': True}])
+
+    assert len(client.transactions) == 1
+    update = client.transactions[0][0]['Update']
+    assert update['Key'] == {'id': {'S': checks[1]['id']}}
+    assert update['ExpressionAttributeValues'] == {':val': {'BOOL': True}}
+
+
+def test_nothing_changed_writes_nothing(utils, monkeypatch):
+    checks = [{'id': str(uuid.uuid4()), 'enabled': True}]
+    client = FakeDynamoDBClient()
+    stub_checks(utils, monkeypatch, checks, client)
+
+    assert utils.update_checks(checks) == []
+    assert client.transactions == []
+    assert utils.bumps == 0
+
+
+def test_canceled_transaction_reports_every_check(utils, monkeypatch):
+    checks = [{'id': str(uuid.uuid4()), 'enabled': False} for _ in range(2)]
+    client = FakeDynamoDBClient([{'Code': 'None'}, {'Code': 'ConditionalCheckFailed'}])
+    stub_checks(utils, monkeypatch, checks, client)
+
+    failed_updates = utils.update_checks([{**c, 'enabled': True} for c in checks])
+
+    assert [failed_update['error'] for failed_update in failed_updates] == [
+        'Not updated, the transaction was canceled', 'Check not found']
+    assert utils.bumps == 0
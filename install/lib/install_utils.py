@@ -135,6 +135,22 @@ class InstallUtils:
             new_password (str): The new password
         """
         settings_table_name = self.get_name_with_prefix('settings')
+        
+        try:
+            self.dynamodb_client.update_item(
+                TableName=settings_table_name,
+                Key={'id': {'S': 'settings'}},
+                UpdateExpression="SET password = :newpassword",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeValues={
+                    ':newpassword': {'S': new_password}
+                }
+            )
+            return
+        except self.dynamodb_client.exceptions.ConditionalCheckFailedException:
+            # The settings of an older install are stored under a random id until the next login moves them
+            pass
+        
         response = self.dynamodb_client.scan(
             TableName=settings_table_name,
             Limit=1  # We expect only one record
@@ -168,6 +184,51 @@ class InstallUtils:
 
     
     
+    def migrate_log_items(self, source_table_name: str, target_table_name: str) -> int:
+        """
+        Copy the items of the id keyed log table into the run keyed log table
+        
+        Each item becomes a single log item of its own run, so the copy can be run again without duplicates. 
+        The text message of the item is kept, since the findings of those items were not recorded separately.
+        
+        Args:
+            source_table_name (str): The id keyed log table name
+            target_table_name (str): The run keyed log table name
+        
+        Returns (int): The number of copied items
+        """
+        dynamodb = boto3.resource('dynamodb', region_name=self.region)
+        source_table = dynamodb.Table(source_table_name)
+        target_table = dynamodb.Table(target_table_name)
+        
+        copied = 0
+        scan_args = {}
+        with target_table.batch_writer() as batch:
+            while True:
+                response = source_table.scan(**scan_args)
+                
+                for item in response['Items']:
+                    status = item.get('status', 'failed')
+                    batch.put_item(Item={
+                        **item,
+                        'run_id': f"legacy#{item['id']}",
+                        'id': f"{item['check_name']}#{status}#00000",
+                        'status': status,
+                        'chunk': 0,
+                        'chunk_count': 1,
+                        'finding_count': 0,
+                        'regions': [],
+                        'findings': []
+                    })
+                    copied += 1
+                
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        return copied
+    
+    
     def get_cloud_formation_output(self, stack_name: str, keys: list) -> str:
         """
         Try to extract a value from a cloud formation output
@@ -0,0 +1,15 @@
+import os
+import json
+from lib.install_utils import InstallUtils
+
+cwd = os.getcwd()
+install_config_file = open(cwd + '/config.json')
+install_config = json.load(install_config_file)
+install_utils = InstallUtils(install_config)
+
+# Copy the items of the id keyed log table into the run keyed log_v2 table
+source_table_name = install_utils.get_name_with_prefix('log')
+target_table_name = install_utils.get_name_with_prefix('log_v2')
+
+copied = install_utils.migrate_log_items(source_table_name, target_table_name)
+print(f'Copied {copied} items from {source_table_name} to {target_table_name}')
@@ -1,4 +1,5 @@
 import os
+import time
 import uuid
 import json
 from lib.install_utils import InstallUtils
@@ -57,9 +58,8 @@ for m in checks_config['modules']:
 print(f'Added {items_added} checks to the checks table')
         
 
-# Populate the settings table
-item_uuid = uuid.uuid4()
-item_id = str(item_uuid)
+# Populate the settings table. The Lambda Functions read the settings item by its well-known key
+item_id = 'settings'
 password = install_utils.generate_password()
 hashed_password = install_utils.hash_password(password)
 item = {
@@ -75,4 +75,11 @@ if checks_config['defaults']:
     item['defaults'] = {'S': json.dumps(checks_config['defaults'])}
     
 install_utils.put_item(settings_table_name, item)
+
+# Stamp a new configuration version, so the Lambda Functions don't keep the previous checks and settings cached
+install_utils.put_item(checks_table_name, {
+    "id": {'S': 'config#version'},
+    "version": {'N': str(int(time.time()))}
+    })
+
 print(f'The configuration url can be found at {amplify_web_url}/login/login.html. Use email: {recipient_email} and password: {password} to log in')
\ No newline at end of file